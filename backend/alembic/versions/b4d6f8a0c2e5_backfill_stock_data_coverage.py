@@ -0,0 +1,39 @@
+"""backfill stock_data_coverage
+
+Revision ID: b4d6f8a0c2e5
+Revises: f2c4e6a8b0d3
+Create Date: 2026-10-17 19:02:51.447120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4d6f8a0c2e5'
+down_revision: Union[str, Sequence[str], None] = 'f2c4e6a8b0d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Bars cached before coverage was tracked: take the span from their first
+    # to last timestamp as covered, as CachedDataProvider's fallback does, so
+    # every cached (symbol, interval) has a coverage row the screener can list
+    op.execute(
+        """
+        INSERT INTO stock_data_coverage (symbol, interval, ranges, refreshed_at)
+        SELECT symbol, interval, jsonb_build_array(jsonb_build_array(min(timestamp), max(timestamp))), now()
+        FROM stock_data_cache
+        GROUP BY symbol, interval
+        ON CONFLICT ON CONSTRAINT uq_stock_data_coverage DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Backfilled rows cannot be told apart from recorded ones; leave them
+    pass
@@ -0,0 +1,28 @@
+"""add result_format to backtest_runs
+
+Revision ID: c3e1f7a2b9d4
+Revises: 90126ec99a1c
+Create Date: 2026-10-17 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e1f7a2b9d4'
+down_revision: Union[str, Sequence[str], None] = '90126ec99a1c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('backtest_runs', sa.Column('result_format', sa.String(length=10), nullable=False, server_default='rows'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('backtest_runs', 'result_format')
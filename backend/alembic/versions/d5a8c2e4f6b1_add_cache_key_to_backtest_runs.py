@@ -0,0 +1,30 @@
+"""add cache_key to backtest_runs
+
+Revision ID: d5a8c2e4f6b1
+Revises: c3e1f7a2b9d4
+Create Date: 2026-10-17 11:02:47.518734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a8c2e4f6b1'
+down_revision: Union[str, Sequence[str], None] = 'c3e1f7a2b9d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('backtest_runs', sa.Column('cache_key', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_backtest_runs_cache_key'), 'backtest_runs', ['cache_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_backtest_runs_cache_key'), table_name='backtest_runs')
+    op.drop_column('backtest_runs', 'cache_key')
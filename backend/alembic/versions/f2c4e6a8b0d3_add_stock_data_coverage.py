@@ -0,0 +1,37 @@
+"""add stock_data_coverage
+
+Revision ID: f2c4e6a8b0d3
+Revises: e7b9d1f3a5c8
+Create Date: 2026-10-17 16:24:38.910352
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c4e6a8b0d3'
+down_revision: Union[str, Sequence[str], None] = 'e7b9d1f3a5c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('stock_data_coverage',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('symbol', sa.String(length=20), nullable=False),
+    sa.Column('interval', sa.String(length=10), nullable=False),
+    sa.Column('ranges', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('symbol', 'interval', name='uq_stock_data_coverage')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('stock_data_coverage')
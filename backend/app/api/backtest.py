@@ -1,25 +1,75 @@
+import asyncio
+import time
 import uuid
+from functools import partial
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import select
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.data.registry import registry
 from app.db.session import get_db
-from app.engine.backtester import BacktestEngine
-from app.models.db_models import BacktestRun
-from app.models.domain import BacktestRequest, BacktestResult
+from app.engine.backtester import BacktestEngine, rows_from_columns
+from app.engine.batch import run_batch
+from app.engine.downsample import (
+    MIN_POINTS,
+    downsample_equity_curve,
+    downsample_indicator_data,
+    downsample_result,
+)
+from app.engine.monte_carlo import run_monte_carlo
+from app.engine.result_cache import cache_key, result_cache
+from app.engine.streaming import run_streaming, validate_streaming
+from app.engine.sweep import run_sweep
+from app.engine.walk_forward import run_walk_forward
+from app.models.db_models import BacktestEquityChunk, BacktestRun
+from app.models.domain import (
+    BacktestRequest,
+    BacktestResult,
+    BatchRequest,
+    BatchResult,
+    MonteCarloRequest,
+    MonteCarloResult,
+    ResultFormat,
+    SweepRequest,
+    SweepResult,
+    WalkForwardRequest,
+    WalkForwardResult,
+)
 from app.strategies.registry import strategy_registry
 
 router = APIRouter(prefix="/api", tags=["backtest"])
 
+MAX_POINTS_QUERY = Query(
+    None,
+    ge=MIN_POINTS,
+    description="Downsample the equity curve and indicator series to about this many points; "
+    "omit for full resolution",
+)
+
 
 @router.post("/backtest", response_model=BacktestResult)
-async def run_backtest(request: BacktestRequest, db: AsyncSession = Depends(get_db)):
+async def run_backtest(
+    request: BacktestRequest,
+    use_cache: bool = Query(True, description="Serve identical earlier runs from the result cache"),
+    max_points: int | None = MAX_POINTS_QUERY,
+    db: AsyncSession = Depends(get_db),
+):
     strategy = strategy_registry.get(request.strategy_name)
+    key = cache_key(request, strategy)
+    if use_cache:
+        cached = await result_cache.lookup(db, key)
+        if cached is not None:
+            return downsample_result(cached, max_points)
+
     provider = registry.get()
     engine = BacktestEngine(provider)
-    result = await engine.run(request, strategy)
+    try:
+        result = await engine.run(request, strategy)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Persist to DB
     db_run = BacktestRun(
@@ -35,14 +85,121 @@ async def run_backtest(request: BacktestRequest, db: AsyncSession = Depends(get_
         equity_curve=result.equity_curve,
         trades=result.trades,
         indicator_data=result.indicator_data,
+        result_format=result.result_format.value,
+        cache_key=key,
         duration_ms=result.duration_ms,
     )
     db.add(db_run)
     await db.commit()
+    result_cache.put(
+        key, result, request.symbols, request.interval, request.start_date, request.end_date
+    )
+
+    # Stored and cached at full resolution; only the response is reduced
+    return downsample_result(result, max_points)
+
+
+@router.post("/backtest/stream", response_model=BacktestResult)
+async def run_streaming_backtest(
+    request: BacktestRequest,
+    chunk_size: int = Query(settings.stream_chunk_bars, description="Bars per chunk"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Backtest in fixed-size chunks, writing the equity curve to storage as it
+    is produced. Fetch it afterwards from GET /backtests/{id}/equity."""
+    strategy = strategy_registry.get(request.strategy_name)
+    try:
+        validate_streaming(request, strategy, chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # The run row comes first so equity chunks can reference it
+    run_id = uuid.uuid4()
+    db.add(BacktestRun(
+        id=run_id,
+        symbols=request.symbols,
+        strategy_name=request.strategy_name,
+        params=request.params,
+        start_date=request.start_date,
+        end_date=request.end_date,
+        interval=request.interval,
+        initial_cash=request.initial_cash,
+        result_format=request.result_format.value,
+    ))
+    await db.commit()
+
+    async def store_chunk(seq: int, columns: dict[str, list]) -> None:
+        await db.execute(insert(BacktestEquityChunk).values(run_id=run_id, seq=seq, data=columns))
+        await db.commit()
 
+    provider = registry.get()
+    try:
+        result = await run_streaming(request, strategy, provider, store_chunk, str(run_id), chunk_size)
+    except ValueError as e:
+        await db.execute(delete(BacktestRun).where(BacktestRun.id == run_id))
+        await db.commit()
+        raise HTTPException(status_code=400, detail=str(e))
+
+    await db.execute(
+        update(BacktestRun)
+        .where(BacktestRun.id == run_id)
+        .values(
+            metrics=result.metrics.model_dump(),
+            trades=result.trades,
+            indicator_data=result.indicator_data,
+            duration_ms=result.duration_ms,
+        )
+    )
+    await db.commit()
     return result
 
 
+@router.delete("/backtest/cache")
+async def invalidate_backtest_cache(
+    symbol: str | None = None,
+    interval: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """Forget cached results, optionally only those trading symbol at interval."""
+    await result_cache.invalidate_persisted(db, symbol, interval)
+    await db.commit()
+    return {"status": "invalidated"}
+
+
+@router.get("/backtest/cache/stats")
+async def backtest_cache_stats():
+    return result_cache.stats()
+
+
+@router.post("/backtest/sweep", response_model=SweepResult)
+async def run_parameter_sweep(request: SweepRequest):
+    strategy = strategy_registry.get(request.strategy_name)
+    provider = registry.get()
+    try:
+        return await run_sweep(request, strategy, provider)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/backtest/batch", response_model=BatchResult)
+async def run_batch_backtest(request: BatchRequest):
+    provider = registry.get()
+    try:
+        return await run_batch(request, provider)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/backtest/walk-forward", response_model=WalkForwardResult)
+async def run_walk_forward_analysis(request: WalkForwardRequest):
+    strategy = strategy_registry.get(request.strategy_name)
+    provider = registry.get()
+    try:
+        return await run_walk_forward(request, strategy, provider)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("/backtests")
 async def list_backtests(
     limit: int = 20, offset: int = 0, db: AsyncSession = Depends(get_db)
@@ -77,21 +234,31 @@ async def delete_backtest(backtest_id: str, db: AsyncSession = Depends(get_db)):
     result = await db.execute(stmt)
     run = result.scalar_one_or_none()
     if not run:
-        from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Backtest not found")
+    result_cache.forget_run(str(run.id))
     await db.delete(run)
     await db.commit()
     return {"status": "deleted"}
 
 
 @router.get("/backtests/{backtest_id}")
-async def get_backtest(backtest_id: str, db: AsyncSession = Depends(get_db)):
+async def get_backtest(
+    backtest_id: str,
+    max_points: int | None = MAX_POINTS_QUERY,
+    db: AsyncSession = Depends(get_db),
+):
     stmt = select(BacktestRun).where(BacktestRun.id == uuid.UUID(backtest_id))
     result = await db.execute(stmt)
     run = result.scalar_one_or_none()
     if not run:
-        from fastapi import HTTPException
         raise HTTPException(status_code=404, detail="Backtest not found")
+    equity_curve, indicator_data = run.equity_curve, run.indicator_data
+    if max_points is not None:
+        # Streamed runs store no equity curve here (see /equity)
+        if equity_curve:
+            equity_curve = downsample_equity_curve(equity_curve, max_points)
+        if indicator_data:
+            indicator_data = downsample_indicator_data(indicator_data, max_points)
     return {
         "id": str(run.id),
         "symbols": run.symbols,
@@ -102,9 +269,114 @@ async def get_backtest(backtest_id: str, db: AsyncSession = Depends(get_db)):
         "interval": run.interval,
         "initial_cash": float(run.initial_cash),
         "metrics": run.metrics,
-        "equity_curve": run.equity_curve,
+        "equity_curve": equity_curve,
         "trades": run.trades,
-        "indicator_data": run.indicator_data,
+        "indicator_data": indicator_data,
+        "result_format": run.result_format,
         "created_at": run.created_at.isoformat() if run.created_at else None,
         "duration_ms": run.duration_ms,
     }
+
+
+@router.get("/backtests/{backtest_id}/equity")
+async def get_backtest_equity_chunks(
+    backtest_id: str,
+    offset: int = 0,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_db),
+):
+    """Page through the stored equity chunks of a streamed backtest, in order.
+
+    Each chunk's equity_curve is in the run's result_format.
+    """
+    run_uuid = uuid.UUID(backtest_id)
+    result_format = (
+        await db.execute(select(BacktestRun.result_format).where(BacktestRun.id == run_uuid))
+    ).scalar_one_or_none()
+    if result_format is None:
+        raise HTTPException(status_code=404, detail="Backtest not found")
+
+    total = (
+        await db.execute(
+            select(func.count()).select_from(BacktestEquityChunk).where(BacktestEquityChunk.run_id == run_uuid)
+        )
+    ).scalar_one()
+    stmt = (
+        select(BacktestEquityChunk)
+        .where(BacktestEquityChunk.run_id == run_uuid)
+        .order_by(BacktestEquityChunk.seq)
+        .offset(offset)
+        .limit(limit)
+    )
+    chunks = (await db.execute(stmt)).scalars().all()
+    return {
+        "total_chunks": total,
+        "chunks": [
+            {
+                "seq": chunk.seq,
+                "equity_curve": chunk.data if result_format == ResultFormat.COLUMNAR else rows_from_columns(chunk.data),
+            }
+            for chunk in chunks
+        ],
+    }
+
+
+def _stored_column(data: list[dict] | dict | None, field: str) -> list:
+    """Values of one field from a stored series in either result format."""
+    if not data:
+        return []
+    if isinstance(data, dict):
+        return data.get(field, [])
+    return [row.get(field) for row in data]
+
+
+@router.post("/backtests/{backtest_id}/monte-carlo", response_model=MonteCarloResult)
+async def run_backtest_monte_carlo(
+    backtest_id: str,
+    request: MonteCarloRequest | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    start_time = time.time()
+    request = request or MonteCarloRequest()
+    stmt = select(BacktestRun).where(BacktestRun.id == uuid.UUID(backtest_id))
+    result = await db.execute(stmt)
+    run = result.scalar_one_or_none()
+    if not run:
+        raise HTTPException(status_code=404, detail="Backtest not found")
+
+    if run.equity_curve is None:
+        # Streamed runs keep their equity curve in chunks
+        stmt = (
+            select(BacktestEquityChunk.data["equity"])
+            .where(BacktestEquityChunk.run_id == run.id)
+            .order_by(BacktestEquityChunk.seq)
+        )
+        chunks = (await db.execute(stmt)).scalars().all()
+        equity = np.asarray([v for chunk in chunks for v in chunk or []], dtype=np.float64)
+    else:
+        equity = np.asarray(_stored_column(run.equity_curve, "equity"), dtype=np.float64)
+    pnl = np.asarray(
+        [
+            p for side, p in zip(_stored_column(run.trades, "side"), _stored_column(run.trades, "pnl"))
+            if side == "SELL" and p is not None
+        ],
+        dtype=np.float64,
+    )
+
+    loop = asyncio.get_event_loop()
+    try:
+        trade_resample, block_bootstrap = await loop.run_in_executor(
+            None,
+            partial(
+                run_monte_carlo, equity, pnl, float(run.initial_cash), run.interval, request
+            ),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return MonteCarloResult(
+        backtest_id=backtest_id,
+        trade_resample=trade_resample,
+        block_bootstrap=block_bootstrap,
+        duration_ms=int((time.time() - start_time) * 1000),
+    )
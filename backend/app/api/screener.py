@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.engine.screener import run_screen
+from app.models.domain import ScreenRequest, ScreenResult
+from app.strategies.registry import strategy_registry
+
+router = APIRouter(prefix="/api", tags=["screener"])
+
+
+@router.post("/screener", response_model=ScreenResult)
+async def screen_symbols(request: ScreenRequest, db: AsyncSession = Depends(get_db)):
+    """Evaluate one strategy across every cached symbol at an interval and
+    list the symbols whose latest bars fired a signal."""
+    strategy = strategy_registry.get(request.strategy_name)
+    try:
+        return await run_screen(request, strategy, db)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
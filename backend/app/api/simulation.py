@@ -1,6 +1,6 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -8,6 +8,7 @@ from sqlalchemy.orm import selectinload
 
 from app.data.registry import registry
 from app.db.session import get_db
+from app.engine.downsample import MIN_POINTS, downsample_equity_curve
 from app.models.db_models import SimulationSession, SimulationTrade
 from app.models.domain import SimulationRequest
 from app.simulation.manager import simulation_manager
@@ -15,6 +16,17 @@ from app.strategies.registry import strategy_registry
 
 router = APIRouter(prefix="/api", tags=["simulation"])
 
+MAX_POINTS_QUERY = Query(
+    None, ge=MIN_POINTS, description="Downsample the equity curve to about this many points"
+)
+
+
+def _with_equity_curve(state: dict | None, max_points: int | None) -> dict | None:
+    """state with its equity_curve reduced to max_points, if one is given."""
+    if max_points is None or not state or not state.get("equity_curve"):
+        return state
+    return {**state, "equity_curve": downsample_equity_curve(state["equity_curve"], max_points)}
+
 
 @router.post("/simulation")
 async def create_simulation(
@@ -29,27 +41,31 @@ async def create_simulation(
 
 
 @router.get("/simulation/{simulation_id}")
-async def get_simulation(simulation_id: str):
+async def get_simulation(simulation_id: str, max_points: int | None = MAX_POINTS_QUERY):
     state = simulation_manager.get_simulation(simulation_id)
     if not state:
         raise HTTPException(status_code=404, detail="Simulation not found")
-    return state
+    return _with_equity_curve(state, max_points)
 
 
 @router.post("/simulation/{simulation_id}/stop")
 async def stop_simulation(
-    simulation_id: str, db: AsyncSession = Depends(get_db)
+    simulation_id: str,
+    max_points: int | None = MAX_POINTS_QUERY,
+    db: AsyncSession = Depends(get_db),
 ):
     try:
         state = await simulation_manager.stop_simulation(simulation_id, db)
-        return state
+        return _with_equity_curve(state, max_points)
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.get("/simulations/{simulation_id}")
 async def get_simulation_detail(
-    simulation_id: str, db: AsyncSession = Depends(get_db)
+    simulation_id: str,
+    max_points: int | None = MAX_POINTS_QUERY,
+    db: AsyncSession = Depends(get_db),
 ):
     stmt = (
         select(SimulationSession)
@@ -75,7 +91,8 @@ async def get_simulation_detail(
         "status": session.status,
         "started_at": session.started_at.isoformat() if session.started_at else None,
         "stopped_at": session.stopped_at.isoformat() if session.stopped_at else None,
-        "final_metrics": session.final_metrics,
+        # final_metrics carries the session's equity curve
+        "final_metrics": _with_equity_curve(session.final_metrics, max_points),
         "error_message": session.error_message,
         "trades": [
             {
@@ -2,6 +2,7 @@ from datetime import datetime
 
 from fastapi import APIRouter, Query
 
+from app.data.memory import bar_memory_cache
 from app.data.registry import registry
 from app.models.domain import OHLCV, StockSearchResult
 
@@ -14,6 +15,11 @@ async def search_stocks(q: str = Query(..., min_length=1)):
     return await provider.search_symbols(q)
 
 
+@router.get("/cache/stats")
+async def bar_cache_stats():
+    return bar_memory_cache.stats()
+
+
 @router.get("/{symbol}/history", response_model=list[OHLCV])
 async def get_stock_history(
     symbol: str,
@@ -24,4 +30,5 @@ async def get_stock_history(
     provider = registry.get()
     start_dt = datetime.strptime(start, "%Y-%m-%d")
     end_dt = datetime.strptime(end, "%Y-%m-%d")
-    return await provider.get_historical(symbol, start_dt, end_dt, interval)
+    bars = await provider.get_historical(symbol, start_dt, end_dt, interval)
+    return bars.to_bars()
@@ -5,6 +5,17 @@ class Settings(BaseSettings):
     database_url: str = "postgresql+asyncpg://localhost/hft"
     cors_origins: str = "http://localhost:3000"
     data_provider: str = "yahoo"
+    max_workers: int = 0  # process pool size for sweeps; 0 = one per CPU
+    max_sweep_combinations: int = 10000
+    max_batch_cells: int = 20000  # symbols x strategies per batch request
+    monte_carlo_max_paths: int = 100000
+    monte_carlo_memory_mb: int = 256  # per-chunk working set for path matrices
+    result_cache_entries: int = 128  # in-memory backtest results kept (LRU)
+    indicator_cache_mb: int = 256  # per-process indicator memo (LRU); 0 disables
+    bar_cache_mb: int = 256  # per-process decoded bars above the Postgres cache (LRU); 0 disables
+    stream_chunk_bars: int = 50000  # default chunk size for streaming backtests
+    stream_max_chunk_bars: int = 1000000
+    max_screener_lookback: int = 2000  # bars per symbol loaded by the screener
 
     model_config = {"env_prefix": "HFT_"}
 
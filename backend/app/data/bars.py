@@ -0,0 +1,169 @@
+from collections.abc import Iterable, Sequence
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from app.models.domain import OHLCV
+
+PRICE_FIELDS = ("open", "high", "low", "close")
+FIELDS = ("timestamp", *PRICE_FIELDS, "volume")
+
+
+def timestamp_ns(ts: datetime) -> int:
+    """ts as int64 nanoseconds since the epoch; naive datetimes are taken as UTC."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return pd.Timestamp(ts).as_unit("ns").value
+
+
+def _ns_array(timestamps) -> np.ndarray:
+    index = pd.DatetimeIndex(timestamps)
+    index = index.tz_localize("UTC") if index.tz is None else index.tz_convert("UTC")
+    return index.as_unit("ns").asi8
+
+
+class BarSeries:
+    """OHLCV bars as parallel NumPy columns, oldest first.
+
+    timestamp holds int64 nanoseconds since the epoch (UTC), the prices are
+    float64 and volume is int64. This is what providers, the bar cache and
+    the engines pass around; OHLCV models are only built at the JSON edge
+    (to_bars). Slicing returns a BarSeries over views of the same arrays.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(
+        self,
+        timestamp: np.ndarray,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+    ):
+        self.timestamp = np.asarray(timestamp, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.int64)
+        n = len(self.timestamp)
+        if any(len(getattr(self, f)) != n for f in FIELDS):
+            raise ValueError("BarSeries columns must all have the same length")
+
+    @classmethod
+    def empty(cls) -> "BarSeries":
+        return cls(*(np.empty(0) for _ in FIELDS))
+
+    @classmethod
+    def from_columns(
+        cls,
+        timestamps,
+        open: Sequence[float],
+        high: Sequence[float],
+        low: Sequence[float],
+        close: Sequence[float],
+        volume: Sequence[int],
+    ) -> "BarSeries":
+        """Build from datetimes (or anything pd.DatetimeIndex accepts, in any
+        time zone; naive means UTC) and per-field sequences."""
+        return cls(_ns_array(timestamps), open, high, low, close, volume)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "BarSeries":
+        """From a frame with timestamp, open, high, low, close and volume columns."""
+        return cls.from_columns(df["timestamp"], *(df[f].to_numpy() for f in FIELDS[1:]))
+
+    @classmethod
+    def from_bars(cls, bars: Iterable[OHLCV]) -> "BarSeries":
+        bars = list(bars)
+        if not bars:
+            return cls.empty()
+        return cls.from_columns(*([getattr(b, f) for b in bars] for f in FIELDS))
+
+    @classmethod
+    def concat(cls, parts: Sequence["BarSeries"]) -> "BarSeries":
+        if not parts:
+            return cls.empty()
+        return cls(*(np.concatenate([getattr(p, f) for p in parts]) for f in FIELDS))
+
+    @classmethod
+    def merge(cls, parts: Sequence["BarSeries"]) -> "BarSeries":
+        """The bars of all parts in timestamp order, in any order and
+        overlapping; where a timestamp repeats, the earliest part's bar wins."""
+        bars = cls.concat(parts)
+        order = np.argsort(bars.timestamp, kind="stable")
+        ts = bars.timestamp[order]
+        first = np.ones(len(ts), dtype=bool)
+        first[1:] = ts[1:] != ts[:-1]
+        return bars[order[first]]
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def __getitem__(self, index) -> "BarSeries":
+        if not isinstance(index, slice):
+            index = np.asarray(index)
+            if index.ndim == 0:
+                raise TypeError("BarSeries is indexed by slices or arrays, not single positions")
+        return BarSeries(*(getattr(self, f)[index] for f in FIELDS))
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, BarSeries):
+            return NotImplemented
+        return all(np.array_equal(getattr(self, f), getattr(other, f)) for f in FIELDS)
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return "BarSeries(empty)"
+        first, last = self.datetimes()[[0, -1]]
+        return f"BarSeries({len(self)} bars, {first.isoformat()} .. {last.isoformat()})"
+
+    def between(self, start: datetime, end: datetime) -> "BarSeries":
+        """Bars with start <= timestamp <= end."""
+        lo = np.searchsorted(self.timestamp, timestamp_ns(start), side="left")
+        hi = np.searchsorted(self.timestamp, timestamp_ns(end), side="right")
+        return self[lo:hi]
+
+    def close_asof(self, timestamps: np.ndarray) -> np.ndarray:
+        """The close of the latest bar at or before each of timestamps (int64
+        ns, ascending); NaN before the first bar. Aligns another symbol's
+        bars onto these timestamps, carrying its last close across bars it
+        has no trade for."""
+        if not len(self):
+            return np.full(len(timestamps), np.nan)
+        pos = np.searchsorted(self.timestamp, timestamps, side="right") - 1
+        out = self.close[np.maximum(pos, 0)]
+        out[pos < 0] = np.nan
+        return out
+
+    def datetimes(self) -> pd.DatetimeIndex:
+        """The timestamps as a UTC DatetimeIndex (its items are datetimes)."""
+        return pd.DatetimeIndex(pd.to_datetime(self.timestamp, unit="ns", utc=True))
+
+    def to_frame(self) -> pd.DataFrame:
+        """The frame strategies and the backtester work on, timestamp as UTC datetime64."""
+        return pd.DataFrame({
+            "timestamp": self.datetimes(),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+        })
+
+    def to_bars(self) -> list[OHLCV]:
+        """One OHLCV model per bar, for API responses."""
+        return [
+            OHLCV(timestamp=ts, open=o, high=h, low=lo, close=c, volume=v)
+            for ts, o, h, lo, c, v in zip(
+                self.datetimes().to_pydatetime(),
+                self.open.tolist(),
+                self.high.tolist(),
+                self.low.tolist(),
+                self.close.tolist(),
+                self.volume.tolist(),
+            )
+        ]
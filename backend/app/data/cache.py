@@ -1,20 +1,90 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
 from datetime import datetime, timezone
+from functools import partial
 
-from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import Float, cast, func, select
+from sqlalchemy.dialects.postgresql import Insert, insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.data.bars import FIELDS, PRICE_FIELDS, BarSeries
+from app.data.coverage import (
+    Range,
+    merge_ranges,
+    missing_ranges,
+    ranges_from_json,
+    ranges_to_json,
+)
+from app.data.memory import BarMemoryCache
 from app.data.provider import DataProvider
-from app.models.db_models import StockDataCache
-from app.models.domain import OHLCV, StockSearchResult
+from app.data.singleflight import SingleFlight
+from app.models.db_models import StockDataCache, StockDataCoverage
+from app.models.domain import StockSearchResult
+
+# Called with (session, symbol, interval, first, last) inside the session that
+# wrote new bars, before it commits; first and last are the new bars' first
+# and last timestamps.
+StoreListener = Callable[[AsyncSession, str, str, datetime, datetime], Awaitable[None]]
+
+# Rows per multi-row INSERT: Postgres allows 32767 bind parameters per
+# statement and each bar row binds eight
+STORE_BATCH_ROWS = 4000
+
+
+def store_statements(
+    symbol: str, interval: str, bars: BarSeries, batch_rows: int = STORE_BATCH_ROWS
+) -> Iterator[Insert]:
+    """Multi-row INSERT ... ON CONFLICT DO NOTHING statements writing bars,
+    batch_rows bars per statement, so a cache fill is a handful of round
+    trips instead of one per bar."""
+    columns = zip(
+        bars.datetimes().to_pydatetime(),
+        bars.open.tolist(),
+        bars.high.tolist(),
+        bars.low.tolist(),
+        bars.close.tolist(),
+        bars.volume.tolist(),
+    )
+    rows = [
+        {
+            "symbol": symbol,
+            "interval": interval,
+            "timestamp": ts,
+            "open": o,
+            "high": h,
+            "low": lo,
+            "close": c,
+            "volume": v,
+        }
+        for ts, o, h, lo, c, v in columns
+    ]
+    for i in range(0, len(rows), batch_rows):
+        yield (
+            insert(StockDataCache)
+            .values(rows[i : i + batch_rows])
+            .on_conflict_do_nothing(constraint="uq_stock_data_cache")
+        )
 
 
 class CachedDataProvider(DataProvider):
     """Wraps any DataProvider with PostgreSQL-backed caching for historical data."""
 
-    def __init__(self, provider: DataProvider, session_factory):
+    def __init__(
+        self,
+        provider: DataProvider,
+        session_factory,
+        memory: BarMemoryCache | None = None,
+    ):
         self._provider = provider
         self._session_factory = session_factory
+        # Optional in-process tier checked before Postgres
+        self._memory = memory
+        self._store_listeners: list[StoreListener] = []
+        self._flights = SingleFlight()
+
+    def add_store_listener(self, listener: StoreListener) -> None:
+        """Register a callback run whenever bars are written to the cache."""
+        self._store_listeners.append(listener)
 
     @property
     def name(self) -> str:
@@ -26,31 +96,60 @@ class CachedDataProvider(DataProvider):
         start: datetime,
         end: datetime,
         interval: str = "1d",
-    ) -> list[OHLCV]:
+    ) -> BarSeries:
         # Ensure start/end are timezone-aware for comparison with DB timestamps
         if start.tzinfo is None:
             start = start.replace(tzinfo=timezone.utc)
         if end.tzinfo is None:
             end = end.replace(tzinfo=timezone.utc)
 
-        async with self._session_factory() as session:
-            cached = await self._get_cached(session, symbol, start, end, interval)
+        if self._memory is not None:
+            bars = self._memory.get(symbol, interval, start, end)
+            if bars is not None:
+                return bars
+        # Identical concurrent requests share one load (and one upstream fetch)
+        return await self._flights.do(
+            ("historical", symbol, interval, start, end),
+            partial(self._load, symbol, start, end, interval),
+        )
 
-            if cached:
-                cached_start = min(b.timestamp for b in cached)
-                cached_end = max(b.timestamp for b in cached)
-                # Normalize for comparison
-                cs = cached_start.replace(tzinfo=timezone.utc) if cached_start.tzinfo is None else cached_start
-                ce = cached_end.replace(tzinfo=timezone.utc) if cached_end.tzinfo is None else cached_end
-                if cs <= start and ce >= end:
-                    return [b for b in cached if start <= (b.timestamp.replace(tzinfo=timezone.utc) if b.timestamp.tzinfo is None else b.timestamp) <= end]
+    async def iter_historical(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        interval: str = "1d",
+        chunk_size: int = 50_000,
+    ) -> AsyncIterator[BarSeries]:
+        """Page through cached bars with keyset pagination, one query per chunk.
 
-            fresh = await self._provider.get_historical(symbol, start, end, interval)
+        Parts of the range the cache does not cover are fetched and stored
+        first; upstream providers return a range in one piece, so that fetch
+        is the only point where more than a chunk is held in memory.
+        """
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
 
-            if fresh:
-                await self._store_bars(session, symbol, interval, fresh)
+        await self._flights.do(
+            ("fill", symbol, interval, start, end),
+            partial(self._fill_missing, symbol, start, end, interval),
+        )
 
-            return fresh
+        after = None
+        while True:
+            # A fresh session per page so the identity map does not grow
+            async with self._session_factory() as session:
+                chunk = await self._get_cached(
+                    session, symbol, start, end, interval, after=after, limit=chunk_size
+                )
+            if not len(chunk):
+                return
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            after = chunk.datetimes()[-1].to_pydatetime()
 
     async def get_latest_price(self, symbol: str) -> float:
         return await self._provider.get_latest_price(symbol)
@@ -58,6 +157,48 @@ class CachedDataProvider(DataProvider):
     async def search_symbols(self, query: str) -> list[StockSearchResult]:
         return await self._provider.search_symbols(query)
 
+    async def _load(
+        self, symbol: str, start: datetime, end: datetime, interval: str
+    ) -> BarSeries:
+        """get_historical below the memory tier: Postgres, then upstream for
+        the gaps. Opens its own session, since it runs as a task shared by
+        every caller waiting on the same request."""
+        now = datetime.now(timezone.utc)
+
+        async with self._session_factory() as session:
+            covered = await self._covered_ranges(session, symbol, start, end, interval)
+            gaps = missing_ranges(covered, start, end)
+            fetched: list[Range] = []
+            if gaps == [(start, end)]:
+                # Nothing cached in range: the fetch is the whole answer
+                bars, fetched = await self._fill(session, symbol, interval, covered, gaps)
+            else:
+                bars = await self._get_cached(session, symbol, start, end, interval)
+                if gaps:
+                    fresh, fetched = await self._fill(session, symbol, interval, covered, gaps)
+                    bars = BarSeries.merge([bars, fresh])
+
+        # Like the coverage table, the memory tier only vouches for the past,
+        # and only where the cache or upstream actually answered
+        past = (start, min(end, now))
+        if (
+            self._memory is not None
+            and start <= past[1]
+            and not missing_ranges([*covered, *fetched], *past)
+        ):
+            self._memory.put(symbol, interval, bars, past)
+        return bars
+
+    async def _fill_missing(
+        self, symbol: str, start: datetime, end: datetime, interval: str
+    ) -> None:
+        """Fetch and store whatever part of [start, end] is not covered."""
+        async with self._session_factory() as session:
+            covered = await self._covered_ranges(session, symbol, start, end, interval)
+            gaps = missing_ranges(covered, start, end)
+            if gaps:
+                await self._fill(session, symbol, interval, covered, gaps)
+
     async def _get_cached(
         self,
         session: AsyncSession,
@@ -65,9 +206,17 @@ class CachedDataProvider(DataProvider):
         start: datetime,
         end: datetime,
         interval: str,
-    ) -> list[OHLCV]:
+        after: datetime | None = None,
+        limit: int | None = None,
+    ) -> BarSeries:
+        # Plain columns rather than ORM objects, with the Numeric prices cast
+        # in SQL so rows arrive as floats instead of Decimals
         stmt = (
-            select(StockDataCache)
+            select(
+                StockDataCache.timestamp,
+                *(cast(getattr(StockDataCache, f), Float) for f in PRICE_FIELDS),
+                StockDataCache.volume,
+            )
             .where(
                 StockDataCache.symbol == symbol,
                 StockDataCache.interval == interval,
@@ -76,43 +225,141 @@ class CachedDataProvider(DataProvider):
             )
             .order_by(StockDataCache.timestamp)
         )
-        result = await session.execute(stmt)
-        rows = result.scalars().all()
-        return [
-            OHLCV(
-                timestamp=row.timestamp,
-                open=float(row.open),
-                high=float(row.high),
-                low=float(row.low),
-                close=float(row.close),
-                volume=int(row.volume),
-            )
-            for row in rows
+        if after is not None:
+            stmt = stmt.where(StockDataCache.timestamp > after)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        rows = (await session.execute(stmt)).all()
+        if not rows:
+            return BarSeries.empty()
+        return BarSeries.from_columns(*([row[i] for row in rows] for i in range(len(FIELDS))))
+
+    async def _covered_ranges(
+        self,
+        session: AsyncSession,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        interval: str,
+    ) -> list[Range]:
+        """Ranges the cache can answer without a fetch, from the coverage table.
+
+        Bars cached before the table existed have no coverage row; for them
+        the span between their first and last timestamp in [start, end] is
+        taken as covered, and it is recorded with the next fill.
+        """
+        stmt = select(StockDataCoverage.ranges).where(
+            StockDataCoverage.symbol == symbol,
+            StockDataCoverage.interval == interval,
+        )
+        ranges = (await session.execute(stmt)).scalar_one_or_none()
+        if ranges is not None:
+            return ranges_from_json(ranges)
+
+        stmt = select(
+            func.min(StockDataCache.timestamp), func.max(StockDataCache.timestamp)
+        ).where(
+            StockDataCache.symbol == symbol,
+            StockDataCache.interval == interval,
+            StockDataCache.timestamp >= start,
+            StockDataCache.timestamp <= end,
+        )
+        cached_start, cached_end = (await session.execute(stmt)).one()
+        if cached_start is None:
+            return []
+        cs = cached_start.replace(tzinfo=timezone.utc) if cached_start.tzinfo is None else cached_start
+        ce = cached_end.replace(tzinfo=timezone.utc) if cached_end.tzinfo is None else cached_end
+        return [(cs, ce)]
+
+    async def _fill(
+        self,
+        session: AsyncSession,
+        symbol: str,
+        interval: str,
+        covered: list[Range],
+        gaps: list[Range],
+    ) -> tuple[BarSeries, list[Range]]:
+        """Fetch the gaps from upstream, concurrently, then store the bars and
+        the widened coverage in one transaction. Returns the new bars and
+        the ranges they were marked covered for.
+
+        Each gap the provider answered is marked covered, with or without
+        bars in it, up to the time of the fetch, so a range reaching into
+        the future is fetched again from there next time. A failed fetch
+        leaves its gap uncovered to be retried; the other gaps are still
+        stored, then the first failure is raised.
+        """
+        fetched_at = datetime.now(timezone.utc)
+        results = await asyncio.gather(
+            *(self._provider.get_historical(symbol, lo, hi, interval) for lo, hi in gaps),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        parts = [r for r in results if not isinstance(r, BaseException)]
+        fresh = BarSeries.merge(parts)
+        if len(fresh):
+            await self._store_bars(session, symbol, interval, fresh)
+        fetched = [
+            (lo, min(hi, fetched_at))
+            for (lo, hi), r in zip(gaps, results)
+            if not isinstance(r, BaseException)
         ]
+        await self._record_coverage(session, symbol, interval, [*covered, *fetched], fetched_at)
+        await session.commit()
+        if errors:
+            raise errors[0]
+        return fresh, fetched
 
-    async def _store_bars(
+    async def _record_coverage(
         self,
         session: AsyncSession,
         symbol: str,
         interval: str,
-        bars: list[OHLCV],
+        ranges: list[Range],
+        refreshed_at: datetime,
     ) -> None:
-        for bar in bars:
-            stmt = (
-                insert(StockDataCache)
+        """Add ranges to the coverage row, creating it if needed.
+
+        The row is locked while it is merged, so concurrent fills of one
+        symbol each keep the other's ranges. When two first fills race to
+        create it, the loser's insert does nothing and it merges into the
+        winner's row instead.
+        """
+        stmt = (
+            select(StockDataCoverage)
+            .where(
+                StockDataCoverage.symbol == symbol,
+                StockDataCoverage.interval == interval,
+            )
+            .with_for_update()
+        )
+        row = (await session.execute(stmt)).scalar_one_or_none()
+        if row is None:
+            inserted = await session.execute(
+                insert(StockDataCoverage)
                 .values(
                     symbol=symbol,
                     interval=interval,
-                    timestamp=bar.timestamp,
-                    open=bar.open,
-                    high=bar.high,
-                    low=bar.low,
-                    close=bar.close,
-                    volume=bar.volume,
-                )
-                .on_conflict_do_nothing(
-                    constraint="uq_stock_data_cache"
+                    ranges=ranges_to_json(merge_ranges(ranges)),
+                    refreshed_at=refreshed_at,
                 )
+                .on_conflict_do_nothing(constraint="uq_stock_data_coverage")
             )
+            if inserted.rowcount:
+                return
+            row = (await session.execute(stmt)).scalar_one()
+        row.ranges = ranges_to_json(merge_ranges([*ranges_from_json(row.ranges), *ranges]))
+        row.refreshed_at = refreshed_at
+
+    async def _store_bars(
+        self,
+        session: AsyncSession,
+        symbol: str,
+        interval: str,
+        bars: BarSeries,
+    ) -> None:
+        for stmt in store_statements(symbol, interval, bars):
             await session.execute(stmt)
-        await session.commit()
+        first, last = bars.datetimes()[[0, -1]].to_pydatetime()
+        for listener in self._store_listeners:
+            await listener(session, symbol, interval, first, last)
@@ -0,0 +1,60 @@
+"""Time ranges a bar cache holds, as sorted lists of closed [start, end] ranges.
+
+A range is covered once the upstream provider has answered for it, whether
+or not it had bars there (weekends, holidays and halts are covered too), so
+only the parts of a request outside every covered range are fetched again.
+A fetch that fails leaves its range uncovered.
+The stock_data_coverage table stores them as JSON (ranges_to_json).
+"""
+
+from collections.abc import Iterable
+from datetime import datetime
+
+Range = tuple[datetime, datetime]
+
+
+def merge_ranges(ranges: Iterable[Range]) -> list[Range]:
+    """The union of ranges as sorted, disjoint ranges; ranges that overlap
+    or share an endpoint are joined."""
+    merged: list[Range] = []
+    for start, end in sorted(ranges):
+        if start > end:
+            continue
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def missing_ranges(covered: Iterable[Range], start: datetime, end: datetime) -> list[Range]:
+    """The parts of [start, end] outside every covered range, in order.
+
+    Each gap includes the endpoints of the covered ranges around it, so
+    fetching the gaps as closed ranges misses no bar; bars fetched twice at
+    a boundary are dropped when merged with the cache.
+    """
+    gaps: list[Range] = []
+    cursor = start
+    for lo, hi in merge_ranges(covered):
+        if hi < cursor:
+            continue
+        if lo > end:
+            break
+        if lo > cursor:
+            gaps.append((cursor, lo))
+        cursor = hi
+        if cursor >= end:
+            return gaps
+    if cursor < end or cursor == start == end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def ranges_to_json(ranges: Iterable[Range]) -> list[list[str]]:
+    return [[lo.isoformat(), hi.isoformat()] for lo, hi in ranges]
+
+
+def ranges_from_json(data: list[list[str]]) -> list[Range]:
+    return [(datetime.fromisoformat(lo), datetime.fromisoformat(hi)) for lo, hi in data]
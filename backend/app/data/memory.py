@@ -0,0 +1,105 @@
+from collections import OrderedDict
+from datetime import datetime
+
+from app.config import settings
+from app.data.bars import FIELDS, BarSeries
+from app.data.coverage import Range, merge_ranges, missing_ranges
+
+
+def _freeze(bars: BarSeries) -> BarSeries:
+    for field in FIELDS:
+        getattr(bars, field).flags.writeable = False
+    return bars
+
+
+class BarMemoryCache:
+    """Process-wide LRU of decoded bars keyed by (symbol, interval), in front
+    of the Postgres bar cache.
+
+    Each entry holds one BarSeries and the ranges it is complete for, so a
+    request inside them is answered by two binary searches on timestamp
+    without a database round trip; anything else is a miss and falls
+    through to Postgres (and from there upstream). The arrays are read-only
+    and handed out as slices, not copies. Entries are evicted least
+    recently used first once their arrays exceed max_bytes; 0 disables
+    caching.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[str, str], tuple[BarSeries, list[Range]]] = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _size(bars: BarSeries) -> int:
+        return sum(getattr(bars, field).nbytes for field in FIELDS)
+
+    def get(self, symbol: str, interval: str, start: datetime, end: datetime) -> BarSeries | None:
+        """Bars with start <= timestamp <= end, or None unless the entry for
+        (symbol, interval) is complete over that whole range."""
+        key = (symbol, interval)
+        entry = self._entries.get(key)
+        if entry is None or missing_ranges(entry[1], start, end):
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0].between(start, end)
+
+    def put(self, symbol: str, interval: str, bars: BarSeries, covered: Range) -> None:
+        """Add bars, the complete set of bars over the covered range, to the
+        entry for (symbol, interval)."""
+        if self.max_bytes <= 0:
+            return
+        key = (symbol, interval)
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.nbytes -= self._size(entry[0])
+            bars = BarSeries.merge([bars, entry[0]])
+            ranges = merge_ranges([*entry[1], covered])
+        else:
+            bars = BarSeries.merge([bars])
+            ranges = [covered]
+        size = self._size(bars)
+        if size > self.max_bytes:
+            if entry is not None:
+                # Too big to keep merged, so the entry it replaced is gone too
+                self.evictions += 1
+            return
+        self._entries[key] = (_freeze(bars), ranges)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (evicted, _) = self._entries.popitem(last=False)
+            self.nbytes -= self._size(evicted)
+            self.evictions += 1
+
+    def invalidate(self, symbol: str | None = None, interval: str | None = None) -> int:
+        """Drop entries for symbol at interval (either None = any)."""
+        stale = [
+            key
+            for key in self._entries
+            if (symbol is None or key[0] == symbol) and (interval is None or key[1] == interval)
+        ]
+        for key in stale:
+            self.nbytes -= self._size(self._entries.pop(key)[0])
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+bar_memory_cache = BarMemoryCache(settings.bar_cache_mb * 2**20)
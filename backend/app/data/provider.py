@@ -1,8 +1,10 @@
 import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from datetime import datetime
 
-from app.models.domain import OHLCV, StockSearchResult
+from app.data.bars import BarSeries
+from app.models.domain import StockSearchResult
 
 
 class DataProvider(ABC):
@@ -24,8 +26,26 @@ class DataProvider(ABC):
         start: datetime,
         end: datetime,
         interval: str = "1d",
-    ) -> list[OHLCV]:
-        """Fetch historical OHLCV bars."""
+    ) -> BarSeries:
+        """Fetch historical OHLCV bars, oldest first."""
+
+    async def iter_historical(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        interval: str = "1d",
+        chunk_size: int = 50_000,
+    ) -> AsyncIterator[BarSeries]:
+        """Yield historical bars in order, at most chunk_size per chunk.
+
+        The default fetches the whole range and slices it; providers that can
+        page through their source should override this so only one chunk is
+        held at a time.
+        """
+        bars = await self.get_historical(symbol, start, end, interval)
+        for i in range(0, len(bars), chunk_size):
+            yield bars[i : i + chunk_size]
 
     @abstractmethod
     async def get_latest_price(self, symbol: str) -> float:
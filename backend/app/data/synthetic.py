@@ -0,0 +1,131 @@
+import math
+import zlib
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+
+from app.data.bars import BarSeries
+from app.data.provider import DataProvider
+from app.engine.metrics import periods_per_year
+from app.models.domain import StockSearchResult
+
+_INTERVAL_STEP = {
+    "1m": timedelta(minutes=1),
+    "2m": timedelta(minutes=2),
+    "5m": timedelta(minutes=5),
+    "15m": timedelta(minutes=15),
+    "30m": timedelta(minutes=30),
+    "60m": timedelta(hours=1),
+    "90m": timedelta(minutes=90),
+    "1h": timedelta(hours=1),
+    "1d": timedelta(days=1),
+    "5d": timedelta(days=5),
+    "1wk": timedelta(weeks=1),
+    "1mo": timedelta(days=30),
+    "3mo": timedelta(days=91),
+}
+
+
+def synthetic_frame(
+    n_bars: int,
+    symbol: str = "SYN",
+    start: datetime = datetime(2000, 1, 1, tzinfo=timezone.utc),
+    interval: str = "1d",
+    seed: int = 0,
+    drift: float = 0.05,
+    volatility: float = 0.2,
+    start_price: float = 100.0,
+) -> pd.DataFrame:
+    """n_bars of geometric Brownian motion OHLCV as a DataFrame.
+
+    drift and volatility are annualized; each bar is one interval step, with
+    no market calendar. The same (seed, symbol, interval) always gives the
+    same bars, and a shorter series is a prefix of a longer one.
+    """
+    rng = np.random.default_rng([seed, zlib.crc32(symbol.encode())])
+    # One row of draws per bar, so a shorter series is a prefix of a longer one
+    z = rng.standard_normal((n_bars, 4))
+    dt = 1 / periods_per_year(interval)
+    sigma = volatility * math.sqrt(dt)
+    close = start_price * np.exp(np.cumsum((drift - volatility**2 / 2) * dt + sigma * z[:, 0]))
+    open_ = np.concatenate(([start_price], close[:-1]))[:n_bars]
+    high = np.maximum(open_, close) * (1 + np.abs(z[:, 1]) * sigma / 2)
+    low = np.minimum(open_, close) * (1 - np.abs(z[:, 2]) * sigma / 2)
+    volume = np.exp(math.log(1e5) + 0.5 * z[:, 3]).astype(np.int64)
+
+    step = _INTERVAL_STEP.get(interval, timedelta(days=1))
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    timestamps = pd.date_range(start, periods=n_bars, freq=step)
+
+    return pd.DataFrame({
+        "timestamp": timestamps,
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": volume,
+    })
+
+
+class SyntheticProvider(DataProvider):
+    """Offline provider of deterministic GBM bars, for tests and benchmarks.
+
+    Every request starts a fresh path at start_price on the requested start
+    date, seeded by (seed, symbol). max_bars caps the bars returned per
+    request, so callers can ask for an exact bar count regardless of the
+    date range.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        drift: float = 0.05,
+        volatility: float = 0.2,
+        start_price: float = 100.0,
+        max_bars: int | None = None,
+    ):
+        self.seed = seed
+        self.drift = drift
+        self.volatility = volatility
+        self.start_price = start_price
+        self.max_bars = max_bars
+
+    @property
+    def name(self) -> str:
+        return "synthetic"
+
+    async def get_historical(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        interval: str = "1d",
+    ) -> BarSeries:
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
+        step = _INTERVAL_STEP.get(interval, timedelta(days=1))
+        n_bars = max(0, (end - start) // step)
+        if self.max_bars is not None:
+            n_bars = min(n_bars, self.max_bars)
+        df = synthetic_frame(
+            n_bars,
+            symbol=symbol,
+            start=start,
+            interval=interval,
+            seed=self.seed,
+            drift=self.drift,
+            volatility=self.volatility,
+            start_price=self.start_price,
+        )
+        return BarSeries.from_frame(df)
+
+    async def get_latest_price(self, symbol: str) -> float:
+        return self.start_price
+
+    async def search_symbols(self, query: str) -> list[StockSearchResult]:
+        query = query.upper()
+        return [StockSearchResult(symbol=query, name=f"Synthetic {query}", exchange="SYNTH")] if query else []
@@ -1,14 +1,21 @@
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta
 from functools import partial
 
 import yfinance as yf
+from yfinance.exceptions import YFTickerMissingError
 
+from app.data.bars import BarSeries
 from app.data.provider import DataProvider
-from app.models.domain import OHLCV, StockSearchResult
+from app.data.singleflight import SingleFlight
+from app.models.domain import StockSearchResult
 
 
 class YahooFinanceProvider(DataProvider):
+    def __init__(self):
+        # Identical concurrent requests share one yfinance call
+        self._flights = SingleFlight()
+
     @property
     def name(self) -> str:
         return "yahoo"
@@ -19,50 +26,68 @@ class YahooFinanceProvider(DataProvider):
         start: datetime,
         end: datetime,
         interval: str = "1d",
-    ) -> list[OHLCV]:
+    ) -> BarSeries:
+        return await self._flights.do(
+            ("historical", symbol, interval, start, end),
+            partial(self._historical, symbol, start, end, interval),
+        )
+
+    async def get_latest_price(self, symbol: str) -> float:
+        return await self._flights.do(("latest_price", symbol), partial(self._latest_price, symbol))
+
+    async def search_symbols(self, query: str) -> list[StockSearchResult]:
+        return await self._flights.do(("search", query), partial(self._search_symbols, query))
+
+    async def _historical(
+        self, symbol: str, start: datetime, end: datetime, interval: str
+    ) -> BarSeries:
         loop = asyncio.get_event_loop()
+        # yfinance takes whole dates with an exclusive end, so ask for every
+        # day the range touches and trim to the exact range below
         df = await loop.run_in_executor(
             None,
             partial(
                 self._fetch_history,
                 symbol=symbol,
                 start=start.strftime("%Y-%m-%d"),
-                end=end.strftime("%Y-%m-%d"),
+                end=(end + timedelta(days=1)).strftime("%Y-%m-%d"),
                 interval=interval,
             ),
         )
         if df is None or df.empty:
-            return []
-
-        bars = []
-        for idx, row in df.iterrows():
-            bars.append(
-                OHLCV(
-                    timestamp=idx.to_pydatetime(),
-                    open=float(row["Open"]),
-                    high=float(row["High"]),
-                    low=float(row["Low"]),
-                    close=float(row["Close"]),
-                    volume=int(row["Volume"]),
-                )
-            )
-        return bars
+            return BarSeries.empty()
 
-    async def get_latest_price(self, symbol: str) -> float:
+        bars = BarSeries.from_columns(
+            df.index,
+            df["Open"].to_numpy(),
+            df["High"].to_numpy(),
+            df["Low"].to_numpy(),
+            df["Close"].to_numpy(),
+            df["Volume"].to_numpy(),
+        )
+        return bars.between(start, end)
+
+    async def _latest_price(self, symbol: str) -> float:
         loop = asyncio.get_event_loop()
         ticker = await loop.run_in_executor(None, partial(yf.Ticker, symbol))
         info = await loop.run_in_executor(None, lambda: ticker.fast_info)
         return float(info["lastPrice"])
 
-    async def search_symbols(self, query: str) -> list[StockSearchResult]:
+    async def _search_symbols(self, query: str) -> list[StockSearchResult]:
         loop = asyncio.get_event_loop()
         results = await loop.run_in_executor(None, partial(self._search, query))
         return results
 
     @staticmethod
     def _fetch_history(symbol: str, start: str, end: str, interval: str):
+        # By default yfinance logs failed requests and returns an empty frame,
+        # which callers would take for a range with no bars; raise instead,
+        # keeping only "no prices for this symbol/range" as an empty answer
         ticker = yf.Ticker(symbol)
-        return ticker.history(start=start, end=end, interval=interval)
+        try:
+            return ticker.history(start=start, end=end, interval=interval, raise_errors=True)
+        except YFTickerMissingError:
+            return None
 
     @staticmethod
     def _search(query: str) -> list[StockSearchResult]:
@@ -1,58 +1,264 @@
+import asyncio
 import time
 import uuid
+from datetime import date, datetime
 
+import numpy as np
 import pandas as pd
 
 from app.data.provider import DataProvider
+from app.engine.execution import ExecutionResult, execute_signal_matrix, execute_signals
 from app.engine.metrics import compute_metrics
-from app.models.domain import BacktestRequest, BacktestResult, Order, OrderSide
+from app.models.domain import (
+    BacktestMetrics,
+    BacktestRequest,
+    BacktestResult,
+    ExecutionMode,
+    Fill,
+    Order,
+    OrderSide,
+    ResultFormat,
+)
 from app.simulation.broker import SimulatedBroker
 from app.strategies.base import Strategy
 
+POSITION_SIZE_PCT = 0.1  # Use 10% of cash per trade
+SLIPPAGE_BPS = 1.0
+
+NON_INDICATOR_COLUMNS = {"timestamp", "open", "high", "low", "close", "volume", "signal", "close_2"}
+TRADE_FIELDS = ["timestamp", "symbol", "side", "quantity", "price", "fee", "pnl"]
+
 
 class BacktestEngine:
     def __init__(self, data_provider: DataProvider):
         self.data_provider = data_provider
 
     async def run(self, request: BacktestRequest, strategy: Strategy) -> BacktestResult:
+        if request.multi_asset:
+            return await self._run_portfolio(request, strategy)
+
         start_time = time.time()
         run_id = str(uuid.uuid4())
 
         # 1. Fetch historical data
-        from datetime import datetime
+        df = await self.load_frame(
+            request.symbols, request.start_date, request.end_date, request.interval, strategy
+        )
+        if df is None:
+            return self._empty_result(run_id, request.initial_cash)
+
+        # 2. Generate signals
+        params = strategy.validate_params(request.params)
+        df = strategy.generate_signals(df, params)
 
-        start_dt = datetime.combine(request.start_date, datetime.min.time())
-        end_dt = datetime.combine(request.end_date, datetime.min.time())
-        bars = await self.data_provider.get_historical(
-            request.symbols[0], start_dt, end_dt, request.interval
+        # 3. Simulate trades
+        symbol = request.symbols[0]
+        if request.execution_mode == ExecutionMode.REFERENCE:
+            equity_columns, fills = self._simulate_reference(df, request, symbol)
+        else:
+            equity_columns, fills = self._simulate_vectorized(df, request, symbol)
+
+        # 4. Compute metrics
+        metrics = compute_metrics(
+            np.asarray(equity_columns["equity"], dtype=np.float64),
+            fills,
+            request.initial_cash,
+            request.interval,
+            df["timestamp"],
         )
 
-        if not bars:
-            return self._empty_result(run_id, request.initial_cash)
+        # 5. Collect trades and indicator data for charts
+        trades = serialize_trades(fills)
+        if request.result_format == ResultFormat.COLUMNAR:
+            equity_curve = equity_columns
+            trades = columns_from_rows(trades, TRADE_FIELDS)
+            indicator_data = indicator_table(df, equity_columns["timestamp"])
+        else:
+            equity_curve = rows_from_columns(equity_columns)
+            indicator_data = indicator_series(df, equity_columns["timestamp"])
 
-        df = pd.DataFrame([b.model_dump() for b in bars])
+        duration_ms = int((time.time() - start_time) * 1000)
+
+        return BacktestResult(
+            id=run_id,
+            metrics=metrics,
+            equity_curve=equity_curve,
+            trades=trades,
+            indicator_data=indicator_data,
+            result_format=request.result_format,
+            duration_ms=duration_ms,
+        )
+
+    async def load_frame(
+        self,
+        symbols: list[str],
+        start_date: date,
+        end_date: date,
+        interval: str,
+        strategy: Strategy,
+    ) -> pd.DataFrame | None:
+        """Fetch the bars a backtest trades as a DataFrame, or None if there are none."""
+        start_dt = datetime.combine(start_date, datetime.min.time())
+        end_dt = datetime.combine(end_date, datetime.min.time())
+        bars = await self.data_provider.get_historical(symbols[0], start_dt, end_dt, interval)
 
-        # Handle pairs trading: fetch second symbol
-        if len(request.symbols) > 1 and strategy.name == "pairs_trading":
+        if not len(bars):
+            return None
+
+        df = bars.to_frame()
+
+        # Handle pairs trading: align the second leg on timestamp, carrying its
+        # last close across bars where only the first symbol traded
+        if len(symbols) > 1 and strategy.name == "pairs_trading":
             bars2 = await self.data_provider.get_historical(
-                request.symbols[1], start_dt, end_dt, request.interval
+                symbols[1], start_dt, end_dt, interval
             )
-            if bars2:
-                df2 = pd.DataFrame([b.model_dump() for b in bars2])
-                df["close_2"] = df2["close"].values[: len(df)]
+            if len(bars2):
+                df["close_2"] = bars2.close_asof(bars.timestamp)
+
+        return df
+
+    async def load_panel(
+        self,
+        symbols: list[str],
+        start_date: date,
+        end_date: date,
+        interval: str,
+    ) -> dict[str, pd.DataFrame]:
+        """Fetch every symbol concurrently; symbols without bars are omitted."""
+        start_dt = datetime.combine(start_date, datetime.min.time())
+        end_dt = datetime.combine(end_date, datetime.min.time())
+        results = await asyncio.gather(*(
+            self.data_provider.get_historical(sym, start_dt, end_dt, interval)
+            for sym in symbols
+        ))
+        return {
+            sym: bars.to_frame()
+            for sym, bars in zip(symbols, results)
+            if len(bars)
+        }
+
+    async def _run_portfolio(self, request: BacktestRequest, strategy: Strategy) -> BacktestResult:
+        """Trade every requested symbol from one shared cash balance.
+
+        Signals are generated per symbol on its own bars, then all symbols are
+        outer-joined on timestamp into (bars, symbols) close and signal arrays
+        for a single pass of execute_signal_matrix.
+        """
+        start_time = time.time()
+        run_id = str(uuid.uuid4())
+
+        if strategy.name == "pairs_trading":
+            raise ValueError("pairs_trading does not support multi_asset mode")
+
+        frames = await self.load_panel(
+            request.symbols, request.start_date, request.end_date, request.interval
+        )
+        if not frames:
+            return self._empty_result(run_id, request.initial_cash)
 
-        # 2. Generate signals
         params = strategy.validate_params(request.params)
-        df = strategy.generate_signals(df, params)
+        frames = {sym: strategy.generate_signals(df, params) for sym, df in frames.items()}
+        symbols = list(frames)
 
-        # 3. Simulate trades
+        close = pd.concat(
+            [df.set_index("timestamp")["close"].rename(sym) for sym, df in frames.items()],
+            axis=1,
+            join="outer",
+        ).sort_index()
+        signal = pd.concat(
+            [df.set_index("timestamp")["signal"].rename(sym) for sym, df in frames.items()],
+            axis=1,
+            join="outer",
+        ).reindex(close.index).fillna(0)
+
+        ex = execute_signal_matrix(
+            close.to_numpy(dtype=np.float64),
+            signal.to_numpy(dtype=np.float64),
+            initial_cash=request.initial_cash,
+            fee_pct=request.trading_fee_pct,
+            slippage_bps=SLIPPAGE_BPS,
+            position_size_pct=POSITION_SIZE_PCT,
+        )
+
+        timestamps = close.index.tolist()
+        equity_columns = {
+            "timestamp": iso_timestamps(timestamps),
+            "equity": rounded(ex.equity, 2),
+        }
+        fills = [
+            Fill(
+                timestamp=timestamps[i],
+                symbol=symbols[j],
+                side=OrderSide.BUY if side == 1 else OrderSide.SELL,
+                quantity=qty,
+                price=price,
+                fee=round(fee, 2),
+                pnl=None if side == 1 else pnl,
+            )
+            for i, j, side, qty, price, fee, pnl in zip(
+                ex.fill_index.tolist(),
+                ex.fill_column.tolist(),
+                ex.fill_side.tolist(),
+                ex.fill_quantity.tolist(),
+                ex.fill_price.tolist(),
+                ex.fill_fee.tolist(),
+                ex.fill_pnl.tolist(),
+            )
+        ]
+
+        metrics = compute_metrics(
+            np.asarray(equity_columns["equity"], dtype=np.float64),
+            fills,
+            request.initial_cash,
+            request.interval,
+            close.index,
+        )
+        trades = serialize_trades(fills)
+
+        if request.result_format == ResultFormat.COLUMNAR:
+            equity_curve = equity_columns
+            trades = columns_from_rows(trades, TRADE_FIELDS)
+            # Indicators of every symbol share the panel's timestamp array
+            aligned = pd.concat(
+                [
+                    df.set_index("timestamp")[indicator_columns(df)]
+                    .add_prefix(f"{sym}:")
+                    .reindex(close.index)
+                    for sym, df in frames.items()
+                ],
+                axis=1,
+            ).reset_index(names="timestamp")
+            indicator_data = indicator_table(aligned, equity_columns["timestamp"])
+        else:
+            equity_curve = rows_from_columns(equity_columns)
+            indicator_data = {}
+            for sym, df in frames.items():
+                ts = iso_timestamps(df["timestamp"].tolist())
+                for col, points in indicator_series(df, ts).items():
+                    indicator_data[f"{sym}:{col}"] = points
+
+        return BacktestResult(
+            id=run_id,
+            metrics=metrics,
+            equity_curve=equity_curve,
+            trades=trades,
+            indicator_data=indicator_data,
+            result_format=request.result_format,
+            duration_ms=int((time.time() - start_time) * 1000),
+        )
+
+    def _simulate_reference(
+        self, df: pd.DataFrame, request: BacktestRequest, symbol: str
+    ) -> tuple[dict[str, list], list[Fill]]:
+        """Bar-by-bar execution through SimulatedBroker. Kept as the reference
+        implementation the vectorized kernel is checked against."""
         broker = SimulatedBroker(
             initial_cash=request.initial_cash,
+            slippage_bps=SLIPPAGE_BPS,
             fee_pct=request.trading_fee_pct,
         )
-        equity_curve = []
-        position_size_pct = 0.1  # Use 10% of cash per trade
-        symbol = request.symbols[0]
+        equity_columns = {"timestamp": [], "equity": [], "price": []}
 
         for i, row in df.iterrows():
             ts = row["timestamp"]
@@ -65,7 +271,7 @@ class BacktestEngine:
 
             if signal == 1 and not has_position:
                 # Buy only when not already holding
-                cash_to_use = broker.portfolio.cash * position_size_pct
+                cash_to_use = broker.portfolio.cash * POSITION_SIZE_PCT
                 qty = int(cash_to_use / price) if price > 0 else 0
                 if qty > 0:
                     broker.submit_order(
@@ -80,67 +286,202 @@ class BacktestEngine:
                 )
 
             equity = broker.portfolio.get_equity(current_prices)
-            equity_curve.append({
-                "timestamp": ts.isoformat() if hasattr(ts, "isoformat") else str(ts),
-                "equity": round(equity, 2),
-                "price": round(float(price), 4),
-            })
+            equity_columns["timestamp"].append(ts.isoformat() if hasattr(ts, "isoformat") else str(ts))
+            equity_columns["equity"].append(round(equity, 2))
+            equity_columns["price"].append(round(float(price), 4))
 
-        # 4. Compute metrics
-        metrics = compute_metrics(equity_curve, broker.fills, request.initial_cash)
-
-        # 5. Collect trades
-        trades = [
-            {
-                "timestamp": f.timestamp.isoformat() if hasattr(f.timestamp, "isoformat") else str(f.timestamp),
-                "symbol": f.symbol,
-                "side": f.side.value,
-                "quantity": f.quantity,
-                "price": round(f.price, 4),
-                "fee": round(f.fee, 2),
-                "pnl": round(f.pnl, 2) if f.pnl is not None else None,
-            }
-            for f in broker.fills
-        ]
+        return equity_columns, broker.fills
 
-        # 6. Collect indicator data for charts
-        indicator_data = {}
-        indicator_columns = [c for c in df.columns if c not in [
-            "timestamp", "open", "high", "low", "close", "volume", "signal", "close_2"
-        ]]
-        for col in indicator_columns:
-            indicator_data[col] = [
-                {
-                    "timestamp": row["timestamp"].isoformat()
-                    if hasattr(row["timestamp"], "isoformat")
-                    else str(row["timestamp"]),
-                    "value": round(float(row[col]), 4) if pd.notna(row[col]) else None,
-                }
-                for _, row in df.iterrows()
-            ]
+    def _simulate_vectorized(
+        self, df: pd.DataFrame, request: BacktestRequest, symbol: str
+    ) -> tuple[dict[str, list], list[Fill]]:
+        """Same fills and equity as _simulate_reference, via execute_signals."""
+        ex = execute_frame(df, request.initial_cash, request.trading_fee_pct)
 
-        duration_ms = int((time.time() - start_time) * 1000)
+        timestamps = df["timestamp"].tolist()
+        equity_columns = {
+            "timestamp": iso_timestamps(timestamps),
+            "equity": rounded(ex.equity, 2),
+            "price": rounded(df["close"].to_numpy(dtype=np.float64), 4),
+        }
 
-        return BacktestResult(
-            id=run_id,
-            metrics=metrics,
-            equity_curve=equity_curve,
-            trades=trades,
-            indicator_data=indicator_data,
-            duration_ms=duration_ms,
-        )
+        fills = fills_from_execution(ex, [timestamps[i] for i in ex.fill_index.tolist()], symbol)
+        return equity_columns, fills
 
     def _empty_result(self, run_id: str, initial_cash: float) -> BacktestResult:
-        from app.models.domain import BacktestMetrics
-
         return BacktestResult(
             id=run_id,
-            metrics=BacktestMetrics(
-                total_pnl=0, return_pct=0, sharpe_ratio=0, max_drawdown_pct=0,
-                win_rate=0, profit_factor=0, total_trades=0, avg_trade_duration_days=0,
-            ),
+            metrics=empty_metrics(),
             equity_curve=[],
             trades=[],
             indicator_data={},
             duration_ms=0,
         )
+
+
+def serialize_trades(fills: list[Fill]) -> list[dict]:
+    return [
+        {
+            "timestamp": f.timestamp.isoformat() if hasattr(f.timestamp, "isoformat") else str(f.timestamp),
+            "symbol": f.symbol,
+            "side": f.side.value,
+            "quantity": f.quantity,
+            "price": round(f.price, 4),
+            "fee": round(f.fee, 2),
+            "pnl": round(f.pnl, 2) if f.pnl is not None else None,
+        }
+        for f in fills
+    ]
+
+
+def iso_timestamps(timestamps: list) -> list[str]:
+    return [ts.isoformat() if hasattr(ts, "isoformat") else str(ts) for ts in timestamps]
+
+
+def rounded(values: np.ndarray, ndigits: int) -> list[float | None]:
+    """Round to plain Python floats, mapping NaN to None for JSON."""
+    return [round(v, ndigits) if v == v else None for v in values.tolist()]
+
+
+def rows_from_columns(columns: dict[str, list]) -> list[dict]:
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*columns.values())]
+
+
+def columns_from_rows(rows: list[dict], keys: list[str]) -> dict[str, list]:
+    return {k: [r[k] for r in rows] for k in keys}
+
+
+def indicator_columns(df: pd.DataFrame) -> list[str]:
+    return [c for c in df.columns if c not in NON_INDICATOR_COLUMNS]
+
+
+def indicator_series(df: pd.DataFrame, timestamps: list[str]) -> dict[str, list[dict]]:
+    """Every indicator column as a list of timestamp/value points.
+
+    timestamps are the ISO strings for df's rows.
+    """
+    return {
+        col: [
+            {"timestamp": ts, "value": value}
+            for ts, value in zip(timestamps, rounded(df[col].to_numpy(dtype=np.float64), 4))
+        ]
+        for col in indicator_columns(df)
+    }
+
+
+def indicator_table(df: pd.DataFrame, timestamps: list[str]) -> dict:
+    """Columnar indicator data: one timestamp array plus a value array per column."""
+    return {
+        "timestamp": timestamps,
+        "series": {
+            col: rounded(df[col].to_numpy(dtype=np.float64), 4)
+            for col in indicator_columns(df)
+        },
+    }
+
+
+def empty_metrics() -> BacktestMetrics:
+    return BacktestMetrics(
+        total_pnl=0, return_pct=0, sharpe_ratio=0, max_drawdown_pct=0,
+        win_rate=0, profit_factor=0, total_trades=0, avg_trade_duration_days=0,
+    )
+
+
+def execute_frame(df: pd.DataFrame, initial_cash: float, fee_pct: float) -> ExecutionResult:
+    """Run the vectorized kernel over a frame that already has a 'signal' column."""
+    close = df["close"].to_numpy(dtype=np.float64)
+    signal = df["signal"].to_numpy() if "signal" in df.columns else np.zeros(len(df))
+    return execute_signals(
+        close,
+        signal,
+        initial_cash=initial_cash,
+        fee_pct=fee_pct,
+        slippage_bps=SLIPPAGE_BPS,
+        position_size_pct=POSITION_SIZE_PCT,
+    )
+
+
+def fills_from_execution(ex: ExecutionResult, fill_timestamps: list, symbol: str) -> list[Fill]:
+    """Build Fill models from kernel output; fill_timestamps is aligned to fills."""
+    return [
+        Fill(
+            timestamp=ts,
+            symbol=symbol,
+            side=OrderSide.BUY if side == 1 else OrderSide.SELL,
+            quantity=qty,
+            price=price,
+            fee=round(fee, 2),
+            pnl=None if side == 1 else pnl,
+        )
+        for ts, side, qty, price, fee, pnl in zip(
+            fill_timestamps,
+            ex.fill_side.tolist(),
+            ex.fill_quantity.tolist(),
+            ex.fill_price.tolist(),
+            ex.fill_fee.tolist(),
+            ex.fill_pnl.tolist(),
+        )
+    ]
+
+
+def evaluate_params(
+    df: pd.DataFrame,
+    strategy: Strategy,
+    params: dict,
+    initial_cash: float,
+    fee_pct: float,
+    symbol: str = "",
+    interval: str = "1d",
+) -> BacktestMetrics:
+    """Metrics for one parameter set over pre-fetched bars.
+
+    Works on a copy of df, so one frame can be shared across many calls.
+    """
+    frame = strategy.generate_signals(df.copy(), params)
+    ex = execute_frame(frame, initial_cash, fee_pct)
+    return metrics_from_execution(ex, frame["timestamp"], initial_cash, symbol, interval)
+
+
+def evaluate_signal_matrix(
+    df: pd.DataFrame,
+    signals: np.ndarray,
+    initial_cash: float,
+    fee_pct: float,
+    symbol: str = "",
+    interval: str = "1d",
+) -> list[BacktestMetrics]:
+    """Metrics for each column of a (bars x param sets) signal matrix, as
+    returned by Strategy.generate_signals_batch, over the bars in df."""
+    close = df["close"].to_numpy(dtype=np.float64)
+    timestamps = df["timestamp"]
+    return [
+        metrics_from_execution(
+            execute_signals(
+                close,
+                signals[:, j],
+                initial_cash=initial_cash,
+                fee_pct=fee_pct,
+                slippage_bps=SLIPPAGE_BPS,
+                position_size_pct=POSITION_SIZE_PCT,
+            ),
+            timestamps,
+            initial_cash,
+            symbol,
+            interval,
+        )
+        for j in range(signals.shape[1])
+    ]
+
+
+def metrics_from_execution(
+    ex: ExecutionResult,
+    timestamps: pd.Series,
+    initial_cash: float,
+    symbol: str = "",
+    interval: str = "1d",
+) -> BacktestMetrics:
+    """compute_metrics over kernel output; timestamps are the bars' timestamps."""
+    fills = fills_from_execution(ex, timestamps.iloc[ex.fill_index].tolist(), symbol)
+    # Equity is rounded to cents, as it is in a stored equity curve
+    return compute_metrics(np.round(ex.equity, 2), fills, initial_cash, interval, timestamps)
@@ -0,0 +1,117 @@
+import asyncio
+import time
+from datetime import datetime
+from functools import partial
+
+import pandas as pd
+
+from app.config import settings
+from app.data.provider import DataProvider
+from app.engine.backtester import evaluate_params
+from app.engine.pool import get_process_pool
+from app.models.domain import BacktestMetrics, BatchCell, BatchRequest, BatchResult
+from app.strategies.registry import strategy_registry
+
+
+def _evaluate_symbol(
+    df: pd.DataFrame,
+    symbol: str,
+    specs: list[tuple[str, dict]],
+    initial_cash: float,
+    fee_pct: float,
+    interval: str,
+) -> list[BacktestMetrics]:
+    """Worker-process entry point: every (strategy, params) pair over one symbol's bars."""
+    return [
+        evaluate_params(
+            df, strategy_registry.get(name), params, initial_cash, fee_pct, symbol, interval
+        )
+        for name, params in specs
+    ]
+
+
+async def run_batch(request: BatchRequest, provider: DataProvider) -> BatchResult:
+    """Evaluate every strategy spec against every symbol.
+
+    Each symbol is fetched once (all concurrently) and shipped to a single
+    worker task that runs all specs over it. A symbol without data, or
+    whose fetch or evaluation fails, gets error cells; the rest of the
+    batch is unaffected.
+    """
+    start_time = time.time()
+    cells = len(request.symbols) * len(request.strategies)
+    if cells > settings.max_batch_cells:
+        raise ValueError(f"Batch has {cells} cells; the limit is {settings.max_batch_cells}")
+
+    specs = []
+    for spec in request.strategies:
+        strategy = strategy_registry.get(spec.strategy_name)
+        if strategy.name == "pairs_trading":
+            raise ValueError("pairs_trading needs two symbols and cannot run in a batch")
+        specs.append((strategy.name, strategy.validate_params(spec.params)))
+
+    # A symbol that fails to load or evaluate only fails its own cells
+    start_dt = datetime.combine(request.start_date, datetime.min.time())
+    end_dt = datetime.combine(request.end_date, datetime.min.time())
+    fetched = await asyncio.gather(
+        *(provider.get_historical(sym, start_dt, end_dt, request.interval) for sym in request.symbols),
+        return_exceptions=True,
+    )
+    errors: dict[str, str] = {}
+    frames: dict[str, pd.DataFrame] = {}
+    for symbol, bars in zip(request.symbols, fetched):
+        if isinstance(bars, Exception):
+            errors[symbol] = f"Failed to load data: {bars}"
+        elif not len(bars):
+            errors[symbol] = "No data for the requested range"
+        else:
+            frames[symbol] = bars.to_frame()
+
+    loop = asyncio.get_event_loop()
+    pool = get_process_pool()
+    outcomes = await asyncio.gather(
+        *(
+            loop.run_in_executor(
+                pool,
+                partial(
+                    _evaluate_symbol,
+                    df,
+                    symbol,
+                    specs,
+                    request.initial_cash,
+                    request.trading_fee_pct,
+                    request.interval,
+                ),
+            )
+            for symbol, df in frames.items()
+        ),
+        return_exceptions=True,
+    )
+    metrics_by_symbol = {}
+    for symbol, outcome in zip(frames, outcomes):
+        if isinstance(outcome, Exception):
+            errors[symbol] = f"Backtest failed: {outcome}"
+        else:
+            metrics_by_symbol[symbol] = outcome
+
+    results = []
+    for symbol in request.symbols:
+        metrics = metrics_by_symbol.get(symbol)
+        for i, (name, params) in enumerate(specs):
+            results.append(
+                BatchCell(
+                    symbol=symbol,
+                    strategy_index=i,
+                    strategy_name=name,
+                    params=params,
+                    metrics=metrics[i] if metrics is not None else None,
+                    error=errors.get(symbol),
+                )
+            )
+
+    return BatchResult(
+        symbols=request.symbols,
+        strategies=request.strategies,
+        results=results,
+        duration_ms=int((time.time() - start_time) * 1000),
+    )
@@ -0,0 +1,136 @@
+"""Reduce chart series to a point budget while keeping their shape.
+
+Line series (indicators) use largest-triangle-three-buckets: the series is
+cut into equal buckets and each keeps the point forming the largest
+triangle with the point kept before it and the next bucket's average, so
+spikes and turns survive where plain striding would skip them. Equity
+curves use a min/max envelope instead, keeping every bucket's lowest and
+highest point so drawdown troughs and the peaks before them are exact.
+
+The helpers take and return the serialized payloads (rows or columnar,
+see ResultFormat), so they apply equally to fresh, cached and stored runs.
+Bars are spaced evenly by position, not by timestamp.
+"""
+
+import numpy as np
+
+from app.models.domain import BacktestResult
+
+MIN_POINTS = 3
+
+
+def _check(max_points: int) -> None:
+    if max_points < MIN_POINTS:
+        raise ValueError(f"max_points must be at least {MIN_POINTS}")
+
+
+def lttb_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """Positions of at most max_points points of values picked by LTTB.
+
+    NaN points are never picked; the first and last finite points always are.
+    """
+    _check(max_points)
+    y = np.asarray(values, dtype=np.float64)
+    finite = np.flatnonzero(np.isfinite(y))
+    n = len(finite)
+    if n <= max_points:
+        return finite
+    y = y[finite]
+    x = finite.astype(np.float64)
+
+    # max_points - 2 buckets between the fixed first and last points
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+    out = np.empty(max_points, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i == max_points - 3:
+            avg_x, avg_y = x[-1], y[-1]
+        else:
+            avg_x = x[hi : edges[i + 2]].mean()
+            avg_y = y[hi : edges[i + 2]].mean()
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return finite[out]
+
+
+def envelope_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """Positions of each bucket's minimum and maximum, plus the first and
+    last point, in order; at most max_points of them."""
+    _check(max_points)
+    y = np.asarray(values, dtype=np.float64)
+    n = len(y)
+    if n <= max_points:
+        return np.arange(n)
+    buckets = (max_points - 2) // 2
+    if buckets == 0:
+        return np.array([0, n - 1])
+    starts = np.linspace(0, n, buckets + 1).astype(np.int64)[:-1]
+    bucket_of = np.repeat(np.arange(buckets), np.diff(np.append(starts, n)))
+
+    picked = [np.array([0, n - 1])]
+    for extreme in (np.fmin.reduceat, np.fmax.reduceat):
+        hits = np.flatnonzero(y == extreme(y, starts)[bucket_of])
+        # First hit in each bucket (buckets without a finite value have none)
+        _, first = np.unique(bucket_of[hits], return_index=True)
+        picked.append(hits[first])
+    return np.unique(np.concatenate(picked))
+
+
+def _take(rows_or_columns: list | dict, index: np.ndarray) -> list | dict:
+    if isinstance(rows_or_columns, dict):
+        return {key: [values[i] for i in index] for key, values in rows_or_columns.items()}
+    return [rows_or_columns[i] for i in index]
+
+
+def _float_array(values: list) -> np.ndarray:
+    # None (serialized NaN) becomes NaN
+    return np.array(values, dtype=np.float64)
+
+
+def downsample_equity_curve(curve: list[dict] | dict[str, list], max_points: int) -> list[dict] | dict[str, list]:
+    """An equity curve in either result format reduced to its min/max envelope."""
+    if isinstance(curve, dict):
+        equity = curve.get("equity", [])
+    else:
+        equity = [point.get("equity") for point in curve]
+    return _take(curve, envelope_indices(_float_array(equity), max_points))
+
+
+def downsample_indicator_data(data: dict, max_points: int) -> dict:
+    """Indicator data in either result format reduced by LTTB.
+
+    Row-format series are reduced independently. Columnar series share one
+    timestamp array, so each gets an equal share of the budget (but at
+    least MIN_POINTS) and the table keeps the union of their picks.
+    """
+    _check(max_points)
+    if not data:
+        return data
+    series = data.get("series")
+    if isinstance(series, dict) and "timestamp" in data:
+        share = max(MIN_POINTS, max_points // max(len(series), 1))
+        picks = [lttb_indices(_float_array(values), share) for values in series.values()]
+        index = np.unique(np.concatenate(picks)) if picks else np.arange(0)
+        return {
+            "timestamp": [data["timestamp"][i] for i in index],
+            "series": {name: [values[i] for i in index] for name, values in series.items()},
+        }
+    return {
+        name: _take(points, lttb_indices(_float_array([p.get("value") for p in points]), max_points))
+        for name, points in data.items()
+    }
+
+
+def downsample_result(result: BacktestResult, max_points: int | None) -> BacktestResult:
+    """A copy of result with its equity curve and indicator data reduced;
+    result itself when max_points is None."""
+    if max_points is None:
+        return result
+    return result.model_copy(update={
+        "equity_curve": downsample_equity_curve(result.equity_curve, max_points),
+        "indicator_data": downsample_indicator_data(result.indicator_data, max_points),
+    })
@@ -0,0 +1,240 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass
+class ExecutionResult:
+    """Output of the vectorized execution kernel.
+
+    Per-bar arrays have the same length as the input; per-fill arrays have
+    one entry per executed order, in execution order.
+    """
+
+    equity: np.ndarray
+    cash: np.ndarray
+    quantity: np.ndarray
+    fill_index: np.ndarray
+    fill_side: np.ndarray  # 1 = BUY, -1 = SELL
+    fill_quantity: np.ndarray
+    fill_price: np.ndarray
+    fill_fee: np.ndarray
+    fill_pnl: np.ndarray  # NaN for buys
+    avg_price: float = 0.0  # cost basis per share of the position held at the end
+
+
+def execute_signals(
+    close: np.ndarray,
+    signal: np.ndarray,
+    initial_cash: float,
+    fee_pct: float = 1.0,
+    slippage_bps: float = 1.0,
+    position_size_pct: float = 0.1,
+    initial_quantity: float = 0,
+    initial_avg_price: float = 0.0,
+) -> ExecutionResult:
+    """Long-only, one-position-at-a-time execution over signal/close arrays.
+
+    Mirrors SimulatedBroker: buys on signal 1 while flat, sizing
+    int(cash * position_size_pct / price) shares, and sells the whole position
+    on signal -1. Only bars with a non-zero signal are visited; cash and
+    holdings are then forward-filled across the remaining bars.
+
+    initial_quantity/initial_avg_price open the run with a position already
+    held, so consecutive slices of one history can be executed in turn by
+    passing each slice the final cash, quantity and avg_price of the last.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    signal = np.nan_to_num(np.asarray(signal, dtype=np.float64))
+    n = len(close)
+
+    buy_mult = 1 + slippage_bps / 10000
+    sell_mult = 1 - slippage_bps / 10000
+    fee_rate = fee_pct / 100
+
+    fill_index: list[int] = []
+    fill_side: list[int] = []
+    fill_quantity: list[float] = []
+    fill_price: list[float] = []
+    fill_fee: list[float] = []
+    fill_pnl: list[float] = []
+    cash_after: list[float] = []
+    qty_after: list[float] = []
+
+    cash = float(initial_cash)
+    held = initial_quantity
+    avg_price = float(initial_avg_price)
+
+    for i in np.flatnonzero(signal).tolist():
+        price = float(close[i])
+        if signal[i] == 1 and held == 0:
+            qty = int(cash * position_size_pct / price) if price > 0 else 0
+            if qty <= 0:
+                continue
+            exec_price = price * buy_mult
+            notional = exec_price * qty
+            fee = notional * fee_rate
+            total_cost = notional + fee
+            if total_cost > cash:
+                continue  # insufficient funds
+            cash -= total_cost
+            avg_price = total_cost / qty
+            held = qty
+            pnl = np.nan
+            side = 1
+        elif signal[i] == -1 and held > 0:
+            qty = held
+            exec_price = price * sell_mult
+            notional = exec_price * qty
+            fee = notional * fee_rate
+            pnl = (exec_price - avg_price) * qty - fee
+            cash += notional - fee
+            held = 0
+            side = -1
+        else:
+            continue
+
+        fill_index.append(i)
+        fill_side.append(side)
+        fill_quantity.append(qty)
+        fill_price.append(exec_price)
+        fill_fee.append(fee)
+        fill_pnl.append(pnl)
+        cash_after.append(cash)
+        qty_after.append(held)
+
+    idx = np.asarray(fill_index, dtype=np.int64)
+    # Index of the most recent fill at or before each bar; -1 (before the first
+    # fill) lands on the trailing sentinel holding the opening state.
+    last = np.searchsorted(idx, np.arange(n), side="right") - 1
+    cash_arr = np.asarray(cash_after + [float(initial_cash)], dtype=np.float64)[last]
+    qty_arr = np.asarray(qty_after + [float(initial_quantity)], dtype=np.float64)[last]
+    equity = cash_arr + qty_arr * close
+
+    return ExecutionResult(
+        equity=equity,
+        cash=cash_arr,
+        quantity=qty_arr,
+        fill_index=idx,
+        fill_side=np.asarray(fill_side, dtype=np.int8),
+        fill_quantity=np.asarray(fill_quantity, dtype=np.float64),
+        fill_price=np.asarray(fill_price, dtype=np.float64),
+        fill_fee=np.asarray(fill_fee, dtype=np.float64),
+        fill_pnl=np.asarray(fill_pnl, dtype=np.float64),
+        avg_price=avg_price,
+    )
+
+
+@dataclass
+class PanelExecutionResult:
+    """Output of execute_signal_matrix. Fill arrays carry the column (symbol)
+    index of each fill alongside the bar index."""
+
+    equity: np.ndarray
+    cash: np.ndarray
+    quantity: np.ndarray  # (bars, symbols)
+    fill_index: np.ndarray
+    fill_column: np.ndarray
+    fill_side: np.ndarray
+    fill_quantity: np.ndarray
+    fill_price: np.ndarray
+    fill_fee: np.ndarray
+    fill_pnl: np.ndarray
+
+
+def execute_signal_matrix(
+    close: np.ndarray,
+    signal: np.ndarray,
+    initial_cash: float,
+    fee_pct: float = 1.0,
+    slippage_bps: float = 1.0,
+    position_size_pct: float = 0.1,
+) -> PanelExecutionResult:
+    """Multi-symbol counterpart of execute_signals over (bars, symbols) arrays.
+
+    Every column follows the same long-only, one-position rule, drawing on a
+    single shared cash balance. Within a bar, sells are executed before buys
+    so freed cash is available to new entries, and buys are sized from the
+    cash remaining after each preceding fill. NaN closes mark bars where a
+    symbol did not trade: no orders are placed there and holdings are valued
+    at the last traded price.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    signal = np.nan_to_num(np.asarray(signal, dtype=np.float64))
+    n_bars, n_symbols = close.shape
+
+    # Last traded price per symbol, for valuation across gaps
+    valid = ~np.isnan(close)
+    last_valid = np.where(valid, np.arange(n_bars)[:, None], 0)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    mark = np.nan_to_num(close[last_valid, np.arange(n_symbols)])
+
+    signal = np.where(valid, signal, 0)
+
+    buy_mult = 1 + slippage_bps / 10000
+    sell_mult = 1 - slippage_bps / 10000
+    fee_rate = fee_pct / 100
+
+    fills: list[tuple] = []
+    event_rows: list[int] = []
+    cash_after: list[float] = []
+    qty_after: list[np.ndarray] = []
+
+    cash = float(initial_cash)
+    held = np.zeros(n_symbols, dtype=np.float64)
+    avg_price = np.zeros(n_symbols, dtype=np.float64)
+
+    for i in np.flatnonzero(signal.any(axis=1)).tolist():
+        row = signal[i]
+        traded = False
+        for j in np.flatnonzero((row == -1) & (held > 0)).tolist():
+            qty = held[j]
+            exec_price = close[i, j] * sell_mult
+            notional = exec_price * qty
+            fee = notional * fee_rate
+            pnl = (exec_price - avg_price[j]) * qty - fee
+            cash += notional - fee
+            held[j] = 0
+            fills.append((i, j, -1, qty, exec_price, fee, pnl))
+            traded = True
+        for j in np.flatnonzero((row == 1) & (held == 0)).tolist():
+            price = float(close[i, j])
+            qty = int(cash * position_size_pct / price) if price > 0 else 0
+            if qty <= 0:
+                continue
+            exec_price = price * buy_mult
+            notional = exec_price * qty
+            fee = notional * fee_rate
+            total_cost = notional + fee
+            if total_cost > cash:
+                continue  # insufficient funds
+            cash -= total_cost
+            avg_price[j] = total_cost / qty
+            held[j] = qty
+            fills.append((i, j, 1, qty, exec_price, fee, np.nan))
+            traded = True
+        if traded:
+            event_rows.append(i)
+            cash_after.append(cash)
+            qty_after.append(held.copy())
+
+    rows = np.asarray(event_rows, dtype=np.int64)
+    # -1 (before the first fill) selects the trailing opening-state sentinel
+    last = np.searchsorted(rows, np.arange(n_bars), side="right") - 1
+    cash_arr = np.asarray(cash_after + [float(initial_cash)], dtype=np.float64)[last]
+    qty_mat = np.vstack(qty_after + [np.zeros(n_symbols)])[last]
+    equity = cash_arr + (qty_mat * mark).sum(axis=1)
+
+    cols = list(zip(*fills)) if fills else [[]] * 7
+    return PanelExecutionResult(
+        equity=equity,
+        cash=cash_arr,
+        quantity=qty_mat,
+        fill_index=np.asarray(cols[0], dtype=np.int64),
+        fill_column=np.asarray(cols[1], dtype=np.int64),
+        fill_side=np.asarray(cols[2], dtype=np.int8),
+        fill_quantity=np.asarray(cols[3], dtype=np.float64),
+        fill_price=np.asarray(cols[4], dtype=np.float64),
+        fill_fee=np.asarray(cols[5], dtype=np.float64),
+        fill_pnl=np.asarray(cols[6], dtype=np.float64),
+    )
@@ -1,67 +1,235 @@
 import math
 
+import numpy as np
+import pandas as pd
+
 from app.models.domain import BacktestMetrics, Fill
 
+TRADING_DAYS_PER_YEAR = 252
+MINUTES_PER_SESSION = 390  # 09:30-16:00 US equities
+
+# Bars per year for each yfinance interval
+_PERIODS_PER_YEAR = {
+    "1m": TRADING_DAYS_PER_YEAR * MINUTES_PER_SESSION,
+    "2m": TRADING_DAYS_PER_YEAR * MINUTES_PER_SESSION / 2,
+    "5m": TRADING_DAYS_PER_YEAR * MINUTES_PER_SESSION / 5,
+    "15m": TRADING_DAYS_PER_YEAR * MINUTES_PER_SESSION / 15,
+    "30m": TRADING_DAYS_PER_YEAR * MINUTES_PER_SESSION / 30,
+    "60m": TRADING_DAYS_PER_YEAR * MINUTES_PER_SESSION / 60,
+    "90m": TRADING_DAYS_PER_YEAR * MINUTES_PER_SESSION / 90,
+    "1h": TRADING_DAYS_PER_YEAR * MINUTES_PER_SESSION / 60,
+    "1d": TRADING_DAYS_PER_YEAR,
+    "5d": TRADING_DAYS_PER_YEAR / 5,
+    "1wk": 52,
+    "1mo": 12,
+    "3mo": 4,
+}
+
+
+def periods_per_year(interval: str) -> float:
+    """Bars per year for an interval; unknown intervals fall back to daily."""
+    return _PERIODS_PER_YEAR.get(interval, TRADING_DAYS_PER_YEAR)
+
+
+_SECONDS_PER_DAY = 86_400
+_UNITS_PER_SECOND = {"s": 1, "ms": 10**3, "us": 10**6, "ns": 10**9}
+# Ratios with a near-zero denominator are capped, as profit_factor always was
+_RATIO_CAP = 999.99
+
+
+def _epoch_days(timestamps) -> np.ndarray:
+    index = pd.DatetimeIndex(timestamps)
+    return index.asi8 / (_SECONDS_PER_DAY * _UNITS_PER_SECOND[index.unit])
+
+
+def _capped(value: float) -> float:
+    return max(-_RATIO_CAP, min(value, _RATIO_CAP))
+
 
 def compute_metrics(
-    equity_curve: list[dict],
+    equity: np.ndarray,
     fills: list[Fill],
     initial_cash: float,
+    interval: str = "1d",
+    timestamps=None,
 ) -> BacktestMetrics:
-    equities = [pt["equity"] for pt in equity_curve]
-    final_equity = equities[-1] if equities else initial_cash
-
-    total_pnl = final_equity - initial_cash
-    return_pct = (final_equity / initial_cash - 1) * 100 if initial_cash > 0 else 0
-
-    # Daily returns
-    daily_returns = []
-    for i in range(1, len(equities)):
-        if equities[i - 1] > 0:
-            daily_returns.append(equities[i] / equities[i - 1] - 1)
-
-    # Sharpe Ratio (annualized, assuming 252 trading days)
-    if daily_returns and len(daily_returns) > 1:
-        mean_ret = sum(daily_returns) / len(daily_returns)
-        std_ret = (sum((r - mean_ret) ** 2 for r in daily_returns) / (len(daily_returns) - 1)) ** 0.5
-        sharpe_ratio = (mean_ret / std_ret * math.sqrt(252)) if std_ret > 0 else 0.0
-    else:
+    """Performance metrics of an equity curve and its fills.
+
+    equity holds one value per bar; timestamps, when given, are the bars'
+    times and make drawdown durations calendar days rather than bar counts
+    scaled to days. Ratios are annualized with periods_per_year(interval).
+    """
+    accumulator = MetricsAccumulator(initial_cash, interval)
+    accumulator.update(equity, fills, timestamps)
+    return accumulator.result()
+
+
+class MetricsAccumulator:
+    """compute_metrics over an equity curve delivered in consecutive chunks.
+
+    Every update is vectorized over its chunk and leaves O(1) state behind:
+    running return moments (merged per chunk with Chan's parallel update),
+    the running peak and where it was set, the worst drawdown and longest
+    time under water, closed-trade tallies, and the entry time of any open
+    position. compute_metrics is a single update, so the two agree up to
+    float summation order.
+    """
+
+    def __init__(self, initial_cash: float, interval: str = "1d"):
+        self.initial_cash = initial_cash
+        self.periods_per_year = periods_per_year(interval)
+        self.n_points = 0
+        self.last_equity: float | None = None
+        self.n_returns = 0
+        self.mean_return = 0.0
+        self.m2_return = 0.0
+        self.downside_sq = 0.0
+        self.peak: float | None = None
+        self.peak_index = 0
+        self.peak_day: float | None = None
+        self.max_drawdown = 0.0
+        self.max_drawdown_days = 0.0
+        self.total_trades = 0
+        self.winning_trades = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+        self.round_trips = 0
+        self.holding_days = 0.0
+        self.open_entries: dict[str, object] = {}
+
+    def update(self, equity: np.ndarray, fills: list[Fill], timestamps=None) -> None:
+        """Add the next chunk of bars and the fills that happened during it."""
+        equity = np.asarray(equity, dtype=np.float64)
+        if len(equity):
+            self._update_returns(equity)
+            self._update_drawdown(equity, None if timestamps is None else _epoch_days(timestamps))
+            self.n_points += len(equity)
+            self.last_equity = float(equity[-1])
+        self._update_trades(fills)
+
+    def _update_returns(self, equity: np.ndarray) -> None:
+        series = equity if self.last_equity is None else np.concatenate(([self.last_equity], equity))
+        prev = series[:-1]
+        if len(prev) and prev.min() > 0:
+            returns = series[1:] / prev
+        else:
+            valid = prev > 0
+            returns = series[1:][valid] / prev[valid]
+        returns -= 1
+        n_b = len(returns)
+        if n_b == 0:
+            return
+        mean_b = float(returns.mean())
+        downside = np.minimum(returns, 0.0)
+        self.downside_sq += float(np.dot(downside, downside))
+        returns -= mean_b
+        m2_b = float(np.dot(returns, returns))
+        n_a = self.n_returns
+        n = n_a + n_b
+        delta = mean_b - self.mean_return
+        self.mean_return += delta * n_b / n
+        self.m2_return += m2_b + delta**2 * n_a * n_b / n
+        self.n_returns = n
+
+    def _update_drawdown(self, equity: np.ndarray, days: np.ndarray | None) -> None:
+        n = len(equity)
+        peak0 = equity[0] if self.peak is None else self.peak
+        peak = np.maximum.accumulate(equity)
+        np.maximum(peak, peak0, out=peak)
+        if peak0 > 0:
+            # The running peak never falls, so it is positive throughout
+            self.max_drawdown = max(self.max_drawdown, 1.0 - float((equity / peak).min()))
+        else:
+            drawdown = np.divide(peak - equity, peak, out=np.zeros(n), where=peak > 0)
+            self.max_drawdown = max(self.max_drawdown, float(drawdown.max()))
+
+        # Time under water runs from a peak through the bar that regains it,
+        # counted only when some bar in between was below it; a drawdown not
+        # yet recovered runs to the chunk's last bar. The first chunk's first
+        # bar is always a peak; later chunks start from the carried one.
+        highs = np.flatnonzero(equity >= peak)
+        index = highs + self.n_points
+        if days is not None:
+            times, last = days[highs], float(days[-1])
+            carried = self.peak_day
+        else:
+            times, last = index, n - 1 + self.n_points
+            carried = self.peak_index
+        if self.peak is not None:
+            index = np.concatenate(([self.peak_index], index))
+            times = np.concatenate(([carried], times))
+        recovered = np.diff(index) > 1
+        longest = float(last - times[-1])
+        if recovered.any():
+            longest = max(longest, float(np.diff(times)[recovered].max()))
+        self.peak_index = int(index[-1])
+        if days is not None:
+            self.peak_day = float(times[-1])
+        else:
+            longest *= TRADING_DAYS_PER_YEAR / self.periods_per_year
+        self.max_drawdown_days = max(self.max_drawdown_days, float(longest))
+
+        self.peak = float(peak[-1])
+
+    def _update_trades(self, fills: list[Fill]) -> None:
+        # Pair each SELL with the BUY that opened its position
+        for f in fills:
+            if f.side.value == "BUY":
+                self.open_entries[f.symbol] = f.timestamp
+                continue
+            entry = self.open_entries.pop(f.symbol, None)
+            if entry is not None:
+                self.round_trips += 1
+                self.holding_days += (f.timestamp - entry).total_seconds() / 86400
+            if f.pnl is None:
+                continue
+            self.total_trades += 1
+            if f.pnl > 0:
+                self.winning_trades += 1
+                self.gross_profit += f.pnl
+            elif f.pnl < 0:
+                self.gross_loss += f.pnl
+
+    def result(self) -> BacktestMetrics:
+        initial_cash = self.initial_cash
+        final_equity = self.last_equity if self.last_equity is not None else initial_cash
+        total_pnl = final_equity - initial_cash
+        return_pct = (final_equity / initial_cash - 1) * 100 if initial_cash > 0 else 0
+        annualization = math.sqrt(self.periods_per_year)
+
         sharpe_ratio = 0.0
+        sortino_ratio = 0.0
+        if self.n_returns > 1:
+            std_ret = math.sqrt(self.m2_return / (self.n_returns - 1))
+            downside = math.sqrt(self.downside_sq / self.n_returns)
+            if std_ret > 0:
+                sharpe_ratio = self.mean_return / std_ret * annualization
+            if downside > 0:
+                sortino_ratio = _capped(self.mean_return / downside * annualization)
+
+        calmar_ratio = 0.0
+        years = (self.n_points - 1) / self.periods_per_year
+        if years > 0 and initial_cash > 0 and final_equity > 0 and self.max_drawdown > 0:
+            log_growth = math.log(final_equity / initial_cash) / years
+            cagr = math.expm1(min(log_growth, 700.0))
+            calmar_ratio = _capped(cagr / self.max_drawdown)
+
+        total_trades = self.total_trades
+        win_rate = self.winning_trades / total_trades if total_trades > 0 else 0.0
+        gross_loss = abs(self.gross_loss)
+        profit_factor = self.gross_profit / gross_loss if gross_loss > 0 else float("inf") if self.gross_profit > 0 else 0.0
+        avg_holding = self.holding_days / self.round_trips if self.round_trips else 0.0
 
-    # Max Drawdown
-    max_drawdown_pct = 0.0
-    peak = equities[0] if equities else initial_cash
-    for eq in equities:
-        if eq > peak:
-            peak = eq
-        drawdown = (peak - eq) / peak * 100 if peak > 0 else 0
-        if drawdown > max_drawdown_pct:
-            max_drawdown_pct = drawdown
-
-    # Win rate & profit factor
-    sell_fills = [f for f in fills if f.side.value == "SELL" and f.pnl is not None]
-    total_trades = len(sell_fills)
-    winning = [f for f in sell_fills if f.pnl > 0]
-    win_rate = len(winning) / total_trades if total_trades > 0 else 0.0
-
-    gross_profit = sum(f.pnl for f in sell_fills if f.pnl > 0)
-    gross_loss = abs(sum(f.pnl for f in sell_fills if f.pnl < 0))
-    profit_factor = gross_profit / gross_loss if gross_loss > 0 else float("inf") if gross_profit > 0 else 0.0
-
-    # Avg trade duration (simple: spread fills evenly over the period)
-    if total_trades > 0 and len(equity_curve) > 1:
-        total_days = (len(equity_curve) - 1)
-        avg_trade_duration_days = total_days / total_trades
-    else:
-        avg_trade_duration_days = 0.0
-
-    return BacktestMetrics(
-        total_pnl=round(total_pnl, 2),
-        return_pct=round(return_pct, 2),
-        sharpe_ratio=round(sharpe_ratio, 4),
-        max_drawdown_pct=round(-max_drawdown_pct, 2),
-        win_rate=round(win_rate, 4),
-        profit_factor=round(min(profit_factor, 999.99), 2),
-        total_trades=total_trades,
-        avg_trade_duration_days=round(avg_trade_duration_days, 1),
-    )
+        return BacktestMetrics(
+            total_pnl=round(total_pnl, 2),
+            return_pct=round(return_pct, 2),
+            sharpe_ratio=round(sharpe_ratio, 4),
+            sortino_ratio=round(sortino_ratio, 4),
+            calmar_ratio=round(calmar_ratio, 4),
+            max_drawdown_pct=round(-self.max_drawdown * 100, 2),
+            max_drawdown_duration_days=round(self.max_drawdown_days, 1),
+            win_rate=round(win_rate, 4),
+            profit_factor=round(min(profit_factor, _RATIO_CAP), 2),
+            total_trades=total_trades,
+            avg_trade_duration_days=round(avg_holding, 1),
+        )
@@ -0,0 +1,196 @@
+import math
+
+import numpy as np
+
+from app.config import settings
+from app.engine.metrics import periods_per_year
+from app.models.domain import (
+    DistributionSummary,
+    MonteCarloDistribution,
+    MonteCarloRequest,
+)
+
+# Bytes of working memory per (path, step) cell: index array plus the path,
+# running-peak and drawdown float64 matrices.
+_BYTES_PER_CELL = 32
+
+
+def _paths_per_chunk(n_steps: int, budget_bytes: int) -> int:
+    return max(1, budget_bytes // max(1, n_steps * _BYTES_PER_CELL))
+
+
+def _summarize(values: np.ndarray) -> DistributionSummary:
+    p5, p25, p50, p75, p95 = np.percentile(values, [5, 25, 50, 75, 95])
+    return DistributionSummary(
+        mean=round(float(values.mean()), 4),
+        std=round(float(values.std()), 4),
+        min=round(float(values.min()), 4),
+        max=round(float(values.max()), 4),
+        p5=round(float(p5), 4),
+        p25=round(float(p25), 4),
+        p50=round(float(p50), 4),
+        p75=round(float(p75), 4),
+        p95=round(float(p95), 4),
+    )
+
+
+def _distribution(
+    method: str, returns: np.ndarray, drawdowns: np.ndarray, sharpes: np.ndarray
+) -> MonteCarloDistribution:
+    return MonteCarloDistribution(
+        method=method,
+        n_paths=len(returns),
+        return_pct=_summarize(returns * 100),
+        max_drawdown_pct=_summarize(drawdowns * 100),
+        sharpe_ratio=_summarize(sharpes),
+        prob_loss=round(float((returns < 0).mean()), 4),
+    )
+
+
+def block_bootstrap(
+    bar_returns: np.ndarray,
+    n_paths: int,
+    block_size: int,
+    annualization: float,
+    rng: np.random.Generator,
+    budget_bytes: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Moving-block bootstrap of per-bar returns.
+
+    Each path is len(bar_returns) bars built from randomly placed blocks of
+    block_size consecutive returns, preserving short-range autocorrelation.
+    Paths are generated chunk by chunk so the (paths, bars) matrices stay
+    within budget_bytes. Returns (total return, max drawdown, Sharpe) per
+    path, with drawdowns as negative fractions.
+    """
+    n = len(bar_returns)
+    block = max(1, min(block_size, n))
+    n_blocks = math.ceil(n / block)
+    last_len = n - (n_blocks - 1) * block
+    offsets = np.arange(block)
+    # log1p needs returns > -1; a bar that wipes out equity is floored just above
+    log_returns = np.log1p(np.maximum(bar_returns, -1 + 1e-12))
+
+    # Prefix sums give each block's sum of returns and squared returns without
+    # materializing the path, so only the drawdown needs the full matrix.
+    cs = np.concatenate(([0.0], np.cumsum(bar_returns)))
+    cs2 = np.concatenate(([0.0], np.cumsum(bar_returns**2)))
+    lengths = np.full(n_blocks, block)
+    lengths[-1] = last_len
+
+    totals = np.empty(n_paths)
+    drawdowns = np.empty(n_paths)
+    sharpes = np.empty(n_paths)
+    chunk = _paths_per_chunk(n, budget_bytes)
+
+    for start in range(0, n_paths, chunk):
+        stop = min(start + chunk, n_paths)
+        starts = rng.integers(0, n - block + 1, size=(stop - start, n_blocks))
+
+        total = (cs[starts + lengths] - cs[starts]).sum(axis=1)
+        total_sq = (cs2[starts + lengths] - cs2[starts]).sum(axis=1)
+        mean = total / n
+        var = (total_sq - n * mean**2) / (n - 1) if n > 1 else np.zeros_like(mean)
+        std = np.sqrt(np.maximum(var, 0.0))
+        sharpes[start:stop] = np.divide(
+            mean * math.sqrt(annualization), std, out=np.zeros_like(mean), where=std > 0
+        )
+
+        # Log equity relative to the start; the running peak includes the
+        # opening equity (log 1 = 0)
+        idx = (starts[:, :, None] + offsets).reshape(stop - start, -1)[:, :n]
+        paths = log_returns[idx]
+        del idx
+        np.cumsum(paths, axis=1, out=paths)
+        totals[start:stop] = np.expm1(paths[:, -1])
+        peak = np.maximum.accumulate(paths, axis=1)
+        np.maximum(peak, 0.0, out=peak)
+        np.subtract(paths, peak, out=paths)
+        drawdowns[start:stop] = np.expm1(paths.min(axis=1))
+
+    return totals, drawdowns, sharpes
+
+
+def trade_resample(
+    trade_pnl: np.ndarray,
+    initial_cash: float,
+    n_paths: int,
+    trades_per_year: float,
+    rng: np.random.Generator,
+    budget_bytes: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bootstrap the sequence of closed-trade P&L with replacement.
+
+    Each path draws len(trade_pnl) trades and compounds them additively on
+    initial_cash. Sharpe is computed on per-trade returns (P&L over equity
+    before the trade), annualized by trades_per_year.
+    """
+    m = len(trade_pnl)
+    totals = np.empty(n_paths)
+    drawdowns = np.empty(n_paths)
+    sharpes = np.empty(n_paths)
+    chunk = _paths_per_chunk(m, budget_bytes)
+
+    for start in range(0, n_paths, chunk):
+        stop = min(start + chunk, n_paths)
+        pnl = trade_pnl[rng.integers(0, m, size=(stop - start, m))]
+        equity = initial_cash + np.cumsum(pnl, axis=1)
+        totals[start:stop] = equity[:, -1] / initial_cash - 1
+
+        peak = np.maximum.accumulate(equity, axis=1)
+        np.maximum(peak, initial_cash, out=peak)
+        drawdowns[start:stop] = ((equity - peak) / peak).min(axis=1)
+
+        before = equity - pnl
+        rets = np.divide(pnl, before, out=np.zeros_like(pnl), where=before > 0)
+        mean = rets.mean(axis=1)
+        std = rets.std(axis=1, ddof=1)
+        sharpes[start:stop] = np.divide(
+            mean * math.sqrt(trades_per_year), std, out=np.zeros_like(mean), where=std > 0
+        )
+
+    return totals, drawdowns, sharpes
+
+
+def run_monte_carlo(
+    equity: np.ndarray,
+    trade_pnl: np.ndarray,
+    initial_cash: float,
+    interval: str,
+    request: MonteCarloRequest,
+) -> tuple[MonteCarloDistribution | None, MonteCarloDistribution | None]:
+    """Both resampling methods over a finished backtest's equity curve and
+    closed-trade P&L. Either result is None when there is too little data."""
+    if request.n_paths < 1 or request.n_paths > settings.monte_carlo_max_paths:
+        raise ValueError(f"n_paths must be between 1 and {settings.monte_carlo_max_paths}")
+    if request.block_size < 1:
+        raise ValueError("block_size must be >= 1")
+
+    rng = np.random.default_rng(request.seed)
+    budget = settings.monte_carlo_memory_mb * 1024 * 1024
+    annualization = periods_per_year(interval)
+
+    bootstrap = None
+    if len(equity) > 2:
+        prev = equity[:-1]
+        bar_returns = np.divide(
+            np.diff(equity), prev, out=np.zeros(len(prev)), where=prev > 0
+        )
+        bootstrap = _distribution(
+            "block_bootstrap",
+            *block_bootstrap(
+                bar_returns, request.n_paths, request.block_size, annualization, rng, budget
+            ),
+        )
+
+    resample = None
+    if len(trade_pnl) > 1 and initial_cash > 0:
+        years = len(equity) / annualization if len(equity) else 1.0
+        resample = _distribution(
+            "trade_resample",
+            *trade_resample(
+                trade_pnl, initial_cash, request.n_paths, len(trade_pnl) / years, rng, budget
+            ),
+        )
+
+    return resample, bootstrap
@@ -0,0 +1,25 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from app.config import settings
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def worker_count() -> int:
+    return settings.max_workers or os.cpu_count() or 1
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Shared process pool for CPU-bound engine work, created on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=worker_count())
+    return _pool
+
+
+def shutdown_process_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
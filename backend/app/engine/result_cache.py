@@ -0,0 +1,255 @@
+import hashlib
+import importlib
+import inspect
+import json
+import sys
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import NamedTuple
+
+from sqlalchemy import Update, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.db_models import BacktestRun
+from app.models.domain import BacktestMetrics, BacktestRequest, BacktestResult
+from app.strategies.base import Strategy
+
+# Bump whenever results change in a way the hashed sources below do not
+# show, e.g. a dependency upgrade that alters numerics, so previously cached
+# results go stale.
+ENGINE_VERSION = 3
+
+# Modules outside the strategy's own whose source decides a run's result:
+# frame loading and alignment, execution, metrics and result encoding
+ENGINE_MODULES = (
+    "app.data.bars",
+    "app.engine.backtester",
+    "app.engine.execution",
+    "app.engine.metrics",
+    "app.models.domain",
+    "app.simulation.broker",
+    "app.simulation.portfolio",
+)
+
+# Packages a strategy's fingerprint follows its imports into
+_STRATEGY_PACKAGES = ("app.indicators", "app.strategies")
+
+_fingerprints: dict[type, str] = {}
+_engine_fingerprint: str | None = None
+
+
+def _source_digest(modules: list[str]) -> str:
+    digest = hashlib.sha256()
+    for name in sorted(modules):
+        digest.update(inspect.getsource(sys.modules[name]).encode())
+    return digest.hexdigest()[:16]
+
+
+def fingerprint_modules(strategy: Strategy) -> list[str]:
+    """The strategy's module and every app.indicators / app.strategies module
+    it reaches through its imports, such as the helpers in strategies.base."""
+    found: set[str] = set()
+    pending = [sys.modules[type(strategy).__module__]]
+    while pending:
+        module = pending.pop()
+        if module.__name__ in found:
+            continue
+        found.add(module.__name__)
+        for value in vars(module).values():
+            dep = inspect.getmodule(value)
+            if dep is not None and dep.__name__.startswith(_STRATEGY_PACKAGES):
+                pending.append(dep)
+    return sorted(found)
+
+
+def strategy_fingerprint(strategy: Strategy) -> str:
+    """Hash of the source of fingerprint_modules(strategy)."""
+    cls = type(strategy)
+    if cls not in _fingerprints:
+        _fingerprints[cls] = _source_digest(fingerprint_modules(strategy))
+    return _fingerprints[cls]
+
+
+def engine_fingerprint() -> str:
+    """Hash of the source of ENGINE_MODULES."""
+    global _engine_fingerprint
+    if _engine_fingerprint is None:
+        for name in ENGINE_MODULES:
+            importlib.import_module(name)
+        _engine_fingerprint = _source_digest(list(ENGINE_MODULES))
+    return _engine_fingerprint
+
+
+def cache_key(request: BacktestRequest, strategy: Strategy) -> str:
+    """Content address of a backtest: the request with validated params,
+    canonically serialized, plus the strategy and engine versions and the
+    hashes of their sources."""
+    payload = request.model_dump(mode="json")
+    payload["params"] = strategy.validate_params(request.params)
+    payload["strategy_version"] = strategy_fingerprint(strategy)
+    payload["engine_version"] = ENGINE_VERSION
+    payload["engine_source"] = engine_fingerprint()
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class _Entry(NamedTuple):
+    result: BacktestResult
+    symbols: list[str]
+    interval: str
+    start_date: date
+    end_date: date
+
+
+class BacktestResultCache:
+    """In-process LRU of finished BacktestResults keyed by cache_key.
+
+    The persistent tier is the backtest_runs table itself: each stored run
+    carries its cache_key, so a miss here can still be served from Postgres.
+    Invalidation detaches the key from the stored run, which every worker
+    sees; lookup() therefore confirms an in-memory hit against the run's
+    stored key before serving it.
+    """
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> BacktestResult | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.result
+
+    def put(
+        self,
+        key: str,
+        result: BacktestResult,
+        symbols: list[str],
+        interval: str,
+        start_date: date,
+        end_date: date,
+    ) -> None:
+        self._entries[key] = _Entry(result, symbols, interval, start_date, end_date)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def lookup(self, session: AsyncSession, key: str) -> BacktestResult | None:
+        """The cached result for key from either tier, or None.
+
+        An in-memory hit costs one primary-key lookup to check that its run
+        still carries key; another worker may have invalidated it.
+        """
+        result = self.get(key)
+        if result is not None:
+            stmt = select(BacktestRun.id).where(
+                BacktestRun.id == uuid.UUID(result.id), BacktestRun.cache_key == key
+            )
+            if (await session.execute(stmt)).scalar_one_or_none() is not None:
+                return result.model_copy(update={"cached": True})
+            del self._entries[key]
+        return await self.load_persisted(session, key)
+
+    def invalidate(
+        self,
+        symbol: str | None = None,
+        interval: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> int:
+        """Drop entries that trade symbol at interval (either None = any) over
+        dates overlapping [start, end] (either None = unbounded)."""
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if (symbol is None or symbol in entry.symbols)
+            and (interval is None or entry.interval == interval)
+            and (start is None or entry.end_date >= start.date())
+            and (end is None or entry.start_date <= end.date())
+        ]
+        for key in stale:
+            del self._entries[key]
+        return len(stale)
+
+    def forget_run(self, run_id: str) -> None:
+        """Drop the in-memory entry for a stored run that is being deleted."""
+        stale = [key for key, entry in self._entries.items() if entry.result.id == run_id]
+        for key in stale:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    async def load_persisted(self, session: AsyncSession, key: str) -> BacktestResult | None:
+        stmt = (
+            select(BacktestRun)
+            .where(BacktestRun.cache_key == key)
+            .order_by(BacktestRun.created_at.desc())
+            .limit(1)
+        )
+        run = (await session.execute(stmt)).scalar_one_or_none()
+        if run is None:
+            return None
+        result = BacktestResult(
+            id=str(run.id),
+            metrics=BacktestMetrics(**run.metrics),
+            equity_curve=run.equity_curve,
+            trades=run.trades,
+            indicator_data=run.indicator_data,
+            result_format=run.result_format,
+            duration_ms=run.duration_ms or 0,
+            cached=True,
+        )
+        self.put(key, result, run.symbols, run.interval, run.start_date, run.end_date)
+        return result
+
+    async def invalidate_persisted(
+        self,
+        session: AsyncSession,
+        symbol: str | None = None,
+        interval: str | None = None,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> None:
+        """Detach stored runs from the cache; the runs themselves are kept.
+
+        Only runs whose date range overlaps [start, end] are affected, when
+        given. Also drops matching in-memory entries. The caller commits.
+        """
+        self.invalidate(symbol, interval, start, end)
+        await session.execute(invalidation_statement(symbol, interval, start, end))
+
+
+def invalidation_statement(
+    symbol: str | None = None,
+    interval: str | None = None,
+    start: datetime | None = None,
+    end: datetime | None = None,
+) -> Update:
+    """UPDATE clearing cache_key on the stored runs invalidate_persisted detaches."""
+    stmt = update(BacktestRun).where(BacktestRun.cache_key.is_not(None))
+    if symbol is not None:
+        stmt = stmt.where(BacktestRun.symbols.contains([symbol]))
+    if interval is not None:
+        stmt = stmt.where(BacktestRun.interval == interval)
+    if start is not None:
+        stmt = stmt.where(BacktestRun.end_date >= start.date())
+    if end is not None:
+        stmt = stmt.where(BacktestRun.start_date <= end.date())
+    return stmt.values(cache_key=None)
+
+
+result_cache = BacktestResultCache(settings.result_cache_entries)
@@ -0,0 +1,261 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import partial
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Float, String, cast, column, select, true, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.db_models import StockDataCache, StockDataCoverage
+from app.models.domain import ScreenEntry, ScreenRequest, ScreenResult
+from app.strategies.base import Strategy
+
+
+# Indicator windows of history loaded per symbol by default: enough for
+# rolling windows to fill and exponential averages to settle near their
+# long-run values, without the full WARMUP_MULTIPLE replay streaming needs
+SETTLE_MULTIPLE = 3
+
+
+@dataclass
+class Universe:
+    """The latest bars of many symbols as one (bars x symbols) panel.
+
+    Row -1 is each symbol's most recent bar. Columns are aligned by bar
+    position, not by timestamp, so a symbol that stopped trading keeps its
+    last bars in the bottom rows; timestamps records each cell's bar time.
+    A symbol with fewer bars than the panel has rows is NaN (timestamp
+    None) above its first bar.
+    """
+
+    symbols: list[str]
+    close: pd.DataFrame
+    timestamps: np.ndarray  # object array shaped like close
+    insufficient: list[str]  # symbols with fewer than min_bars bars
+
+
+def universe_from_rows(
+    rows: list[tuple[str, datetime, float]], lookback: int, min_bars: int | None = None
+) -> Universe:
+    """Build a Universe of lookback rows from (symbol, timestamp, close) rows.
+
+    rows must be grouped by symbol and ascending in time within a symbol,
+    holding at most the last lookback bars of each. Symbols with fewer than
+    min_bars bars (default lookback) are set aside in insufficient.
+    """
+    if min_bars is None:
+        min_bars = lookback
+    if not rows:
+        return Universe([], pd.DataFrame(), np.empty((lookback, 0), dtype=object), [])
+    # Column by column: zip(*rows) on hundreds of thousands of rows is far slower
+    codes, names = pd.factorize(np.asarray([r[0] for r in rows], dtype=object))
+    stamps = np.asarray([r[1] for r in rows], dtype=object)
+    closes = np.asarray([r[2] for r in rows], dtype=np.float64)
+    counts = np.bincount(codes, minlength=len(names))
+    kept = counts >= min_bars
+    kept_names = [str(s) for s in names[kept]]
+    if kept.all() and (counts == lookback).all():
+        # Each symbol is one contiguous run of lookback rows, so the rows
+        # reshape into one row of the transposed panel per symbol
+        close = closes.reshape(-1, lookback).T
+        stamp_grid = stamps.reshape(-1, lookback).T
+    else:
+        # Bottom-align each kept symbol's run in its column
+        keep = kept[codes]
+        starts = np.cumsum(counts) - counts
+        row = lookback - counts[codes] + np.arange(len(codes)) - starts[codes]
+        col = (np.cumsum(kept) - 1)[codes]
+        close = np.full((lookback, len(kept_names)), np.nan)
+        close[row[keep], col[keep]] = closes[keep]
+        stamp_grid = np.full((lookback, len(kept_names)), None, dtype=object)
+        stamp_grid[row[keep], col[keep]] = stamps[keep]
+    return Universe(
+        symbols=kept_names,
+        close=pd.DataFrame(close, columns=kept_names),
+        timestamps=stamp_grid,
+        insufficient=sorted(str(s) for s in names[~kept]),
+    )
+
+
+async def load_universe(
+    session: AsyncSession,
+    interval: str,
+    lookback: int,
+    symbols: list[str] | None = None,
+    as_of: datetime | None = None,
+    min_bars: int | None = None,
+) -> Universe:
+    """The last lookback cached bars of every symbol (or of symbols) at interval.
+
+    One query: for each symbol, a LATERAL subquery walks the
+    (symbol, interval, timestamp) unique index backwards and stops after
+    lookback rows, so the cost is proportional to the bars returned rather
+    than to each symbol's full history. Every cached symbol is listed by
+    stock_data_coverage, one row per (symbol, interval), so finding them
+    does not scan the bars. Symbols with fewer than min_bars bars (default
+    lookback) are set aside as insufficient.
+    """
+    if symbols is None:
+        wanted = select(StockDataCoverage.symbol).where(StockDataCoverage.interval == interval).subquery("wanted")
+    else:
+        if not symbols:
+            raise ValueError("symbols must not be empty; omit it to screen every cached symbol")
+        wanted = values(column("symbol", String), name="wanted").data([(s,) for s in sorted(set(symbols))])
+
+    latest = select(StockDataCache.timestamp, cast(StockDataCache.close, Float).label("close")).where(
+        StockDataCache.symbol == wanted.c.symbol,
+        StockDataCache.interval == interval,
+    )
+    if as_of is not None:
+        if as_of.tzinfo is None:
+            as_of = as_of.replace(tzinfo=timezone.utc)
+        latest = latest.where(StockDataCache.timestamp <= as_of)
+    latest = latest.order_by(StockDataCache.timestamp.desc()).limit(lookback).lateral("latest")
+
+    stmt = (
+        select(wanted.c.symbol, latest.c.timestamp, latest.c.close)
+        .select_from(wanted.join(latest, true()))
+        .order_by(wanted.c.symbol, latest.c.timestamp)
+    )
+    rows = (await session.execute(stmt)).all()
+    universe = universe_from_rows(rows, lookback, min_bars)
+    if symbols is not None:
+        # Requested symbols with no cached bars at all never produce a row
+        seen = set(universe.symbols) | set(universe.insufficient)
+        universe.insufficient = sorted(universe.insufficient + [s for s in set(symbols) if s not in seen])
+    return universe
+
+
+def screener_lookback(request: ScreenRequest, strategy: Strategy, params: dict) -> int:
+    """Bars to load per symbol: SETTLE_MULTIPLE indicator windows ahead of
+    each of the last within_bars bars, unless the request sets its own."""
+    if request.within_bars < 1:
+        raise ValueError("within_bars must be at least 1")
+    if request.signal not in (None, 1, -1):
+        raise ValueError("signal must be 1, -1 or omitted")
+    lookback = request.lookback
+    if lookback is None:
+        lookback = SETTLE_MULTIPLE * strategy.indicator_window(params) + request.within_bars
+    if lookback < request.within_bars:
+        raise ValueError("lookback must cover within_bars")
+    if lookback > settings.max_screener_lookback:
+        raise ValueError(f"Lookback of {lookback} bars exceeds the limit of {settings.max_screener_lookback}")
+    return lookback
+
+
+def screen_universe(
+    universe: Universe,
+    strategy: Strategy,
+    params: dict,
+    within_bars: int = 1,
+    signal: int | None = None,
+    include_all: bool = False,
+) -> list[ScreenEntry]:
+    """Evaluate strategy over every symbol of universe at once.
+
+    Each symbol's entry carries the latest non-zero signal among its last
+    within_bars bars and the value of every indicator at its latest bar.
+    Without include_all only symbols with a matching signal are returned.
+    """
+    if not universe.symbols:
+        return []
+    signals, indicators = _latest_outputs(universe.close, strategy, params, within_bars)
+
+    # Latest row of the window holding a non-zero signal, per symbol
+    fired = signals != 0
+    last_fired = within_bars - 1 - np.argmax(fired[::-1], axis=0)
+    has_signal = fired.any(axis=0)
+    columns = np.arange(len(universe.symbols))
+    latest_signal = np.where(has_signal, signals[last_fired, columns], 0)
+    if signal is None:
+        selected = has_signal
+    else:
+        selected = latest_signal == signal
+    if include_all:
+        selected = np.ones(len(universe.symbols), dtype=bool)
+
+    stamps = universe.timestamps[-within_bars:]
+    closes = universe.close.to_numpy()[-1]
+    entries = []
+    for j in np.flatnonzero(selected):
+        entries.append(
+            ScreenEntry(
+                symbol=universe.symbols[j],
+                timestamp=universe.timestamps[-1, j],
+                close=float(closes[j]),
+                signal=int(latest_signal[j]),
+                signal_timestamp=stamps[last_fired[j], j] if has_signal[j] else None,
+                indicators={
+                    name: float(v[j]) if np.isfinite(v[j]) else None for name, v in indicators.items()
+                },
+            )
+        )
+    return entries
+
+
+def _latest_outputs(
+    close: pd.DataFrame, strategy: Strategy, params: dict, within_bars: int
+) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """The last within_bars signals and the latest value of every indicator,
+    per column of close.
+
+    Columns padded with NaN above a short history run through the strategy
+    apart from the rest: the panel kernels' row-wise path only takes
+    NaN-free frames, and most of a universe is full length.
+    """
+    padded = close.iloc[0].isna().to_numpy()
+    signals = np.zeros((within_bars, close.shape[1]))
+    indicators: dict[str, np.ndarray] = {}
+    for columns in (~padded, padded):
+        if not columns.any():
+            continue
+        outputs = strategy.generate_signals_panel({"close": close.loc[:, columns]}, params)
+        signals[:, columns] = outputs.pop("signal").to_numpy()[-within_bars:]
+        for name, frame in outputs.items():
+            indicators.setdefault(name, np.full(close.shape[1], np.nan))[columns] = frame.to_numpy()[-1]
+    return signals, indicators
+
+
+async def run_screen(request: ScreenRequest, strategy: Strategy, session: AsyncSession) -> ScreenResult:
+    """Screen every cached symbol at request.interval with one strategy."""
+    start_time = time.time()
+    if strategy.name == "pairs_trading":
+        raise ValueError("pairs_trading needs two aligned symbols and cannot run in the screener")
+    params = strategy.validate_params(request.params)
+    lookback = screener_lookback(request, strategy, params)
+
+    # Symbols with a shorter history are screened on what they have, as long
+    # as it spans the indicators' window and the bar before
+    min_bars = min(lookback, strategy.indicator_window(params) + 1)
+    universe = await load_universe(
+        session, request.interval, lookback, request.symbols, request.as_of, min_bars
+    )
+    # Off the event loop: the panel kernels take a few hundred milliseconds
+    # on thousands of symbols
+    loop = asyncio.get_event_loop()
+    results = await loop.run_in_executor(
+        None,
+        partial(
+            screen_universe,
+            universe,
+            strategy,
+            params,
+            request.within_bars,
+            request.signal,
+            request.include_all,
+        ),
+    )
+    return ScreenResult(
+        strategy_name=strategy.name,
+        params=params,
+        interval=request.interval,
+        lookback=lookback,
+        symbols_screened=len(universe.symbols),
+        insufficient_history=universe.insufficient,
+        results=results,
+        duration_ms=int((time.time() - start_time) * 1000),
+    )
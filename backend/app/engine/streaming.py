@@ -0,0 +1,122 @@
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+from app.data.provider import DataProvider
+from app.engine.backtester import (
+    POSITION_SIZE_PCT,
+    SLIPPAGE_BPS,
+    TRADE_FIELDS,
+    columns_from_rows,
+    fills_from_execution,
+    iso_timestamps,
+    rounded,
+    serialize_trades,
+)
+from app.engine.execution import execute_signals
+from app.engine.metrics import MetricsAccumulator
+from app.models.domain import BacktestRequest, BacktestResult, ResultFormat
+from app.strategies.base import Strategy
+
+# Called with (sequence number, columnar equity chunk) as each chunk finishes
+EquitySink = Callable[[int, dict[str, list]], Awaitable[None]]
+
+
+def validate_streaming(request: BacktestRequest, strategy: Strategy, chunk_size: int) -> None:
+    if request.multi_asset:
+        raise ValueError("multi_asset backtests cannot run in streaming mode")
+    if strategy.name == "pairs_trading":
+        raise ValueError("pairs_trading needs two aligned symbols and cannot run in streaming mode")
+    if chunk_size < 1 or chunk_size > settings.stream_max_chunk_bars:
+        raise ValueError(f"chunk_size must be between 1 and {settings.stream_max_chunk_bars}")
+
+
+async def run_streaming(
+    request: BacktestRequest,
+    strategy: Strategy,
+    provider: DataProvider,
+    sink: EquitySink,
+    run_id: str,
+    chunk_size: int,
+) -> BacktestResult:
+    """Backtest a long history chunk by chunk in constant memory.
+
+    Bars arrive from provider.iter_historical. Each chunk is prefixed with
+    the last strategy.warmup_bars() bars of the previous one, so indicators
+    see the same history they would in a single pass; only the new bars'
+    signals are executed. Cash and the open position carry across chunks,
+    metrics are accumulated incrementally, and each chunk's equity curve is
+    handed to sink rather than kept. The returned result has an empty
+    equity_curve and no indicator data; trades are kept in full.
+    """
+    validate_streaming(request, strategy, chunk_size)
+    start_time = time.time()
+    params = strategy.validate_params(request.params)
+    warmup = strategy.warmup_bars(params)
+    symbol = request.symbols[0]
+    start_dt = datetime.combine(request.start_date, datetime.min.time())
+    end_dt = datetime.combine(request.end_date, datetime.min.time())
+
+    accumulator = MetricsAccumulator(request.initial_cash, request.interval)
+    cash = request.initial_cash
+    quantity = 0.0
+    avg_price = 0.0
+    tail: pd.DataFrame | None = None
+    trades: list[dict] = []
+    seq = 0
+
+    async for bars in provider.iter_historical(symbol, start_dt, end_dt, request.interval, chunk_size):
+        chunk = bars.to_frame()
+        bar_columns = list(chunk.columns)
+        n_tail = 0 if tail is None else len(tail)
+        frame = chunk if tail is None else pd.concat([tail, chunk], ignore_index=True)
+        frame = strategy.generate_signals(frame, params)
+        new = frame.iloc[n_tail:]
+
+        close = new["close"].to_numpy(dtype=np.float64)
+        ex = execute_signals(
+            close,
+            new["signal"].to_numpy(),
+            initial_cash=cash,
+            fee_pct=request.trading_fee_pct,
+            slippage_bps=SLIPPAGE_BPS,
+            position_size_pct=POSITION_SIZE_PCT,
+            initial_quantity=quantity,
+            initial_avg_price=avg_price,
+        )
+        cash = float(ex.cash[-1])
+        quantity = float(ex.quantity[-1])
+        avg_price = ex.avg_price
+
+        fills = fills_from_execution(ex, new["timestamp"].iloc[ex.fill_index].tolist(), symbol)
+        equity = rounded(ex.equity, 2)
+        accumulator.update(np.asarray(equity, dtype=np.float64), fills, new["timestamp"])
+        trades.extend(serialize_trades(fills))
+
+        await sink(seq, {
+            "timestamp": iso_timestamps(new["timestamp"].tolist()),
+            "equity": equity,
+            "price": rounded(close, 4),
+        })
+        seq += 1
+        tail = frame[bar_columns].iloc[-warmup:].reset_index(drop=True)
+
+    if request.result_format == ResultFormat.COLUMNAR:
+        equity_curve: list | dict = {"timestamp": [], "equity": [], "price": []}
+        trades = columns_from_rows(trades, TRADE_FIELDS)
+    else:
+        equity_curve = []
+
+    return BacktestResult(
+        id=run_id,
+        metrics=accumulator.result(),
+        equity_curve=equity_curve,
+        trades=trades,
+        indicator_data={},
+        result_format=request.result_format,
+        duration_ms=int((time.time() - start_time) * 1000),
+    )
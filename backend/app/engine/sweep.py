@@ -0,0 +1,179 @@
+import asyncio
+import itertools
+import math
+import time
+from functools import partial
+
+import pandas as pd
+
+from app.config import settings
+from app.data.provider import DataProvider
+from app.engine.backtester import BacktestEngine, empty_metrics, evaluate_signal_matrix
+from app.engine.pool import get_process_pool, worker_count
+from app.models.domain import (
+    BacktestMetrics,
+    ParamRange,
+    StrategyParamDef,
+    SweepEntry,
+    SweepRequest,
+    SweepResult,
+)
+from app.strategies.base import Strategy
+
+
+def _range_values(spec: ParamRange, pdef: StrategyParamDef) -> list:
+    if spec.step <= 0:
+        raise ValueError(f"Step for '{pdef.name}' must be positive")
+    if spec.stop < spec.start:
+        raise ValueError(f"Range for '{pdef.name}' has stop < start")
+    count = math.floor((spec.stop - spec.start) / spec.step + 1e-9) + 1
+    values = [round(spec.start + i * spec.step, 10) for i in range(count)]
+    if pdef.type == "int":
+        values = [int(v) for v in values]
+    return values
+
+
+def expand_param_grid(
+    strategy: Strategy,
+    grid: dict[str, list | ParamRange],
+    max_combinations: int | None = None,
+) -> list[dict]:
+    """Cartesian product of the grid over the strategy's declared parameters.
+
+    Parameters missing from the grid use their default. Every combination is
+    passed through validate_params, and combinations that clamp to the same
+    values are evaluated once.
+    """
+    declared = {p.name: p for p in strategy.parameters()}
+    unknown = set(grid) - set(declared)
+    if unknown:
+        raise ValueError(
+            f"Unknown parameters for '{strategy.name}': {sorted(unknown)}. "
+            f"Available: {list(declared)}"
+        )
+
+    names = list(declared)
+    axes = []
+    for name in names:
+        spec = grid.get(name)
+        if spec is None:
+            axes.append([declared[name].default])
+        elif isinstance(spec, ParamRange):
+            axes.append(_range_values(spec, declared[name]))
+        else:
+            axes.append(list(spec) or [declared[name].default])
+
+    limit = max_combinations or settings.max_sweep_combinations
+    total = math.prod(len(a) for a in axes)
+    if total > limit:
+        raise ValueError(f"Sweep has {total} combinations; the limit is {limit}")
+
+    combos = []
+    seen = set()
+    for values in itertools.product(*axes):
+        params = strategy.validate_params(dict(zip(names, values)))
+        key = tuple(params[n] for n in names)
+        if key not in seen:
+            seen.add(key)
+            combos.append(params)
+    return combos
+
+
+def _evaluate_chunk(
+    df: pd.DataFrame,
+    strategy_name: str,
+    param_sets: list[dict],
+    initial_cash: float,
+    fee_pct: float,
+    symbol: str,
+    interval: str,
+) -> list[BacktestMetrics]:
+    """Worker-process entry point: evaluate a slice of the grid over shared bars."""
+    from app.strategies.registry import strategy_registry
+
+    strategy = strategy_registry.get(strategy_name)
+    signals = strategy.generate_signals_batch(df, param_sets)
+    return evaluate_signal_matrix(df, signals, initial_cash, fee_pct, symbol, interval)
+
+
+def chunk_list(items: list, n: int) -> list[list]:
+    size = max(1, math.ceil(len(items) / n))
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+# Metrics where smaller is better; every other one ranks highest first
+# (max_drawdown_pct is reported as a negative number, so it does too)
+LOWER_IS_BETTER = frozenset({"max_drawdown_duration_days", "avg_trade_duration_days"})
+
+
+def validate_rank_field(name: str) -> None:
+    if name not in BacktestMetrics.model_fields:
+        raise ValueError(
+            f"Cannot rank by '{name}'. Available: {list(BacktestMetrics.model_fields)}"
+        )
+
+
+def rank_score(metrics: BacktestMetrics, name: str) -> float:
+    """metrics' name field, negated where smaller is better, so that a
+    higher score is always the better result."""
+    value = getattr(metrics, name)
+    return -value if name in LOWER_IS_BETTER else value
+
+
+async def run_sweep(
+    request: SweepRequest, strategy: Strategy, provider: DataProvider
+) -> SweepResult:
+    start_time = time.time()
+    validate_rank_field(request.rank_by)
+
+    combos = expand_param_grid(strategy, request.param_grid)
+
+    engine = BacktestEngine(provider)
+    df = await engine.load_frame(
+        request.symbols, request.start_date, request.end_date, request.interval, strategy
+    )
+
+    if df is None:
+        metrics = [empty_metrics() for _ in combos]
+    else:
+        # Each task pickles the bars once, so hand workers a few large slices
+        # of the grid rather than one task per combination.
+        loop = asyncio.get_event_loop()
+        pool = get_process_pool()
+        tasks = [
+            loop.run_in_executor(
+                pool,
+                partial(
+                    _evaluate_chunk,
+                    df,
+                    strategy.name,
+                    chunk,
+                    request.initial_cash,
+                    request.trading_fee_pct,
+                    request.symbols[0],
+                    request.interval,
+                ),
+            )
+            for chunk in chunk_list(combos, worker_count() * 2)
+        ]
+        metrics = [m for chunk_metrics in await asyncio.gather(*tasks) for m in chunk_metrics]
+
+    ranked = sorted(
+        zip(combos, metrics),
+        key=lambda pm: rank_score(pm[1], request.rank_by),
+        reverse=True,
+    )
+    if request.top_n is not None:
+        ranked = ranked[: request.top_n]
+
+    return SweepResult(
+        strategy_name=strategy.name,
+        symbols=request.symbols,
+        total_combinations=len(combos),
+        rank_by=request.rank_by,
+        results=[
+            SweepEntry(rank=i + 1, params=params, metrics=m)
+            for i, (params, m) in enumerate(ranked)
+        ],
+        duration_ms=int((time.time() - start_time) * 1000),
+    )
@@ -0,0 +1,204 @@
+import asyncio
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from app.data.provider import DataProvider
+from app.engine.backtester import (
+    POSITION_SIZE_PCT,
+    SLIPPAGE_BPS,
+    BacktestEngine,
+    evaluate_signal_matrix,
+    fills_from_execution,
+    iso_timestamps,
+    metrics_from_execution,
+    rounded,
+    rows_from_columns,
+    serialize_trades,
+)
+from app.engine.execution import ExecutionResult, execute_signals
+from app.engine.metrics import compute_metrics
+from app.engine.pool import get_process_pool
+from app.engine.sweep import expand_param_grid, rank_score, validate_rank_field
+from app.models.domain import (
+    BacktestMetrics,
+    WalkForwardRequest,
+    WalkForwardResult,
+    WalkForwardWindow,
+)
+from app.strategies.base import Strategy
+
+
+def plan_windows(
+    n_bars: int, train_bars: int, test_bars: int, anchored: bool = False
+) -> list[tuple[int, int, int]]:
+    """(train_start, test_start, test_end) bar offsets for each window.
+
+    Test windows are contiguous and non-overlapping; the train window is the
+    train_bars bars before each test window, or everything before it when
+    anchored. The last test window may be shorter than test_bars.
+    """
+    if train_bars < 2 or test_bars < 1:
+        raise ValueError("train_bars must be >= 2 and test_bars >= 1")
+    windows = []
+    test_start = train_bars
+    while test_start < n_bars:
+        test_end = min(test_start + test_bars, n_bars)
+        train_start = 0 if anchored else test_start - train_bars
+        windows.append((train_start, test_start, test_end))
+        test_start = test_end
+    return windows
+
+
+def _execute(close: np.ndarray, signal: np.ndarray, initial_cash: float, fee_pct: float) -> ExecutionResult:
+    return execute_signals(
+        close,
+        signal,
+        initial_cash=initial_cash,
+        fee_pct=fee_pct,
+        slippage_bps=SLIPPAGE_BPS,
+        position_size_pct=POSITION_SIZE_PCT,
+    )
+
+
+def _optimize_window(
+    df: pd.DataFrame,
+    strategy_name: str,
+    param_sets: list[dict],
+    train_len: int,
+    initial_cash: float,
+    fee_pct: float,
+    optimize_by: str,
+    symbol: str,
+    interval: str,
+) -> tuple[int, BacktestMetrics, BacktestMetrics, np.ndarray]:
+    """Worker-process entry point for one window.
+
+    df covers the train and test bars together. Signals for every parameter
+    set are generated in one generate_signals_batch call over that whole
+    slice, so shared indicators are computed once per window: the train
+    rows are scored, and the winner's test rows (with indicators warmed up
+    on the train bars) are evaluated out of sample. Returns (best index,
+    train metrics, test metrics, test signals).
+    """
+    from app.strategies.registry import strategy_registry
+
+    strategy = strategy_registry.get(strategy_name)
+    close = df["close"].to_numpy(dtype=np.float64)
+    timestamps = df["timestamp"]
+
+    signals = strategy.generate_signals_batch(df, param_sets)
+    scored = evaluate_signal_matrix(
+        df.iloc[:train_len], signals[:train_len], initial_cash, fee_pct, symbol, interval
+    )
+    # The first of equally scored parameter sets wins
+    best_index = max(range(len(scored)), key=lambda i: (rank_score(scored[i], optimize_by), -i))
+    train_metrics = scored[best_index]
+    test_signal = signals[train_len:, best_index].astype(np.float64)
+    ex = _execute(close[train_len:], test_signal, initial_cash, fee_pct)
+    test_metrics = metrics_from_execution(
+        ex, timestamps.iloc[train_len:], initial_cash, symbol, interval
+    )
+    return best_index, train_metrics, test_metrics, test_signal
+
+
+async def run_walk_forward(
+    request: WalkForwardRequest, strategy: Strategy, provider: DataProvider
+) -> WalkForwardResult:
+    """Roll train/test windows over the range, optimizing on each train window.
+
+    Windows are optimized in parallel on the shared process pool. The chosen
+    parameters' test-window signals are stitched into one out-of-sample
+    signal series and executed in a single pass, so positions and cash carry
+    across window boundaries.
+    """
+    start_time = time.time()
+    validate_rank_field(request.optimize_by)
+    combos = expand_param_grid(strategy, request.param_grid)
+
+    engine = BacktestEngine(provider)
+    df = await engine.load_frame(
+        request.symbols, request.start_date, request.end_date, request.interval, strategy
+    )
+    if df is None:
+        raise ValueError("No data for the requested range")
+
+    windows = plan_windows(len(df), request.train_bars, request.test_bars, request.anchored)
+    if not windows:
+        raise ValueError(
+            f"Need more than {request.train_bars} bars for one window; got {len(df)}"
+        )
+
+    symbol = request.symbols[0]
+    loop = asyncio.get_event_loop()
+    pool = get_process_pool()
+    tasks = [
+        loop.run_in_executor(
+            pool,
+            partial(
+                _optimize_window,
+                df.iloc[train_start:test_end].reset_index(drop=True),
+                strategy.name,
+                combos,
+                test_start - train_start,
+                request.initial_cash,
+                request.trading_fee_pct,
+                request.optimize_by,
+                symbol,
+                request.interval,
+            ),
+        )
+        for train_start, test_start, test_end in windows
+    ]
+    outcomes = await asyncio.gather(*tasks)
+
+    timestamps = iso_timestamps(df["timestamp"].tolist())
+    window_results = [
+        WalkForwardWindow(
+            train_start=timestamps[train_start],
+            train_end=timestamps[test_start - 1],
+            test_start=timestamps[test_start],
+            test_end=timestamps[test_end - 1],
+            params=combos[best_index],
+            train_metrics=train_metrics,
+            test_metrics=test_metrics,
+        )
+        for (train_start, test_start, test_end), (best_index, train_metrics, test_metrics, _) in zip(
+            windows, outcomes
+        )
+    ]
+
+    # Stitched out-of-sample run
+    oos_start = windows[0][1]
+    oos = df.iloc[oos_start:]
+    close = oos["close"].to_numpy(dtype=np.float64)
+    signal = np.concatenate([outcome[3] for outcome in outcomes])
+    ex = _execute(close, signal, request.initial_cash, request.trading_fee_pct)
+
+    equity = rounded(ex.equity, 2)
+    equity_curve = rows_from_columns({
+        "timestamp": timestamps[oos_start:],
+        "equity": equity,
+        "price": rounded(close, 4),
+    })
+    fills = fills_from_execution(ex, oos["timestamp"].iloc[ex.fill_index].tolist(), symbol)
+    metrics = compute_metrics(
+        np.asarray(equity, dtype=np.float64),
+        fills,
+        request.initial_cash,
+        request.interval,
+        oos["timestamp"],
+    )
+
+    return WalkForwardResult(
+        strategy_name=strategy.name,
+        symbols=request.symbols,
+        total_combinations=len(combos),
+        windows=window_results,
+        metrics=metrics,
+        equity_curve=equity_curve,
+        trades=serialize_trades(fills),
+        duration_ms=int((time.time() - start_time) * 1000),
+    )
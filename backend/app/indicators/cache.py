@@ -0,0 +1,103 @@
+import hashlib
+from collections import OrderedDict
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from app.config import settings
+
+# Indicators run over a Series, or column-wise over a frame of many symbols
+IndicatorInput = pd.Series | pd.DataFrame
+IndicatorResult = IndicatorInput | tuple[IndicatorInput, ...]
+
+
+def series_fingerprint(series: IndicatorInput) -> str:
+    """Content hash of a series' or frame's values (the index and column
+    labels are not part of it)."""
+    values = np.ascontiguousarray(series.to_numpy())
+    digest = hashlib.sha256(f"{values.dtype.str}:{values.shape}:".encode())
+    digest.update(values.data)
+    return digest.hexdigest()
+
+
+def _share(result: IndicatorResult, like: IndicatorInput | None = None) -> IndicatorResult:
+    """Shallow copies of result's parts, optionally relabelled with like's
+    index (and columns, for frames)."""
+    if isinstance(result, tuple):
+        return tuple(_share(part, like) for part in result)
+    out = result.copy(deep=False)
+    if like is not None:
+        out.index = like.index
+        if isinstance(out, pd.DataFrame):
+            out.columns = like.columns
+    return out
+
+
+class IndicatorCache:
+    """Process-wide LRU of indicator outputs keyed by
+    (series fingerprint, indicator function, arguments).
+
+    Strategies and composite indicators request their building blocks via
+    compute(), so a sweep or batch run that evaluates several parameter sets
+    or strategies over the same bars computes each EMA, rolling mean and
+    rolling std once. Results are stored and handed out as shallow copies,
+    which copy-on-write (always on from pandas 3, hence the version floor)
+    keeps independent: callers are free to modify what they get back
+    without touching the cache, and nothing is copied unless they do.
+    Entries are evicted least recently used first once their arrays exceed
+    max_bytes; 0 disables caching.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[IndicatorResult, int]] = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def compute(self, fn: Callable[..., IndicatorResult], series: IndicatorInput, *args) -> IndicatorResult:
+        """fn(series, *args), served from the cache when the same indicator
+        has already been computed over the same values."""
+        if self.max_bytes <= 0:
+            return fn(series, *args)
+        key = (series_fingerprint(series), fn.__module__, fn.__qualname__, args)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            result = fn(series, *args)
+            self._store(key, result)
+            return result
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return _share(entry[0], series)
+
+    def _store(self, key: tuple, result: IndicatorResult) -> None:
+        parts = result if isinstance(result, tuple) else (result,)
+        size = sum(part.to_numpy().nbytes for part in parts)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (_share(result), size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.nbytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self.nbytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+indicator_cache = IndicatorCache(settings.indicator_cache_mb * 2**20)
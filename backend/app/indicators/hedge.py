@@ -0,0 +1,130 @@
+"""Hedge ratios between two price series, for pairs-trading spreads.
+
+compute_rolling_ols regresses y on x over a trailing window for every bar
+at once. Window sums of x, y, x*x, x*y and y*y are differences of prefix
+sums; the prefix sums restart every block of bars and are taken around
+the block's means, so the covariances stay accurate over years of
+minute bars instead of cancelling two huge totals.
+
+compute_kalman_hedge lets the hedge ratio drift as a random walk and
+tracks it with a Kalman filter. The filter is recursive, so it is one
+sequential pass over the bars (incremental.KalmanRegression per bar, the
+same object on_bar uses live).
+"""
+
+import numpy as np
+import pandas as pd
+
+from app.indicators.incremental import FLAT_VARIANCE, KalmanRegression
+from app.indicators.moving_average import compute_rolling_std, compute_sma
+
+HEDGE_METHODS = ("ols", "kalman", "none")
+
+# Bars per prefix-sum block, as a multiple of the window
+BLOCK_WINDOWS = 8
+MIN_BLOCK = 4096
+
+
+def _window_sums(prefix: np.ndarray, a: int, b: int, period: int) -> np.ndarray:
+    return prefix[a:b] - prefix[a - period : b - period]
+
+
+def compute_rolling_ols(
+    y: np.ndarray, x: np.ndarray, period: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Least-squares fit of y = alpha + beta * x over each window of period bars.
+
+    Returns (beta, alpha, resid_std) arrays, the residual std using
+    period - 2 degrees of freedom. Bars before the first full window,
+    windows containing NaN and windows where x is flat are NaN.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    x = np.asarray(x, dtype=np.float64)
+    n = len(y)
+    beta = np.full(n, np.nan)
+    alpha = np.full(n, np.nan)
+    resid_std = np.full(n, np.nan)
+    if period < 3 or n < period:
+        return beta, alpha, resid_std
+
+    missing = np.isnan(x) | np.isnan(y)
+    block = max(MIN_BLOCK, BLOCK_WINDOWS * period)
+    for start in range(period - 1, n, block):
+        stop = min(start + block, n)
+        lo = start - period + 1
+        gap = missing[lo:stop]
+        if gap.all():
+            continue
+        ref_x = x[lo:stop][~gap].mean()
+        ref_y = y[lo:stop][~gap].mean()
+        cx = np.where(gap, 0.0, x[lo:stop] - ref_x)
+        cy = np.where(gap, 0.0, y[lo:stop] - ref_y)
+
+        size = stop - lo + 1
+        prefix = {}
+        for name, values in (("x", cx), ("y", cy), ("xx", cx * cx), ("xy", cx * cy), ("yy", cy * cy)):
+            prefix[name] = np.zeros(size)
+            np.cumsum(values, out=prefix[name][1:])
+        gaps = np.zeros(size, dtype=np.int64)
+        np.cumsum(gap, out=gaps[1:])
+
+        # Window ending at bar t covers block rows t - lo - period + 1 .. t - lo
+        a, b = start - lo + 1, stop - lo + 1
+        sx, sy = _window_sums(prefix["x"], a, b, period), _window_sums(prefix["y"], a, b, period)
+        cxx = _window_sums(prefix["xx"], a, b, period) - sx * sx / period
+        cxy = _window_sums(prefix["xy"], a, b, period) - sx * sy / period
+        cyy = _window_sums(prefix["yy"], a, b, period) - sy * sy / period
+        mean_x = sx / period + ref_x
+        mean_y = sy / period + ref_y
+
+        valid = (gaps[a:b] == gaps[a - period : b - period]) & (
+            cxx > FLAT_VARIANCE * period * mean_x * mean_x
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            block_beta = cxy / cxx
+        ssr = np.maximum(cyy - block_beta * cxy, 0.0)
+        beta[start:stop] = np.where(valid, block_beta, np.nan)
+        alpha[start:stop] = np.where(valid, mean_y - block_beta * mean_x, np.nan)
+        resid_std[start:stop] = np.where(valid, np.sqrt(ssr / (period - 2)), np.nan)
+    return beta, alpha, resid_std
+
+
+def compute_kalman_hedge(
+    y: np.ndarray, x: np.ndarray, delta: float, warmup: int = 0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """KalmanRegression over the whole series: (beta, error, error_std) per
+    bar, NaN for the first warmup observations and for NaN pairs."""
+    update = KalmanRegression(delta, warmup).update
+    xs = np.asarray(x, dtype=np.float64).tolist()
+    ys = np.asarray(y, dtype=np.float64).tolist()
+    out = np.array([update(xi, yi) for xi, yi in zip(xs, ys)], dtype=np.float64).reshape(-1, 3)
+    return out[:, 0], out[:, 1], out[:, 2]
+
+
+def compute_pair_spread(
+    pair: pd.DataFrame, period: int, method: str = "ols", delta: float = 1e-4
+) -> tuple[pd.Series, pd.Series, pd.Series]:
+    """(hedge_ratio, spread, spread_z) for pair's first column against its second.
+
+    ols: the residual from compute_rolling_ols over period bars, scaled by
+    the fit's residual std. kalman: the Kalman forecast error scaled by its
+    expected std, after period bars of warm-up. none: the plain difference
+    with a rolling z-score, i.e. a fixed hedge ratio of 1.
+    """
+    y = pair.iloc[:, 0].to_numpy(dtype=np.float64)
+    x = pair.iloc[:, 1].to_numpy(dtype=np.float64)
+    if method == "ols":
+        beta, alpha, resid_std = compute_rolling_ols(y, x, period)
+        spread = y - alpha - beta * x
+        with np.errstate(divide="ignore", invalid="ignore"):
+            spread_z = spread / resid_std
+    elif method == "kalman":
+        beta, spread, error_std = compute_kalman_hedge(y, x, delta, warmup=period)
+        spread_z = spread / error_std
+    elif method == "none":
+        diff = pair.iloc[:, 0] - pair.iloc[:, 1]
+        z = (diff - compute_sma(diff, period)) / compute_rolling_std(diff, period)
+        beta, spread, spread_z = np.ones(len(y)), diff.to_numpy(), z.to_numpy()
+    else:
+        raise ValueError(f"Unknown hedge method '{method}'; expected one of {HEDGE_METHODS}")
+    return tuple(pd.Series(values, index=pair.index) for values in (beta, spread, spread_z))
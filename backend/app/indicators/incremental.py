@@ -0,0 +1,569 @@
+"""Stateful, O(1)-per-bar counterparts of the batch indicators.
+
+Each class takes one value at a time through update() and returns the
+indicator's value for that bar, NaN while it is still warming up. The
+arithmetic follows pandas' rolling and ewm kernels step for step, so
+feeding a series through update() reproduces compute_sma, compute_ema,
+compute_rsi, compute_macd and compute_bollinger_bands on that series
+(see RollingStd for the one rounding caveat). The two-series regressions
+pair with app.indicators.hedge: KalmanRegression is the very filter
+compute_kalman_hedge runs, while RollingOLS matches compute_rolling_ols
+to rounding only.
+
+snapshot() returns the full state as a plain, JSON-serializable dict and
+restore() loads one back, so a live path can persist an indicator and
+resume it later without replaying history.
+"""
+
+import math
+from collections import deque
+
+NAN = float("nan")
+
+# A regression window whose x variance is below this fraction of x's squared
+# level is treated as constant (no hedge ratio) rather than divided by noise
+FLAT_VARIANCE = 1e-12
+
+# Observation noise variance of KalmanRegression's measurement y = alpha + beta * x
+KALMAN_OBS_VAR = 1e-3
+
+
+def divide(a: float, b: float) -> float:
+    """a / b with IEEE semantics (inf or NaN) instead of ZeroDivisionError."""
+    if b == 0:
+        if a == 0 or a != a:
+            return NAN
+        return math.copysign(math.inf, a) * math.copysign(1.0, b)
+    return a / b
+
+
+class SMA:
+    """Rolling mean over the last period values (compute_sma).
+
+    Keeps a ring buffer of the window and a Kahan-compensated running sum.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._window: deque[float] = deque()
+        self._nobs = 0
+        self._sum = 0.0
+        self._compensation_add = 0.0
+        self._compensation_remove = 0.0
+        self._neg_ct = 0
+        self._same_count = 0
+        self._prev_value = NAN
+
+    def update(self, value: float) -> float:
+        if len(self._window) == self.period:
+            self._remove(self._window.popleft())
+        self._window.append(value)
+        self._add(value)
+        return self.value
+
+    def _add(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs += 1
+        y = value - self._compensation_add
+        t = self._sum + y
+        self._compensation_add = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct += 1
+        if value == self._prev_value:
+            self._same_count += 1
+        else:
+            self._same_count = 1
+        self._prev_value = value
+
+    def _remove(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs -= 1
+        y = -value - self._compensation_remove
+        t = self._sum + y
+        self._compensation_remove = t - self._sum - y
+        self._sum = t
+        if math.copysign(1.0, value) < 0:
+            self._neg_ct -= 1
+
+    @property
+    def value(self) -> float:
+        if self._nobs < self.period or self._nobs == 0:
+            return NAN
+        if self._same_count >= self._nobs:
+            return self._prev_value
+        result = self._sum / self._nobs
+        if self._neg_ct == 0 and result < 0:
+            return 0.0
+        if self._neg_ct == self._nobs and result > 0:
+            return 0.0
+        return result
+
+    def snapshot(self) -> dict:
+        return {
+            "period": self.period,
+            "window": list(self._window),
+            "nobs": self._nobs,
+            "sum": self._sum,
+            "compensation_add": self._compensation_add,
+            "compensation_remove": self._compensation_remove,
+            "neg_ct": self._neg_ct,
+            "same_count": self._same_count,
+            "prev_value": self._prev_value,
+        }
+
+    def restore(self, state: dict) -> None:
+        self.period = state["period"]
+        self._window = deque(state["window"])
+        self._nobs = state["nobs"]
+        self._sum = state["sum"]
+        self._compensation_add = state["compensation_add"]
+        self._compensation_remove = state["compensation_remove"]
+        self._neg_ct = state["neg_ct"]
+        self._same_count = state["same_count"]
+        self._prev_value = state["prev_value"]
+
+
+class RollingStd:
+    """Rolling sample standard deviation (ddof=1) over the last period values,
+    as series.rolling(period).std(). Welford updates with compensation for
+    each value entering and leaving the window.
+
+    Matches pandas bit for bit from period 3 up; a two-bar window can differ
+    from it in the last couple of ulps.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._window: deque[float] = deque()
+        self._nobs = 0
+        self._mean = 0.0
+        self._ssqdm = 0.0
+        self._compensation_add = 0.0
+        self._compensation_remove = 0.0
+        self._same_count = 0
+        self._prev_value = NAN
+
+    def update(self, value: float) -> float:
+        if len(self._window) == self.period:
+            self._remove(self._window.popleft())
+        self._window.append(value)
+        self._add(value)
+        return self.value
+
+    def _add(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs += 1
+        if value == self._prev_value:
+            self._same_count += 1
+        else:
+            self._same_count = 1
+        self._prev_value = value
+        prev_mean = self._mean - self._compensation_add
+        y = value - self._compensation_add
+        t = y - self._mean
+        self._compensation_add = t + self._mean - y
+        self._mean += t / self._nobs
+        self._ssqdm += (value - prev_mean) * (value - self._mean)
+
+    def _remove(self, value: float) -> None:
+        if value != value:
+            return
+        self._nobs -= 1
+        if self._nobs == 1:
+            # A lone remaining value is its own mean; restart from it rather
+            # than carry the subtraction's rounding into the next window
+            self._mean = next(v for v in self._window if v == v)
+            self._ssqdm = 0.0
+        elif self._nobs:
+            prev_mean = self._mean - self._compensation_remove
+            y = value - self._compensation_remove
+            t = y - self._mean
+            self._compensation_remove = t + self._mean - y
+            self._mean -= t / self._nobs
+            self._ssqdm -= (value - prev_mean) * (value - self._mean)
+        else:
+            self._mean = 0.0
+            self._ssqdm = 0.0
+
+    @property
+    def value(self) -> float:
+        if self._nobs < self.period or self._nobs <= 1:
+            return NAN
+        if self._same_count >= self._nobs:
+            return 0.0
+        return math.sqrt(max(self._ssqdm / (self._nobs - 1), 0.0))
+
+    def snapshot(self) -> dict:
+        return {
+            "period": self.period,
+            "window": list(self._window),
+            "nobs": self._nobs,
+            "mean": self._mean,
+            "ssqdm": self._ssqdm,
+            "compensation_add": self._compensation_add,
+            "compensation_remove": self._compensation_remove,
+            "same_count": self._same_count,
+            "prev_value": self._prev_value,
+        }
+
+    def restore(self, state: dict) -> None:
+        self.period = state["period"]
+        self._window = deque(state["window"])
+        self._nobs = state["nobs"]
+        self._mean = state["mean"]
+        self._ssqdm = state["ssqdm"]
+        self._compensation_add = state["compensation_add"]
+        self._compensation_remove = state["compensation_remove"]
+        self._same_count = state["same_count"]
+        self._prev_value = state["prev_value"]
+
+
+class EWM:
+    """Exponentially weighted mean, as series.ewm(com=com, adjust=adjust,
+    min_periods=min_periods).mean()."""
+
+    def __init__(self, com: float, adjust: bool = True, min_periods: int = 0):
+        self.com = com
+        self.adjust = adjust
+        self.min_periods = max(min_periods, 1)
+        self._weighted = NAN
+        self._old_wt = 1.0
+        self._nobs = 0
+        self._started = False
+
+    def update(self, value: float) -> float:
+        is_observation = value == value
+        self._nobs += is_observation
+        if not self._started:
+            self._started = True
+            self._weighted = value
+            self._old_wt = 1.0
+        elif self._weighted == self._weighted:
+            alpha = 1.0 / (1.0 + self.com)
+            new_wt = 1.0 if self.adjust else alpha
+            self._old_wt *= 1.0 - alpha
+            if is_observation:
+                if self._weighted != value:
+                    self._weighted = (self._old_wt * self._weighted + new_wt * value) / (
+                        self._old_wt + new_wt
+                    )
+                if self.adjust:
+                    self._old_wt += new_wt
+                else:
+                    self._old_wt = 1.0
+        elif is_observation:
+            self._weighted = value
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._weighted if self._nobs >= self.min_periods else NAN
+
+    def snapshot(self) -> dict:
+        return {
+            "com": self.com,
+            "adjust": self.adjust,
+            "min_periods": self.min_periods,
+            "weighted": self._weighted,
+            "old_wt": self._old_wt,
+            "nobs": self._nobs,
+            "started": self._started,
+        }
+
+    def restore(self, state: dict) -> None:
+        self.com = state["com"]
+        self.adjust = state["adjust"]
+        self.min_periods = state["min_periods"]
+        self._weighted = state["weighted"]
+        self._old_wt = state["old_wt"]
+        self._nobs = state["nobs"]
+        self._started = state["started"]
+
+
+class EMA(EWM):
+    """compute_ema: span-based EMA without bias adjustment."""
+
+    def __init__(self, period: int):
+        super().__init__(com=(period - 1) / 2, adjust=False)
+
+
+class RSI:
+    """compute_rsi: Wilder-style smoothing (alpha = 1/period) of gains and
+    losses, with the first period bars as warm-up."""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._avg_gain = EWM(com=period - 1, min_periods=period)
+        self._avg_loss = EWM(com=period - 1, min_periods=period)
+        self._prev = NAN
+
+    def update(self, price: float) -> float:
+        delta = price - self._prev
+        self._prev = price
+        gain = delta if delta > 0 else 0.0
+        loss = -(delta if delta < 0 else 0.0)
+        rs = divide(self._avg_gain.update(gain), self._avg_loss.update(loss))
+        return 100 - divide(100, 1 + rs) if rs == rs else NAN
+
+    def snapshot(self) -> dict:
+        return {
+            "period": self.period,
+            "avg_gain": self._avg_gain.snapshot(),
+            "avg_loss": self._avg_loss.snapshot(),
+            "prev": self._prev,
+        }
+
+    def restore(self, state: dict) -> None:
+        self.period = state["period"]
+        self._avg_gain.restore(state["avg_gain"])
+        self._avg_loss.restore(state["avg_loss"])
+        self._prev = state["prev"]
+
+
+class MACD:
+    """compute_macd: update() returns (macd_line, signal_line, histogram)."""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self._fast = EMA(fast_period)
+        self._slow = EMA(slow_period)
+        self._signal = EMA(signal_period)
+
+    def update(self, price: float) -> tuple[float, float, float]:
+        macd_line = self._fast.update(price) - self._slow.update(price)
+        signal_line = self._signal.update(macd_line)
+        return macd_line, signal_line, macd_line - signal_line
+
+    def snapshot(self) -> dict:
+        return {
+            "fast": self._fast.snapshot(),
+            "slow": self._slow.snapshot(),
+            "signal": self._signal.snapshot(),
+        }
+
+    def restore(self, state: dict) -> None:
+        self._fast.restore(state["fast"])
+        self._slow.restore(state["slow"])
+        self._signal.restore(state["signal"])
+
+
+class BollingerBands:
+    """compute_bollinger_bands: update() returns (middle, upper, lower)."""
+
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        self.num_std = num_std
+        self._middle = SMA(period)
+        self._std = RollingStd(period)
+
+    def update(self, price: float) -> tuple[float, float, float]:
+        middle = self._middle.update(price)
+        std = self._std.update(price)
+        return middle, middle + self.num_std * std, middle - self.num_std * std
+
+    def snapshot(self) -> dict:
+        return {
+            "num_std": self.num_std,
+            "middle": self._middle.snapshot(),
+            "std": self._std.snapshot(),
+        }
+
+    def restore(self, state: dict) -> None:
+        self.num_std = state["num_std"]
+        self._middle.restore(state["middle"])
+        self._std.restore(state["std"])
+
+
+class RollingOLS:
+    """Rolling least-squares fit of y = alpha + beta * x over the last period
+    (x, y) pairs (compute_rolling_ols): update() returns (beta, alpha,
+    resid_std), the residual std using period - 2 degrees of freedom.
+
+    Means and co-moments are updated Welford-style as pairs enter and leave
+    the window, and recomputed from the window every period removals so
+    rounding cannot build up over long runs. A window holding a NaN pair
+    yields NaN until the pair has left it.
+    """
+
+    def __init__(self, period: int):
+        self.period = period
+        self._window: deque[tuple[float, float]] = deque()
+        self._gaps = 0
+        self._removals = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._nobs = 0
+        self._mean_x = 0.0
+        self._mean_y = 0.0
+        self._cxx = 0.0
+        self._cxy = 0.0
+        self._cyy = 0.0
+
+    def update(self, x: float, y: float) -> tuple[float, float, float]:
+        if len(self._window) == self.period:
+            self._remove(*self._window.popleft())
+        self._window.append((x, y))
+        self._add(x, y)
+        return self.value
+
+    def _add(self, x: float, y: float) -> None:
+        if x != x or y != y:
+            self._gaps += 1
+            return
+        self._nobs += 1
+        dx = x - self._mean_x
+        dy = y - self._mean_y
+        self._mean_x += dx / self._nobs
+        self._mean_y += dy / self._nobs
+        self._cxx += dx * (x - self._mean_x)
+        self._cxy += dx * (y - self._mean_y)
+        self._cyy += dy * (y - self._mean_y)
+
+    def _remove(self, x: float, y: float) -> None:
+        if x != x or y != y:
+            self._gaps -= 1
+            return
+        self._removals += 1
+        if self._removals >= self.period:
+            self._removals = 0
+            self._refresh()
+            return
+        self._nobs -= 1
+        if not self._nobs:
+            self._reset()
+            return
+        dx = x - self._mean_x
+        dy = y - self._mean_y
+        self._mean_x -= dx / self._nobs
+        self._mean_y -= dy / self._nobs
+        self._cxx -= dx * (x - self._mean_x)
+        self._cxy -= dy * (x - self._mean_x)
+        self._cyy -= dy * (y - self._mean_y)
+
+    def _refresh(self) -> None:
+        """Exact two-pass moments of the window minus its oldest pair, which
+        the caller has just popped."""
+        pairs = [(x, y) for x, y in self._window if x == x and y == y]
+        self._reset()
+        if not pairs:
+            return
+        n = len(pairs)
+        self._nobs = n
+        self._mean_x = math.fsum(x for x, _ in pairs) / n
+        self._mean_y = math.fsum(y for _, y in pairs) / n
+        self._cxx = math.fsum((x - self._mean_x) ** 2 for x, _ in pairs)
+        self._cxy = math.fsum((x - self._mean_x) * (y - self._mean_y) for x, y in pairs)
+        self._cyy = math.fsum((y - self._mean_y) ** 2 for _, y in pairs)
+
+    @property
+    def value(self) -> tuple[float, float, float]:
+        if self._gaps or self._nobs < self.period or self._nobs < 3:
+            return NAN, NAN, NAN
+        if self._cxx <= FLAT_VARIANCE * self._nobs * self._mean_x * self._mean_x:
+            return NAN, NAN, NAN
+        beta = self._cxy / self._cxx
+        alpha = self._mean_y - beta * self._mean_x
+        ssr = max(self._cyy - beta * self._cxy, 0.0)
+        return beta, alpha, math.sqrt(ssr / (self._nobs - 2))
+
+    def snapshot(self) -> dict:
+        return {
+            "period": self.period,
+            "window": [list(pair) for pair in self._window],
+            "gaps": self._gaps,
+            "removals": self._removals,
+            "nobs": self._nobs,
+            "mean_x": self._mean_x,
+            "mean_y": self._mean_y,
+            "cxx": self._cxx,
+            "cxy": self._cxy,
+            "cyy": self._cyy,
+        }
+
+    def restore(self, state: dict) -> None:
+        self.period = state["period"]
+        self._window = deque(tuple(pair) for pair in state["window"])
+        self._gaps = state["gaps"]
+        self._removals = state["removals"]
+        self._nobs = state["nobs"]
+        self._mean_x = state["mean_x"]
+        self._mean_y = state["mean_y"]
+        self._cxx = state["cxx"]
+        self._cxy = state["cxy"]
+        self._cyy = state["cyy"]
+
+
+class KalmanRegression:
+    """Kalman filter estimate of y = alpha + beta * x whose (beta, alpha)
+    follow a random walk with per-bar variance delta / (1 - delta).
+
+    update(x, y) returns (beta, error, error_std): the hedge ratio bar's y
+    was forecast with, the forecast error and the std the filter expected
+    for it, so error / error_std is the spread's z-score. The first warmup
+    observations return NaN while the estimate settles; NaN pairs are
+    skipped without updating the state.
+    """
+
+    def __init__(self, delta: float, warmup: int = 0, obs_var: float = KALMAN_OBS_VAR):
+        self.delta = delta
+        self.warmup = warmup
+        self.obs_var = obs_var
+        self._beta = 0.0
+        self._alpha = 0.0
+        # State covariance [[p00, p01], [p01, p11]]
+        self._p00 = 0.0
+        self._p01 = 0.0
+        self._p11 = 0.0
+        self._nobs = 0
+
+    def update(self, x: float, y: float) -> tuple[float, float, float]:
+        if x != x or y != y:
+            return NAN, NAN, NAN
+        drift = self.delta / (1.0 - self.delta)
+        r00 = self._p00 + drift
+        r01 = self._p01
+        r11 = self._p11 + drift
+        # R @ h and h' @ R @ h for the observation vector h = (x, 1)
+        rh0 = r00 * x + r01
+        rh1 = r01 * x + r11
+        q = x * rh0 + rh1 + self.obs_var
+        beta = self._beta
+        error = y - (beta * x + self._alpha)
+        k0 = rh0 / q
+        k1 = rh1 / q
+        self._beta += k0 * error
+        self._alpha += k1 * error
+        self._p00 = r00 - k0 * rh0
+        self._p01 = r01 - k0 * rh1
+        self._p11 = r11 - k1 * rh1
+        self._nobs += 1
+        if self._nobs <= self.warmup:
+            return NAN, NAN, NAN
+        return beta, error, math.sqrt(q)
+
+    def snapshot(self) -> dict:
+        return {
+            "delta": self.delta,
+            "warmup": self.warmup,
+            "obs_var": self.obs_var,
+            "beta": self._beta,
+            "alpha": self._alpha,
+            "p00": self._p00,
+            "p01": self._p01,
+            "p11": self._p11,
+            "nobs": self._nobs,
+        }
+
+    def restore(self, state: dict) -> None:
+        self.delta = state["delta"]
+        self.warmup = state["warmup"]
+        self.obs_var = state["obs_var"]
+        self._beta = state["beta"]
+        self._alpha = state["alpha"]
+        self._p00 = state["p00"]
+        self._p01 = state["p01"]
+        self._p11 = state["p11"]
+        self._nobs = state["nobs"]
@@ -1,5 +1,6 @@
 import pandas as pd
 
+from app.indicators.cache import indicator_cache
 from app.indicators.moving_average import compute_ema
 
 
@@ -10,9 +11,9 @@ def compute_macd(
     signal_period: int = 9,
 ) -> tuple[pd.Series, pd.Series, pd.Series]:
     """Returns (macd_line, signal_line, histogram)."""
-    fast_ema = compute_ema(series, fast_period)
-    slow_ema = compute_ema(series, slow_period)
+    fast_ema = indicator_cache.compute(compute_ema, series, fast_period)
+    slow_ema = indicator_cache.compute(compute_ema, series, slow_period)
     macd_line = fast_ema - slow_ema
-    signal_line = compute_ema(macd_line, signal_period)
+    signal_line = indicator_cache.compute(compute_ema, macd_line, signal_period)
     histogram = macd_line - signal_line
     return macd_line, signal_line, histogram
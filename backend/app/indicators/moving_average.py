@@ -1,9 +1,102 @@
+import numpy as np
 import pandas as pd
 
 
 def compute_sma(series: pd.Series, period: int) -> pd.Series:
+    if _row_wise(series):
+        return _rolling_mean_frame(series, period)
     return series.rolling(window=period).mean()
 
 
 def compute_ema(series: pd.Series, period: int) -> pd.Series:
-    return series.ewm(span=period, adjust=False).mean()
+    return ewm_mean(series, com=(period - 1) / 2, adjust=False)
+
+
+def compute_rolling_std(series: pd.Series, period: int) -> pd.Series:
+    return series.rolling(window=period).std()
+
+
+def _row_wise(data: pd.Series | pd.DataFrame) -> bool:
+    """Whether data is a NaN-free frame, which the row-wise kernels below
+    handle. pandas runs its rolling and ewm kernels one column at a time,
+    which dominates on a frame of thousands of short columns (one per
+    symbol); stepping through the rows updates every column together,
+    using the kernels' own arithmetic so the results are identical."""
+    return isinstance(data, pd.DataFrame) and len(data) > 0 and not data.isna().to_numpy().any()
+
+
+def ewm_mean(
+    data: pd.Series | pd.DataFrame, com: float, adjust: bool = True, min_periods: int = 0
+) -> pd.Series | pd.DataFrame:
+    """data.ewm(com=com, adjust=adjust, min_periods=min_periods).mean(),
+    row-wise for NaN-free frames (see incremental.EWM for the kernel)."""
+    if not _row_wise(data):
+        return data.ewm(com=com, adjust=adjust, min_periods=min_periods).mean()
+
+    values = data.to_numpy(dtype=np.float64)
+    out = np.empty_like(values)
+    alpha = 1.0 / (1.0 + com)
+    new_wt = 1.0 if adjust else alpha
+    weighted = values[0].copy()
+    old_wt = np.ones(values.shape[1])
+    out[0] = weighted
+    for i in range(1, len(values)):
+        old_wt *= 1.0 - alpha
+        cur = values[i]
+        weighted = np.where(
+            weighted != cur, (old_wt * weighted + new_wt * cur) / (old_wt + new_wt), weighted
+        )
+        if adjust:
+            old_wt += new_wt
+        else:
+            old_wt[:] = 1.0
+        out[i] = weighted
+    out[: max(min_periods, 1) - 1] = np.nan
+    return pd.DataFrame(out, index=data.index, columns=data.columns)
+
+
+def _rolling_mean_frame(data: pd.DataFrame, period: int) -> pd.DataFrame:
+    """Rolling mean of every column of a NaN-free frame.
+
+    The Kahan-compensated sum of incremental.SMA, applied to all columns at
+    once: each row removes the value leaving the window, then adds the new
+    one. (Rolling std stays on pandas, whose variance kernel treats flat
+    windows in ways a row-wise Welford update does not reproduce exactly.)
+    """
+    values = data.to_numpy(dtype=np.float64)
+    n, width = values.shape
+    out = np.full((n, width), np.nan)
+    total = np.zeros(width)
+    comp_add = np.zeros(width)
+    comp_remove = np.zeros(width)
+    neg_ct = np.zeros(width, dtype=np.int64)
+    same_count = np.zeros(width, dtype=np.int64)
+    prev_value = np.full(width, np.nan)
+    nobs = 0
+    for i in range(n):
+        if i >= period:
+            old = values[i - period]
+            nobs -= 1
+            y = -old - comp_remove
+            t = total + y
+            comp_remove = t - total - y
+            total = t
+            neg_ct -= old < 0
+
+        cur = values[i]
+        nobs += 1
+        same_count = np.where(cur == prev_value, same_count + 1, 1)
+        prev_value = cur
+        y = cur - comp_add
+        t = total + y
+        comp_add = t - total - y
+        total = t
+        neg_ct += np.signbit(cur)
+
+        if nobs < period:
+            continue
+        result = total / nobs
+        result[(neg_ct == 0) & (result < 0)] = 0.0
+        result[(neg_ct == nobs) & (result > 0)] = 0.0
+        out[i] = np.where(same_count >= nobs, prev_value, result)
+    return pd.DataFrame(out, index=data.index, columns=data.columns)
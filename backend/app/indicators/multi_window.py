@@ -0,0 +1,176 @@
+"""Batch kernels that compute one indicator for many windows in one pass.
+
+Parameter sweeps evaluate the same moving average for dozens of periods.
+Instead of one rolling() or ewm() call per period, these kernels return a
+(bars x periods) float64 matrix whose column j is the indicator for
+periods[j], so sweep code can index a column per parameter set.
+
+Rolling means and stds come from cumulative sums and sums of squares:
+every window's sum is the difference of two prefix sums, so each extra
+period costs a few vector subtractions. The prefix sums restart every
+block of bars and are taken around the block's mean, which keeps their
+magnitude (and the cancellation in the variance) small on long histories.
+EMAs are evaluated for all spans together with the closed form of the
+adjust=False recurrence over blocks short enough that the decay powers
+stay finite.
+
+Results match compute_sma, compute_rolling_std and compute_ema to within
+floating-point rounding, not bit for bit. The rolling std carries an
+absolute error of roughly machine epsilon times the block's spread, so
+windows whose std is many orders of magnitude below that are only
+approximately right. Constant windows are exact: their mean is the
+repeated value and their std is 0 (pandas' own rolling std can leave a
+residue there for short windows).
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.indicators.moving_average import compute_ema
+
+# Bars per prefix-sum block, as a multiple of the longest window
+BLOCK_WINDOWS = 8
+MIN_BLOCK = 4096
+
+# Largest power of ten the EMA decay factors may reach within one block
+EMA_MAX_EXPONENT = 100
+MAX_EMA_BLOCK = 4096
+
+
+def _values(series: pd.Series | np.ndarray) -> np.ndarray:
+    return np.asarray(series, dtype=np.float64)
+
+
+def _periods(periods: Sequence[int]) -> np.ndarray:
+    out = np.asarray(periods, dtype=np.int64)
+    if out.ndim != 1:
+        raise ValueError("periods must be a flat sequence")
+    if len(out) and out.min() < 1:
+        raise ValueError("periods must be positive")
+    return out
+
+
+def compute_rolling_moments_matrix(
+    series: pd.Series | np.ndarray, periods: Sequence[int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Rolling mean and sample std (ddof=1) for every period.
+
+    Returns (mean, std), both (len(series), len(periods)). Rows before a
+    window is full, and windows containing NaN, are NaN, as with
+    series.rolling(period).
+    """
+    x = _values(series)
+    periods = _periods(periods)
+    n, k = len(x), len(periods)
+    # Column-major, so filling one period's column writes contiguous memory
+    mean = np.full((n, k), np.nan, order="F")
+    std = np.full((n, k), np.nan, order="F")
+    if n == 0 or k == 0:
+        return mean, std
+
+    longest = int(periods.max())
+    block = max(MIN_BLOCK, BLOCK_WINDOWS * longest)
+    missing = np.isnan(x)
+    any_missing = bool(missing.any())
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        lo = max(0, start - longest + 1)
+        gap = missing[lo:stop]
+        segment = x[lo:stop]
+        ref = segment[~gap].mean() if not gap.all() else 0.0
+        centered = np.where(gap, 0.0, segment - ref)
+
+        size = stop - lo + 1
+        sums = np.zeros(size)
+        np.cumsum(centered, out=sums[1:])
+        squares = np.zeros(size)
+        np.cumsum(centered * centered, out=squares[1:])
+        # Runs of repeated values, so constant windows get exactly their value
+        # as mean and 0 as std rather than the rounding left over in the sums
+        repeats = np.zeros(size, dtype=np.int64)
+        np.cumsum(segment[1:] == segment[:-1], out=repeats[2:])
+        if any_missing:
+            gaps = np.zeros(size, dtype=np.int64)
+            np.cumsum(gap, out=gaps[1:])
+
+        for j, p in enumerate(periods):
+            first = max(start, p - 1)
+            if first >= stop:
+                continue
+            # The window ending at bar t is segment[t - lo - p + 1 : t - lo + 1],
+            # so its sum is sums[t - lo + 1] - sums[t - lo + 1 - p]
+            a, b = first - lo + 1, stop - lo + 1
+            window_sum = sums[a:b] - sums[a - p : b - p]
+            col_mean = window_sum / p
+            flat = repeats[a:b] - repeats[a - p + 1 : b - p + 1] == p - 1
+            if p > 1:
+                var = squares[a:b] - squares[a - p : b - p]
+                var -= window_sum * col_mean
+                var /= p - 1
+                var[flat] = 0.0
+                std[first:stop, j] = np.sqrt(np.maximum(var, 0.0, out=var), out=var)
+            col_mean += ref
+            col_mean[flat] = segment[a - 1 : b - 1][flat]
+            mean[first:stop, j] = col_mean
+            if any_missing:
+                has_gap = gaps[a:b] != gaps[a - p : b - p]
+                mean[first:stop, j][has_gap] = np.nan
+                std[first:stop, j][has_gap] = np.nan
+    return mean, std
+
+
+def compute_sma_matrix(series: pd.Series | np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    """compute_sma for every period, as a (bars x periods) matrix."""
+    return compute_rolling_moments_matrix(series, periods)[0]
+
+
+def compute_rolling_std_matrix(series: pd.Series | np.ndarray, periods: Sequence[int]) -> np.ndarray:
+    """compute_rolling_std for every period, as a (bars x periods) matrix."""
+    return compute_rolling_moments_matrix(series, periods)[1]
+
+
+def compute_ema_matrix(series: pd.Series | np.ndarray, spans: Sequence[int]) -> np.ndarray:
+    """compute_ema for every span, as a (bars x spans) matrix.
+
+    With alpha = 2 / (span + 1) and decay b = 1 - alpha, the recurrence
+    y[t] = b * y[t-1] + alpha * x[t] unrolls within a block starting after
+    bar s to y[s+i] = b^(i+1) * y[s] + b^i * sum(alpha * b^-m * x[s+1+m], m <= i),
+    which is one cumulative sum per block for all spans at once.
+    """
+    x = _values(series)
+    spans = _periods(spans)
+    n, k = len(x), len(spans)
+    out = np.empty((n, k))
+    if n == 0 or k == 0:
+        return out
+    if np.isnan(x).any():
+        # pandas carries NaNs through the weights; defer to it per span
+        for j, span in enumerate(spans):
+            out[:, j] = compute_ema(pd.Series(x), int(span)).to_numpy()
+        return out
+
+    # Span 1 has zero decay (the EMA is the series itself) and is filled in
+    # afterwards; it would otherwise force one-bar blocks on every span.
+    identity = spans == 1
+    alpha = 2.0 / (np.where(identity, 2, spans) + 1.0)
+    decay = 1.0 - alpha
+    block = int(min(MAX_EMA_BLOCK, max(1, EMA_MAX_EXPONENT / -np.log10(decay.min()))))
+    steps = np.arange(block, dtype=np.float64)[:, None]
+    carry = decay ** (steps + 1)
+    scale = decay**steps
+    weight = alpha * decay**-steps
+
+    out[0] = x[0]
+    prev = out[0]
+    for start in range(1, n, block):
+        stop = min(start + block, n)
+        m = stop - start
+        acc = np.cumsum(x[start:stop, None] * weight[:m], axis=0)
+        acc *= scale[:m]
+        acc += carry[:m] * prev
+        out[start:stop] = acc
+        prev = acc[-1]
+    out[:, identity] = x[:, None]
+    return out
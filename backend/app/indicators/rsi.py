@@ -1,11 +1,15 @@
 import pandas as pd
 
+from app.indicators.moving_average import ewm_mean
+
 
 def compute_rsi(series: pd.Series, period: int = 14) -> pd.Series:
     delta = series.diff()
     gain = delta.where(delta > 0, 0.0)
     loss = -delta.where(delta < 0, 0.0)
-    avg_gain = gain.ewm(alpha=1 / period, min_periods=period).mean()
-    avg_loss = loss.ewm(alpha=1 / period, min_periods=period).mean()
+    # The center of mass pandas derives from Wilder's alpha = 1/period
+    alpha = 1 / period
+    avg_gain = ewm_mean(gain, com=(1 - alpha) / alpha, min_periods=period)
+    avg_loss = ewm_mean(loss, com=(1 - alpha) / alpha, min_periods=period)
     rs = avg_gain / avg_loss
     return 100 - (100 / (1 + rs))
@@ -4,15 +4,20 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.backtest import router as backtest_router
+from app.api.screener import router as screener_router
 from app.api.simulation import router as simulation_router
 from app.api.stocks import router as stocks_router
 from app.api.strategies import router as strategies_router
 from app.api.ws import router as ws_router
 from app.config import settings
 from app.data.cache import CachedDataProvider
+from app.data.memory import bar_memory_cache
 from app.data.registry import registry
+from app.data.synthetic import SyntheticProvider
 from app.data.yahoo import YahooFinanceProvider
 from app.db.engine import async_session
+from app.engine.pool import shutdown_process_pool
+from app.engine.result_cache import result_cache
 
 
 @asynccontextmanager
@@ -24,10 +29,14 @@ async def lifespan(app: FastAPI):
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
-    yahoo = YahooFinanceProvider()
-    cached = CachedDataProvider(yahoo, async_session)
+    # HFT_DATA_PROVIDER=synthetic runs offline against generated bars
+    upstream = SyntheticProvider() if settings.data_provider == "synthetic" else YahooFinanceProvider()
+    cached = CachedDataProvider(upstream, async_session, memory=bar_memory_cache)
+    # Cached backtest results go stale when bars they were run on change
+    cached.add_store_listener(result_cache.invalidate_persisted)
     registry.register(cached, default=True)
     yield
+    shutdown_process_pool()
 
 
 app = FastAPI(title="HFT Trading Bot", version="0.1.0", lifespan=lifespan)
@@ -45,6 +54,7 @@ app.include_router(stocks_router)
 app.include_router(strategies_router)
 app.include_router(backtest_router)
 app.include_router(simulation_router)
+app.include_router(screener_router)
 app.include_router(ws_router)
 
 
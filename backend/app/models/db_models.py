@@ -41,6 +41,28 @@ class StockDataCache(Base):
     )
 
 
+class StockDataCoverage(Base):
+    """Time ranges of stock_data_cache fetched from upstream, per (symbol, interval).
+
+    ranges is a sorted list of disjoint [start, end] ISO timestamp pairs;
+    see app.data.coverage.
+    """
+
+    __tablename__ = "stock_data_coverage"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False)
+    interval: Mapped[str] = mapped_column(String(10), nullable=False)
+    ranges: Mapped[list] = mapped_column(JSONB, nullable=False)
+    refreshed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        UniqueConstraint("symbol", "interval", name="uq_stock_data_coverage"),
+    )
+
+
 class BacktestRun(Base):
     __tablename__ = "backtest_runs"
 
@@ -58,12 +80,31 @@ class BacktestRun(Base):
     equity_curve: Mapped[dict] = mapped_column(JSONB, nullable=True)
     trades: Mapped[dict] = mapped_column(JSONB, nullable=True)
     indicator_data: Mapped[dict] = mapped_column(JSONB, nullable=True)
+    result_format: Mapped[str] = mapped_column(String(10), nullable=False, default="rows")
+    cache_key: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
     duration_ms: Mapped[int] = mapped_column(Integer, nullable=True)
 
 
+class BacktestEquityChunk(Base):
+    """One chunk of a streamed backtest's equity curve, stored columnar."""
+
+    __tablename__ = "backtest_equity_chunks"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("backtest_runs.id", ondelete="CASCADE"), nullable=False
+    )
+    seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    data: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("run_id", "seq", name="uq_backtest_equity_chunks"),
+    )
+
+
 class SimulationSession(Base):
     __tablename__ = "simulation_sessions"
 
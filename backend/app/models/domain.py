@@ -73,6 +73,16 @@ class StrategyInfo(BaseModel):
     category: str
 
 
+class ExecutionMode(str, Enum):
+    VECTORIZED = "vectorized"
+    REFERENCE = "reference"  # bar-by-bar through SimulatedBroker
+
+
+class ResultFormat(str, Enum):
+    ROWS = "rows"  # lists of per-point dicts
+    COLUMNAR = "columnar"  # one timestamp array plus parallel value arrays
+
+
 class BacktestRequest(BaseModel):
     symbols: list[str]
     strategy_name: str
@@ -82,25 +92,202 @@ class BacktestRequest(BaseModel):
     interval: str = "1d"
     initial_cash: float = 100000.0
     trading_fee_pct: float = 1.0  # percentage per trade, default 1%
+    execution_mode: ExecutionMode = ExecutionMode.VECTORIZED
+    multi_asset: bool = False  # trade every symbol from one shared cash balance
+    result_format: ResultFormat = ResultFormat.ROWS
 
 
 class BacktestMetrics(BaseModel):
     total_pnl: float
     return_pct: float
     sharpe_ratio: float
+    sortino_ratio: float = 0.0
+    calmar_ratio: float = 0.0
     max_drawdown_pct: float
+    max_drawdown_duration_days: float = 0.0  # peak to the bar that regains it, or to the last bar
     win_rate: float
     profit_factor: float
     total_trades: int
-    avg_trade_duration_days: float
+    avg_trade_duration_days: float  # mean entry-to-exit time of closed trades
 
 
 class BacktestResult(BaseModel):
     id: str
     metrics: BacktestMetrics
+    equity_curve: list[dict] | dict[str, list]
+    trades: list[dict] | dict[str, list]
+    indicator_data: dict
+    result_format: ResultFormat = ResultFormat.ROWS
+    duration_ms: int
+    cached: bool = False
+
+
+class ParamRange(BaseModel):
+    """Inclusive numeric range for a parameter sweep."""
+
+    start: float
+    stop: float
+    step: float = 1.0
+
+
+class SweepRequest(BaseModel):
+    symbols: list[str]
+    strategy_name: str
+    param_grid: dict[str, list[float | str] | ParamRange]
+    start_date: date
+    end_date: date
+    interval: str = "1d"
+    initial_cash: float = 100000.0
+    trading_fee_pct: float = 1.0
+    rank_by: str = "sharpe_ratio"
+    top_n: int | None = None
+
+
+class SweepEntry(BaseModel):
+    rank: int
+    params: dict
+    metrics: BacktestMetrics
+
+
+class SweepResult(BaseModel):
+    strategy_name: str
+    symbols: list[str]
+    total_combinations: int
+    rank_by: str
+    results: list[SweepEntry]
+    duration_ms: int
+
+
+class BatchStrategySpec(BaseModel):
+    strategy_name: str
+    params: dict = {}
+
+
+class BatchRequest(BaseModel):
+    symbols: list[str]
+    strategies: list[BatchStrategySpec]
+    start_date: date
+    end_date: date
+    interval: str = "1d"
+    initial_cash: float = 100000.0
+    trading_fee_pct: float = 1.0
+
+
+class BatchCell(BaseModel):
+    symbol: str
+    strategy_index: int  # position in BatchRequest.strategies
+    strategy_name: str
+    params: dict
+    metrics: BacktestMetrics | None
+    error: str | None = None
+
+
+class BatchResult(BaseModel):
+    symbols: list[str]
+    strategies: list[BatchStrategySpec]
+    results: list[BatchCell]  # symbol-major: all strategies for symbols[0] first
+    duration_ms: int
+
+
+class ScreenRequest(BaseModel):
+    strategy_name: str
+    params: dict = {}
+    interval: str = "1d"
+    symbols: list[str] | None = None  # None screens every cached symbol
+    lookback: int | None = None  # bars per symbol; defaults to a few indicator windows
+    as_of: datetime | None = None  # screen the bars up to this time instead of the latest
+    within_bars: int = 1  # report signals fired on any of the last within_bars bars
+    signal: int | None = None  # only 1 (buy) or -1 (sell) signals; None keeps both
+    include_all: bool = False  # also list symbols without a signal, for indicator values
+
+
+class ScreenEntry(BaseModel):
+    symbol: str
+    timestamp: datetime  # of the symbol's latest bar
+    close: float
+    signal: int  # latest non-zero signal within the window, else 0
+    signal_timestamp: datetime | None
+    indicators: dict[str, float | None]  # values at the latest bar
+
+
+class ScreenResult(BaseModel):
+    strategy_name: str
+    params: dict
+    interval: str
+    lookback: int
+    symbols_screened: int
+    insufficient_history: list[str]  # symbols with too few bars for the indicators' window
+    results: list[ScreenEntry]
+    duration_ms: int
+
+
+class WalkForwardRequest(BaseModel):
+    symbols: list[str]
+    strategy_name: str
+    param_grid: dict[str, list[float | str] | ParamRange]
+    start_date: date
+    end_date: date
+    interval: str = "1d"
+    initial_cash: float = 100000.0
+    trading_fee_pct: float = 1.0
+    train_bars: int = 252
+    test_bars: int = 63
+    anchored: bool = False  # expanding train window from the first bar
+    optimize_by: str = "sharpe_ratio"
+
+
+class WalkForwardWindow(BaseModel):
+    train_start: str
+    train_end: str
+    test_start: str
+    test_end: str
+    params: dict
+    train_metrics: BacktestMetrics
+    test_metrics: BacktestMetrics
+
+
+class WalkForwardResult(BaseModel):
+    strategy_name: str
+    symbols: list[str]
+    total_combinations: int
+    windows: list[WalkForwardWindow]
+    metrics: BacktestMetrics  # of the stitched out-of-sample run
     equity_curve: list[dict]
     trades: list[dict]
-    indicator_data: dict
+    duration_ms: int
+
+
+class MonteCarloRequest(BaseModel):
+    n_paths: int = 1000
+    block_size: int = 20  # bars per block for the return bootstrap
+    seed: int | None = None
+
+
+class DistributionSummary(BaseModel):
+    mean: float
+    std: float
+    min: float
+    max: float
+    p5: float
+    p25: float
+    p50: float
+    p75: float
+    p95: float
+
+
+class MonteCarloDistribution(BaseModel):
+    method: str  # "trade_resample" or "block_bootstrap"
+    n_paths: int
+    return_pct: DistributionSummary
+    max_drawdown_pct: DistributionSummary
+    sharpe_ratio: DistributionSummary
+    prob_loss: float
+
+
+class MonteCarloResult(BaseModel):
+    backtest_id: str
+    trade_resample: MonteCarloDistribution | None
+    block_bootstrap: MonteCarloDistribution | None
     duration_ms: int
 
 
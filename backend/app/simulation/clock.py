@@ -32,15 +32,24 @@ class SimulationClock:
             s = start or dt(2024, 1, 1)
             e = end or dt.now()
             bars = await provider.get_historical(symbols[0], s, e, interval)
-            for bar in bars:
+            # Further symbols (pairs_trading's second leg) ride along on the
+            # first symbol's bars, each at its latest close as of that bar
+            others = await asyncio.gather(
+                *(provider.get_historical(sym, s, e, interval) for sym in symbols[1:])
+            )
+            aligned = [other.close_asof(bars.timestamp).tolist() for other in others]
+            for i, (timestamp, close) in enumerate(zip(bars.datetimes(), bars.close.tolist())):
                 if self._stopped:
                     return
                 while self._paused:
                     if self._stopped:
                         return
                     await asyncio.sleep(0.1)
-                prices = {symbols[0]: bar.close}
-                yield bar.timestamp, prices
+                prices = {symbols[0]: close}
+                for sym, closes in zip(symbols[1:], aligned):
+                    if closes[i] == closes[i]:
+                        prices[sym] = closes[i]
+                yield timestamp, prices
                 await asyncio.sleep(1.0 / self.speed)
         else:
             # REALTIME mode - poll every second
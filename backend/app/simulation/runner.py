@@ -1,5 +1,6 @@
 import asyncio
 import logging
+from collections import deque
 from datetime import datetime
 from typing import Callable, Awaitable
 
@@ -15,7 +16,12 @@ logger = logging.getLogger(__name__)
 
 
 class SimulationRunner:
-    """Runs a strategy in an async loop driven by SimulationClock ticks."""
+    """Runs a strategy in an async loop driven by SimulationClock ticks.
+
+    Signals come from the strategy's on_bar when it has one, so each tick
+    costs O(1). Otherwise generate_signals runs over a trailing window of
+    strategy.warmup_bars(params) bars instead of the whole session.
+    """
 
     def __init__(
         self,
@@ -46,7 +52,10 @@ class SimulationRunner:
         self.end_date = end_date
 
         self._task: asyncio.Task | None = None
-        self._price_history: list[dict] = []
+        self._params = strategy.validate_params(params)
+        self._signal_state = strategy.init_state(self._params)
+        self._window: deque[dict] = deque(maxlen=strategy.warmup_bars(self._params))
+        self._last_price: float | None = None
         self._equity_curve: list[dict] = []
         self._tick_count = 0
         self.status = "pending"
@@ -77,33 +86,30 @@ class SimulationRunner:
             ):
                 self._tick_count += 1
 
-                # Accumulate price history for signal generation
                 primary_symbol = self.symbols[0]
                 price = prices.get(primary_symbol, 0.0)
-                self._price_history.append(
-                    {
-                        "timestamp": timestamp,
-                        "open": price,
-                        "high": price,
-                        "low": price,
-                        "close": price,
-                        "volume": 0,
-                    }
-                )
+                self._last_price = price
+                bar = {
+                    "timestamp": timestamp,
+                    "open": price,
+                    "high": price,
+                    "low": price,
+                    "close": price,
+                    "volume": 0,
+                }
+                if len(self.symbols) > 1:
+                    # Second leg for pairs_trading, as the backtester provides it
+                    bar["close_2"] = prices.get(self.symbols[1])
 
-                # Need enough bars for the strategy to compute indicators
                 signal = 0
-                if len(self._price_history) >= 2:
-                    df = pd.DataFrame(self._price_history)
-                    try:
-                        df = self.strategy.generate_signals(df, self.params)
-                        signal = int(df["signal"].iloc[-1])
-                    except Exception as e:
-                        logger.warning(
-                            "Signal generation error (tick %d): %s",
-                            self._tick_count,
-                            e,
-                        )
+                try:
+                    signal = self._next_signal(bar)
+                except Exception as e:
+                    logger.warning(
+                        "Signal generation error (tick %d): %s",
+                        self._tick_count,
+                        e,
+                    )
 
                 # Execute orders based on signal (position-aware)
                 fill = None
@@ -193,12 +199,21 @@ class SimulationRunner:
             self.status = "error"
             self.error = str(e)
 
+    def _next_signal(self, bar: dict) -> int:
+        if self._signal_state is not None:
+            return self.strategy.on_bar(self._signal_state, bar, self._params)
+        self._window.append(bar)
+        # Need enough bars for the strategy to compute indicators
+        if len(self._window) < 2:
+            return 0
+        df = self.strategy.generate_signals(pd.DataFrame(list(self._window)), self._params)
+        return int(df["signal"].iloc[-1])
+
     def get_state(self) -> dict:
         """Return current simulation state for REST queries."""
         prices = {}
-        if self._price_history:
-            last = self._price_history[-1]
-            prices = {self.symbols[0]: last["close"]}
+        if self._last_price is not None:
+            prices = {self.symbols[0]: self._last_price}
 
         equity = self.broker.portfolio.get_equity(prices) if prices else self.broker.portfolio.cash
         snapshot = self.broker.portfolio.snapshot(datetime.now(), prices)
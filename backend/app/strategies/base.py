@@ -1,9 +1,19 @@
 from abc import ABC, abstractmethod
 
+import numpy as np
 import pandas as pd
 
 from app.models.domain import StrategyParamDef
 
+# Bars of history per unit of lookback replayed ahead of each chunk in a
+# streaming backtest. Rolling windows need only 1x; exponential averages
+# (EMA span n, Wilder smoothing 1/n) decay below 1e-8 of their seed by 20x.
+WARMUP_MULTIPLE = 20
+
+# Parameter sets evaluated together by generate_signals_batch; bounds the
+# (bars x sets) float temporaries the vectorized implementations build.
+BATCH_COLUMNS = 256
+
 
 class Strategy(ABC):
     @property
@@ -34,6 +44,41 @@ class Strategy(ABC):
     def generate_signals(self, data: pd.DataFrame, params: dict) -> pd.DataFrame:
         """Add 'signal' column (1=buy, -1=sell, 0=hold) and indicator columns."""
 
+    def generate_signals_batch(self, data: pd.DataFrame, param_grid: list[dict]) -> np.ndarray:
+        """Signals for many parameter sets at once, as an int8 matrix.
+
+        Column j holds the 'signal' column generate_signals would produce
+        for param_grid[j]. data is neither modified nor copied. This default
+        runs generate_signals on a shallow copy per parameter set;
+        strategies override it to compute shared indicators once.
+        """
+        out = np.zeros((len(data), len(param_grid)), dtype=np.int8)
+        for j, params in enumerate(param_grid):
+            frame = self.generate_signals(data.copy(deep=False), params)
+            out[:, j] = frame["signal"].to_numpy()
+        return out
+
+    def generate_signals_panel(self, panel: dict[str, pd.DataFrame], params: dict) -> dict[str, pd.DataFrame]:
+        """generate_signals over many symbols at once.
+
+        panel maps bar fields ('close', ...) to frames with one row per bar
+        and one column per symbol. Returns the 'signal' and indicator
+        columns generate_signals would add, each as a frame of that shape.
+        This default runs generate_signals per symbol; strategies override
+        it with the same pandas operations applied column-wise.
+        """
+        columns: dict[str, dict[str, pd.Series]] = {}
+        first = next(iter(panel.values()))
+        for symbol in first.columns:
+            data = pd.DataFrame({field: frame[symbol] for field, frame in panel.items()})
+            out = self.generate_signals(data, params)
+            for name in out.columns.difference(list(panel), sort=False):
+                columns.setdefault(name, {})[symbol] = out[name]
+        return {
+            name: pd.DataFrame(by_symbol, index=first.index, columns=first.columns)
+            for name, by_symbol in columns.items()
+        }
+
     def validate_params(self, params: dict) -> dict:
         declared = {p.name: p for p in self.parameters()}
         validated = {}
@@ -56,3 +101,93 @@ class Strategy(ABC):
                     val = pdef.default
             validated[pname] = val
         return validated
+
+    def indicator_window(self, params: dict) -> int:
+        """Bars the strategy's indicators span before their first value.
+
+        Defaults to the largest int parameter, which covers strategies whose
+        int parameters are all window lengths.
+        """
+        params = self.validate_params(params)
+        windows = [params[p.name] for p in self.parameters() if p.type == "int"]
+        return max(windows, default=1)
+
+    def warmup_bars(self, params: dict) -> int:
+        """Bars of prior history needed to reproduce a bar's signal exactly:
+        WARMUP_MULTIPLE indicator windows, plus one bar for signals that
+        compare against the previous bar."""
+        return WARMUP_MULTIPLE * self.indicator_window(params) + 1
+
+    def init_state(self, params: dict) -> dict | None:
+        """Fresh per-run indicator state for on_bar, or None if the strategy
+        has no incremental path and callers should fall back to running
+        generate_signals over a trailing window of warmup_bars(params) bars.
+        params must already be validated.
+        """
+        return None
+
+    def on_bar(self, state: dict, bar: dict, params: dict) -> int:
+        """Signal (1, -1 or 0) for one new bar, advancing state in place.
+
+        bar holds the same fields as a row of the frame generate_signals
+        receives. Fed a series bar by bar from init_state(params), on_bar
+        returns the signal column generate_signals would produce for it.
+        """
+        raise NotImplementedError(f"{self.name} does not implement on_bar")
+
+
+def panel_frame(values: np.ndarray, like: pd.DataFrame) -> pd.DataFrame:
+    """values labelled with like's index and columns."""
+    return pd.DataFrame(values, index=like.index, columns=like.columns)
+
+
+def column_blocks(n_sets: int) -> list[slice]:
+    """Slices of at most BATCH_COLUMNS parameter sets covering range(n_sets)."""
+    return [slice(i, min(i + BATCH_COLUMNS, n_sets)) for i in range(0, n_sets, BATCH_COLUMNS)]
+
+
+def column_lookup(values) -> tuple[list, dict]:
+    """Distinct values in first-seen order and each value's position, for
+    computing an indicator once per distinct parameter value."""
+    distinct = list(dict.fromkeys(values))
+    return distinct, {v: i for i, v in enumerate(distinct)}
+
+
+def previous_rows(matrix: np.ndarray) -> np.ndarray:
+    """matrix shifted down one row with a NaN first row (shift(1) per column)."""
+    out = np.empty_like(matrix)
+    out[:1] = np.nan
+    out[1:] = matrix[:-1]
+    return out
+
+
+def threshold_crossings(values: np.ndarray, buy_level, sell_level) -> np.ndarray:
+    """1 where values cross above buy_level, -1 where they cross below
+    sell_level (a sell wins if both happen on one bar), else 0.
+
+    A cross compares each bar with the one before it: (prev <= level) &
+    (value > level). Levels broadcast against values' columns.
+    """
+    prev = previous_rows(values)
+    out = np.zeros(values.shape, dtype=np.int8)
+    out[(prev <= buy_level) & (values > buy_level)] = 1
+    out[(prev >= sell_level) & (values < sell_level)] = -1
+    return out
+
+
+def position_changes(position: np.ndarray) -> np.ndarray:
+    """+1/-1 where the position steps up/down from the previous bar, else 0."""
+    out = np.zeros(position.shape, dtype=np.int8)
+    out[1:] = np.sign(np.diff(position, axis=0))
+    return out
+
+
+def transition_signals(raw: np.ndarray) -> np.ndarray:
+    """1 on bars where raw (-1/0/1) becomes 1, -1 where it becomes -1, else 0."""
+    prev = np.empty_like(raw)
+    prev[:1] = 2  # shift(1) is NaN on the first bar, equal to neither
+    prev[1:] = raw[:-1]
+    out = np.zeros(raw.shape, dtype=np.int8)
+    out[(raw == 1) & (prev != 1)] = 1
+    out[(raw == -1) & (prev != -1)] = -1
+    return out
@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
 
 from app.indicators.bollinger import compute_bollinger_bands
+from app.indicators.incremental import BollingerBands
+from app.indicators.multi_window import compute_rolling_moments_matrix
 from app.models.domain import StrategyParamDef
-from app.strategies.base import Strategy
+from app.strategies.base import Strategy, column_blocks, column_lookup, panel_frame, transition_signals
 
 
 class BollingerStrategy(Strategy):
@@ -47,3 +50,44 @@ class BollingerStrategy(Strategy):
         data.loc[(raw == 1) & (raw.shift(1) != 1), "signal"] = 1
         data.loc[(raw == -1) & (raw.shift(1) != -1), "signal"] = -1
         return data
+
+    def generate_signals_batch(self, data: pd.DataFrame, param_grid: list[dict]) -> np.ndarray:
+        grid = [self.validate_params(p) for p in param_grid]
+        close = data["close"].to_numpy(dtype=np.float64)
+        periods, col = column_lookup(p["period"] for p in grid)
+        mean, std = compute_rolling_moments_matrix(close, periods)
+
+        out = np.empty((len(close), len(grid)), dtype=np.int8)
+        for block in column_blocks(len(grid)):
+            sets = grid[block]
+            cols = [col[p["period"]] for p in sets]
+            middle, width = mean[:, cols], std[:, cols] * np.array([p["num_std"] for p in sets])
+            raw = np.zeros(middle.shape, dtype=np.int8)
+            raw[close[:, None] <= middle - width] = 1
+            raw[close[:, None] >= middle + width] = -1
+            out[:, block] = transition_signals(raw)
+        return out
+
+    def generate_signals_panel(self, panel: dict[str, pd.DataFrame], params: dict) -> dict[str, pd.DataFrame]:
+        params = self.validate_params(params)
+        close = panel["close"]
+        middle, upper, lower = compute_bollinger_bands(close, params["period"], params["num_std"])
+        raw = np.zeros(close.shape, dtype=np.int8)
+        raw[close <= lower] = 1
+        raw[close >= upper] = -1
+        return {
+            "bb_middle": middle,
+            "bb_upper": upper,
+            "bb_lower": lower,
+            "signal": panel_frame(transition_signals(raw), close),
+        }
+
+    def init_state(self, params: dict) -> dict:
+        return {"bands": BollingerBands(params["period"], params["num_std"]), "raw": None}
+
+    def on_bar(self, state: dict, bar: dict, params: dict) -> int:
+        close = bar["close"]
+        _, upper, lower = state["bands"].update(close)
+        raw = -1 if close >= upper else (1 if close <= lower else 0)
+        prev, state["raw"] = state["raw"], raw
+        return raw if raw != 0 and raw != prev else 0
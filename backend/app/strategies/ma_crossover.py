@@ -1,8 +1,12 @@
+import numpy as np
 import pandas as pd
 
+from app.indicators.cache import indicator_cache
+from app.indicators.incremental import EMA, SMA
 from app.indicators.moving_average import compute_ema, compute_sma
+from app.indicators.multi_window import compute_ema_matrix, compute_sma_matrix
 from app.models.domain import StrategyParamDef
-from app.strategies.base import Strategy
+from app.strategies.base import Strategy, column_blocks, column_lookup, panel_frame, position_changes
 
 
 class MACrossoverStrategy(Strategy):
@@ -34,8 +38,8 @@ class MACrossoverStrategy(Strategy):
         close = data["close"]
         ma_fn = compute_sma if params["ma_type"] == "SMA" else compute_ema
 
-        data["sma_fast"] = ma_fn(close, params["fast_period"])
-        data["sma_slow"] = ma_fn(close, params["slow_period"])
+        data["sma_fast"] = indicator_cache.compute(ma_fn, close, params["fast_period"])
+        data["sma_slow"] = indicator_cache.compute(ma_fn, close, params["slow_period"])
 
         data["signal"] = 0
         data.loc[data["sma_fast"] > data["sma_slow"], "signal"] = 1
@@ -46,3 +50,46 @@ class MACrossoverStrategy(Strategy):
             lambda x: 1 if x > 0 else (-1 if x < 0 else 0)
         )
         return data
+
+    def generate_signals_batch(self, data: pd.DataFrame, param_grid: list[dict]) -> np.ndarray:
+        grid = [self.validate_params(p) for p in param_grid]
+        close = data["close"].to_numpy(dtype=np.float64)
+        averages, col = column_lookup(
+            (p["ma_type"], p[field]) for p in grid for field in ("fast_period", "slow_period")
+        )
+        ma = np.empty((len(close), len(averages)))
+        for ma_type, matrix_fn in (("SMA", compute_sma_matrix), ("EMA", compute_ema_matrix)):
+            cols = [i for i, (t, _) in enumerate(averages) if t == ma_type]
+            if cols:
+                ma[:, cols] = matrix_fn(close, [averages[i][1] for i in cols])
+
+        out = np.empty((len(close), len(grid)), dtype=np.int8)
+        for block in column_blocks(len(grid)):
+            sets = grid[block]
+            fast = ma[:, [col[p["ma_type"], p["fast_period"]] for p in sets]]
+            slow = ma[:, [col[p["ma_type"], p["slow_period"]] for p in sets]]
+            position = np.where(fast > slow, 1, np.where(fast <= slow, -1, 0))
+            out[:, block] = position_changes(position)
+        return out
+
+    def generate_signals_panel(self, panel: dict[str, pd.DataFrame], params: dict) -> dict[str, pd.DataFrame]:
+        params = self.validate_params(params)
+        close = panel["close"]
+        ma_fn = compute_sma if params["ma_type"] == "SMA" else compute_ema
+        fast = indicator_cache.compute(ma_fn, close, params["fast_period"])
+        slow = indicator_cache.compute(ma_fn, close, params["slow_period"])
+        position = np.where(fast > slow, 1, np.where(fast <= slow, -1, 0))
+        return {"sma_fast": fast, "sma_slow": slow, "signal": panel_frame(position_changes(position), close)}
+
+    def init_state(self, params: dict) -> dict:
+        ma = SMA if params["ma_type"] == "SMA" else EMA
+        return {"fast": ma(params["fast_period"]), "slow": ma(params["slow_period"]), "position": None}
+
+    def on_bar(self, state: dict, bar: dict, params: dict) -> int:
+        fast = state["fast"].update(bar["close"])
+        slow = state["slow"].update(bar["close"])
+        position = 1 if fast > slow else (-1 if fast <= slow else 0)
+        prev, state["position"] = state["position"], position
+        if prev is None or position == prev:
+            return 0
+        return 1 if position > prev else -1
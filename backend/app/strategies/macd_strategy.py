@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
 
+from app.indicators.incremental import MACD
 from app.indicators.macd import compute_macd
+from app.indicators.multi_window import compute_ema_matrix
 from app.models.domain import StrategyParamDef
-from app.strategies.base import Strategy
+from app.strategies.base import Strategy, column_blocks, column_lookup, panel_frame, threshold_crossings
 
 
 class MACDStrategy(Strategy):
@@ -45,3 +48,52 @@ class MACDStrategy(Strategy):
         # Sell: histogram crosses from positive to negative
         data.loc[(prev_hist >= 0) & (histogram < 0), "signal"] = -1
         return data
+
+    def generate_signals_batch(self, data: pd.DataFrame, param_grid: list[dict]) -> np.ndarray:
+        grid = [self.validate_params(p) for p in param_grid]
+        close = data["close"].to_numpy(dtype=np.float64)
+        spans, span_col = column_lookup(p[f] for p in grid for f in ("fast_period", "slow_period"))
+        ema = compute_ema_matrix(close, spans)
+
+        # One signal-line EMA matrix per distinct (fast, slow) MACD line
+        lines, col = column_lookup((p["fast_period"], p["slow_period"], p["signal_period"]) for p in grid)
+        histogram = np.empty((len(close), len(lines)))
+        for fast, slow in dict.fromkeys((f, s) for f, s, _ in lines):
+            macd_line = ema[:, span_col[fast]] - ema[:, span_col[slow]]
+            cols = [i for i, line in enumerate(lines) if line[:2] == (fast, slow)]
+            signal_line = compute_ema_matrix(macd_line, [lines[i][2] for i in cols])
+            histogram[:, cols] = macd_line[:, None] - signal_line
+
+        out = np.empty((len(close), len(grid)), dtype=np.int8)
+        for block in column_blocks(len(grid)):
+            hist = histogram[:, [col[p["fast_period"], p["slow_period"], p["signal_period"]] for p in grid[block]]]
+            out[:, block] = threshold_crossings(hist, 0.0, 0.0)
+        return out
+
+    def generate_signals_panel(self, panel: dict[str, pd.DataFrame], params: dict) -> dict[str, pd.DataFrame]:
+        params = self.validate_params(params)
+        close = panel["close"]
+        macd_line, signal_line, histogram = compute_macd(
+            close, params["fast_period"], params["slow_period"], params["signal_period"]
+        )
+        return {
+            "macd": macd_line,
+            "macd_signal": signal_line,
+            "macd_histogram": histogram,
+            "signal": panel_frame(threshold_crossings(histogram.to_numpy(), 0.0, 0.0), close),
+        }
+
+    def init_state(self, params: dict) -> dict:
+        return {
+            "macd": MACD(params["fast_period"], params["slow_period"], params["signal_period"]),
+            "histogram": float("nan"),
+        }
+
+    def on_bar(self, state: dict, bar: dict, params: dict) -> int:
+        _, _, histogram = state["macd"].update(bar["close"])
+        prev, state["histogram"] = state["histogram"], histogram
+        if prev <= 0 and histogram > 0:
+            return 1
+        if prev >= 0 and histogram < 0:
+            return -1
+        return 0
@@ -1,7 +1,12 @@
+import numpy as np
 import pandas as pd
 
+from app.indicators.cache import indicator_cache
+from app.indicators.incremental import SMA, RollingStd, divide
+from app.indicators.moving_average import compute_rolling_std, compute_sma
+from app.indicators.multi_window import compute_rolling_moments_matrix
 from app.models.domain import StrategyParamDef
-from app.strategies.base import Strategy
+from app.strategies.base import Strategy, column_blocks, column_lookup, panel_frame, transition_signals
 
 
 class MeanReversionStrategy(Strategy):
@@ -31,8 +36,8 @@ class MeanReversionStrategy(Strategy):
     def generate_signals(self, data: pd.DataFrame, params: dict) -> pd.DataFrame:
         params = self.validate_params(params)
         close = data["close"]
-        rolling_mean = close.rolling(window=params["lookback"]).mean()
-        rolling_std = close.rolling(window=params["lookback"]).std()
+        rolling_mean = indicator_cache.compute(compute_sma, close, params["lookback"])
+        rolling_std = indicator_cache.compute(compute_rolling_std, close, params["lookback"])
         data["z_score"] = (close - rolling_mean) / rolling_std
 
         # Raw position: 1 when z-score below entry, -1 when above exit
@@ -45,3 +50,43 @@ class MeanReversionStrategy(Strategy):
         data.loc[(raw == 1) & (raw.shift(1) != 1), "signal"] = 1
         data.loc[(raw == -1) & (raw.shift(1) != -1), "signal"] = -1
         return data
+
+    def generate_signals_batch(self, data: pd.DataFrame, param_grid: list[dict]) -> np.ndarray:
+        grid = [self.validate_params(p) for p in param_grid]
+        close = data["close"].to_numpy(dtype=np.float64)
+        lookbacks, col = column_lookup(p["lookback"] for p in grid)
+        mean, std = compute_rolling_moments_matrix(close, lookbacks)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            z_score = (close[:, None] - mean) / std
+
+        out = np.empty((len(close), len(grid)), dtype=np.int8)
+        for block in column_blocks(len(grid)):
+            sets = grid[block]
+            z = z_score[:, [col[p["lookback"]] for p in sets]]
+            raw = np.zeros(z.shape, dtype=np.int8)
+            raw[z <= np.array([p["entry_z"] for p in sets])] = 1
+            raw[z >= np.array([p["exit_z"] for p in sets])] = -1
+            out[:, block] = transition_signals(raw)
+        return out
+
+    def generate_signals_panel(self, panel: dict[str, pd.DataFrame], params: dict) -> dict[str, pd.DataFrame]:
+        params = self.validate_params(params)
+        close = panel["close"]
+        rolling_mean = indicator_cache.compute(compute_sma, close, params["lookback"])
+        rolling_std = indicator_cache.compute(compute_rolling_std, close, params["lookback"])
+        z_score = (close - rolling_mean) / rolling_std
+        raw = np.zeros(close.shape, dtype=np.int8)
+        raw[z_score <= params["entry_z"]] = 1
+        raw[z_score >= params["exit_z"]] = -1
+        return {"z_score": z_score, "signal": panel_frame(transition_signals(raw), close)}
+
+    def init_state(self, params: dict) -> dict:
+        lookback = params["lookback"]
+        return {"mean": SMA(lookback), "std": RollingStd(lookback), "raw": None}
+
+    def on_bar(self, state: dict, bar: dict, params: dict) -> int:
+        close = bar["close"]
+        z_score = divide(close - state["mean"].update(close), state["std"].update(close))
+        raw = -1 if z_score >= params["exit_z"] else (1 if z_score <= params["entry_z"] else 0)
+        prev, state["raw"] = state["raw"], raw
+        return raw if raw != 0 and raw != prev else 0
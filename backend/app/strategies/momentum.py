@@ -1,7 +1,11 @@
+from collections import deque
+
+import numpy as np
 import pandas as pd
 
+from app.indicators.incremental import divide
 from app.models.domain import StrategyParamDef
-from app.strategies.base import Strategy
+from app.strategies.base import Strategy, column_blocks, column_lookup, panel_frame, threshold_crossings
 
 
 class MomentumStrategy(Strategy):
@@ -40,3 +44,45 @@ class MomentumStrategy(Strategy):
         # Sell when momentum crosses below negative threshold
         data.loc[(prev_momentum >= -threshold) & (data["momentum_pct"] < -threshold), "signal"] = -1
         return data
+
+    def generate_signals_batch(self, data: pd.DataFrame, param_grid: list[dict]) -> np.ndarray:
+        grid = [self.validate_params(p) for p in param_grid]
+        close = data["close"]
+        lookbacks, col = column_lookup(p["lookback"] for p in grid)
+        momentum = np.column_stack([(close.pct_change(periods=n) * 100).to_numpy() for n in lookbacks])
+
+        out = np.empty((len(close), len(grid)), dtype=np.int8)
+        for block in column_blocks(len(grid)):
+            sets = grid[block]
+            threshold = np.array([p["threshold"] for p in sets])
+            out[:, block] = threshold_crossings(
+                momentum[:, [col[p["lookback"]] for p in sets]], threshold, -threshold
+            )
+        return out
+
+    def generate_signals_panel(self, panel: dict[str, pd.DataFrame], params: dict) -> dict[str, pd.DataFrame]:
+        params = self.validate_params(params)
+        close = panel["close"]
+        momentum = close.pct_change(periods=params["lookback"]) * 100
+        threshold = params["threshold"]
+        signal = threshold_crossings(momentum.to_numpy(), threshold, -threshold)
+        return {"momentum_pct": momentum, "signal": panel_frame(signal, close)}
+
+    def init_state(self, params: dict) -> dict:
+        return {"closes": deque(maxlen=params["lookback"] + 1), "prev": float("nan")}
+
+    def on_bar(self, state: dict, bar: dict, params: dict) -> int:
+        closes = state["closes"]
+        closes.append(bar["close"])
+        if len(closes) == closes.maxlen:
+            momentum = (divide(closes[-1], closes[0]) - 1) * 100
+        else:
+            momentum = float("nan")
+        prev, state["prev"] = state["prev"], momentum
+        threshold = params["threshold"]
+        signal = 0
+        if prev <= threshold and momentum > threshold:
+            signal = 1
+        if prev >= -threshold and momentum < -threshold:
+            signal = -1
+        return signal
@@ -1,5 +1,9 @@
+import numpy as np
 import pandas as pd
 
+from app.indicators.cache import indicator_cache
+from app.indicators.hedge import HEDGE_METHODS, compute_pair_spread
+from app.indicators.incremental import SMA, KalmanRegression, RollingOLS, RollingStd, divide
 from app.models.domain import StrategyParamDef
 from app.strategies.base import Strategy
 
@@ -15,7 +19,10 @@ class PairsTradingStrategy(Strategy):
 
     @property
     def description(self) -> str:
-        return "Trade the spread between two correlated stocks using z-score. Requires exactly 2 symbols."
+        return (
+            "Trade the spread between two correlated stocks using z-score, hedged by a rolling OLS "
+            "or Kalman-filtered hedge ratio. Requires exactly 2 symbols."
+        )
 
     @property
     def category(self) -> str:
@@ -26,28 +33,94 @@ class PairsTradingStrategy(Strategy):
             StrategyParamDef(name="lookback", label="Lookback Period", type="int", default=30, min=10, max=200),
             StrategyParamDef(name="entry_z", label="Entry Z-Score", type="float", default=2.0, min=0.5, max=4.0),
             StrategyParamDef(name="exit_z", label="Exit Z-Score", type="float", default=0.5, min=0.0, max=2.0),
+            StrategyParamDef(
+                name="hedge", label="Hedge Ratio", type="select", default="ols", options=list(HEDGE_METHODS)
+            ),
+            # Random-walk variance of the Kalman hedge ratio; larger adapts faster
+            StrategyParamDef(name="delta", label="Kalman Delta", type="float", default=1e-4, min=1e-7, max=0.1),
         ]
 
     def generate_signals(self, data: pd.DataFrame, params: dict) -> pd.DataFrame:
         """For pairs trading, data must have 'close' and 'close_2' columns.
-        Signals apply to the first symbol: 1 = buy stock1/sell stock2, -1 = reverse."""
+        Signals apply to the first symbol: 1 = buy stock1/sell stock2, -1 = reverse.
+
+        The spread is close - hedge_ratio * close_2 (less the fitted
+        intercept), with the hedge ratio from compute_pair_spread.
+        """
         params = self.validate_params(params)
 
         if "close_2" not in data.columns:
             data["signal"] = 0
             return data
 
-        spread = data["close"] - data["close_2"]
-        rolling_mean = spread.rolling(window=params["lookback"]).mean()
-        rolling_std = spread.rolling(window=params["lookback"]).std()
+        hedge_ratio, spread, spread_z = self._spread(data, params)
+        data["hedge_ratio"] = hedge_ratio
         data["spread"] = spread
-        data["spread_z"] = (spread - rolling_mean) / rolling_std
-
-        data["signal"] = 0
-        # Buy stock1 (sell stock2) when spread z-score drops below -entry_z
-        data.loc[data["spread_z"] <= -params["entry_z"], "signal"] = 1
-        # Sell stock1 (buy stock2) when spread z-score rises above entry_z
-        data.loc[data["spread_z"] >= params["entry_z"], "signal"] = -1
-        # Close position when z-score returns near zero
-        data.loc[data["spread_z"].abs() <= params["exit_z"], "signal"] = 0
+        data["spread_z"] = spread_z
+        data["signal"] = _signals(spread_z.to_numpy(), params)
         return data
+
+    def generate_signals_batch(self, data: pd.DataFrame, param_grid: list[dict]) -> np.ndarray:
+        grid = [self.validate_params(p) for p in param_grid]
+        out = np.zeros((len(data), len(grid)), dtype=np.int8)
+        if "close_2" not in data.columns:
+            return out
+
+        # One spread per distinct hedge model; the thresholds vary per column
+        spreads: dict[tuple, np.ndarray] = {}
+        for j, params in enumerate(grid):
+            key = _spread_key(params)
+            if key not in spreads:
+                spreads[key] = self._spread(data, params)[2].to_numpy()
+            out[:, j] = _signals(spreads[key], params)
+        return out
+
+    def _spread(self, data: pd.DataFrame, params: dict) -> tuple[pd.Series, pd.Series, pd.Series]:
+        return indicator_cache.compute(
+            compute_pair_spread, data[["close", "close_2"]], *_spread_key(params)
+        )
+
+    def init_state(self, params: dict) -> dict:
+        lookback = params["lookback"]
+        if params["hedge"] == "ols":
+            return {"ols": RollingOLS(lookback)}
+        if params["hedge"] == "kalman":
+            return {"kalman": KalmanRegression(params["delta"], warmup=lookback)}
+        return {"mean": SMA(lookback), "std": RollingStd(lookback)}
+
+    def on_bar(self, state: dict, bar: dict, params: dict) -> int:
+        close_2 = bar.get("close_2")
+        if close_2 is None:
+            return 0
+        close = bar["close"]
+        if "ols" in state:
+            beta, alpha, resid_std = state["ols"].update(close_2, close)
+            z_score = divide(close - alpha - beta * close_2, resid_std)
+        elif "kalman" in state:
+            _, error, error_std = state["kalman"].update(close_2, close)
+            z_score = divide(error, error_std)
+        else:
+            spread = close - close_2
+            z_score = divide(spread - state["mean"].update(spread), state["std"].update(spread))
+        if abs(z_score) <= params["exit_z"]:
+            return 0
+        if z_score >= params["entry_z"]:
+            return -1
+        return 1 if z_score <= -params["entry_z"] else 0
+
+
+def _spread_key(params: dict) -> tuple:
+    """compute_pair_spread's arguments after the pair; delta only matters to kalman."""
+    delta = params["delta"] if params["hedge"] == "kalman" else None
+    return params["lookback"], params["hedge"], delta
+
+
+def _signals(spread_z: np.ndarray, params: dict) -> np.ndarray:
+    signal = np.zeros(len(spread_z), dtype=np.int8)
+    # Buy stock1 (sell stock2) when the spread's z-score drops below -entry_z
+    signal[spread_z <= -params["entry_z"]] = 1
+    # Sell stock1 (buy stock2) when it rises above entry_z
+    signal[spread_z >= params["entry_z"]] = -1
+    # Close the position when the z-score returns near zero
+    signal[np.abs(spread_z) <= params["exit_z"]] = 0
+    return signal
@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
 
+from app.indicators.cache import indicator_cache
+from app.indicators.incremental import RSI
 from app.indicators.rsi import compute_rsi
 from app.models.domain import StrategyParamDef
-from app.strategies.base import Strategy
+from app.strategies.base import Strategy, column_blocks, column_lookup, panel_frame, threshold_crossings
 
 
 class RSIStrategy(Strategy):
@@ -31,7 +34,7 @@ class RSIStrategy(Strategy):
 
     def generate_signals(self, data: pd.DataFrame, params: dict) -> pd.DataFrame:
         params = self.validate_params(params)
-        data["rsi"] = compute_rsi(data["close"], params["period"])
+        data["rsi"] = indicator_cache.compute(compute_rsi, data["close"], params["period"])
 
         data["signal"] = 0
         prev_rsi = data["rsi"].shift(1)
@@ -40,3 +43,43 @@ class RSIStrategy(Strategy):
         # Sell: RSI crosses below overbought from above
         data.loc[(prev_rsi >= params["overbought"]) & (data["rsi"] < params["overbought"]), "signal"] = -1
         return data
+
+    def generate_signals_batch(self, data: pd.DataFrame, param_grid: list[dict]) -> np.ndarray:
+        grid = [self.validate_params(p) for p in param_grid]
+        close = data["close"]
+        periods, col = column_lookup(p["period"] for p in grid)
+        rsi = np.column_stack([indicator_cache.compute(compute_rsi, close, n).to_numpy() for n in periods])
+
+        out = np.empty((len(close), len(grid)), dtype=np.int8)
+        for block in column_blocks(len(grid)):
+            sets = grid[block]
+            out[:, block] = threshold_crossings(
+                rsi[:, [col[p["period"]] for p in sets]],
+                np.array([p["oversold"] for p in sets]),
+                np.array([p["overbought"] for p in sets]),
+            )
+        return out
+
+    def generate_signals_panel(self, panel: dict[str, pd.DataFrame], params: dict) -> dict[str, pd.DataFrame]:
+        params = self.validate_params(params)
+        close = panel["close"]
+        rsi = indicator_cache.compute(compute_rsi, close, params["period"])
+        signal = threshold_crossings(rsi.to_numpy(), params["oversold"], params["overbought"])
+        return {"rsi": rsi, "signal": panel_frame(signal, close)}
+
+    def indicator_window(self, params: dict) -> int:
+        # overbought/oversold are levels, not windows
+        return self.validate_params(params)["period"]
+
+    def init_state(self, params: dict) -> dict:
+        return {"rsi": RSI(params["period"]), "prev": float("nan")}
+
+    def on_bar(self, state: dict, bar: dict, params: dict) -> int:
+        rsi = state["rsi"].update(bar["close"])
+        prev, state["prev"] = state["prev"], rsi
+        signal = 0
+        if prev <= params["oversold"] and rsi > params["oversold"]:
+            signal = 1
+        if prev >= params["overbought"] and rsi < params["overbought"]:
+            signal = -1
+        return signal
@@ -0,0 +1,231 @@
+"""Backtester throughput benchmarks over synthetic GBM bars.
+
+    python -m tests.benchmarks.run                      # 1k, 100k, 10M bars
+    python -m tests.benchmarks.run --sizes 1000 100000
+    python -m tests.benchmarks.run --compare tests/benchmarks/baseline.json
+    python -m tests.benchmarks.run --write tests/benchmarks/baseline.json
+
+Run from backend/. Each case reports the best of several repeats. Cases
+whose estimated peak memory exceeds what the machine has free are recorded
+as skipped rather than run.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from app.data.synthetic import SyntheticProvider, synthetic_frame
+from app.engine.backtester import BacktestEngine, execute_frame, fills_from_execution
+from app.engine.metrics import compute_metrics
+from app.indicators.cache import indicator_cache
+from app.models.domain import BacktestRequest, ResultFormat
+from app.strategies.registry import strategy_registry
+
+DEFAULT_SIZES = [1_000, 100_000, 10_000_000]
+INTERVAL = "1m"
+SEED = 42
+ENGINE_STRATEGY = "ma_crossover"
+
+# Rough peak bytes per bar of each case, used to skip sizes that cannot fit.
+# Update these when a change moves a case's memory profile.
+BYTES_PER_BAR = {
+    "engine_run": 1800,
+    "compute_metrics": 360,
+    "generate_signals": 220,
+    "serialize": 1800,
+}
+
+
+def available_memory() -> int:
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return 2**34
+
+
+def repeats_for(n_bars: int) -> int:
+    return max(1, min(5, 1_000_000 // max(n_bars, 1)))
+
+
+def best_of(fn: Callable[[], object], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        # Repeats would otherwise be served from the indicator cache
+        indicator_cache.clear()
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _request(n_bars: int, result_format: ResultFormat = ResultFormat.ROWS) -> BacktestRequest:
+    # SyntheticProvider(max_bars=n) trims the range to exactly n one-minute bars
+    start = date(2000, 1, 1)
+    return BacktestRequest(
+        symbols=["BENCH", "BENCH2"],
+        strategy_name=ENGINE_STRATEGY,
+        params={},
+        start_date=start,
+        end_date=start + timedelta(days=n_bars // 1440 + 1),
+        interval=INTERVAL,
+        result_format=result_format,
+    )
+
+
+def bench_engine_run(n_bars: int) -> float:
+    engine = BacktestEngine(SyntheticProvider(seed=SEED, max_bars=n_bars))
+    request = _request(n_bars)
+    strategy = strategy_registry.get(ENGINE_STRATEGY)
+    return best_of(lambda: asyncio.run(engine.run(request, strategy)), repeats_for(n_bars))
+
+
+def bench_compute_metrics(n_bars: int) -> float:
+    df = strategy_registry.get(ENGINE_STRATEGY).generate_signals(
+        synthetic_frame(n_bars, seed=SEED, interval=INTERVAL), {}
+    )
+    ex = execute_frame(df, 100000.0, 1.0)
+    fills = fills_from_execution(ex, df["timestamp"].iloc[ex.fill_index].tolist(), "BENCH")
+    equity = np.round(ex.equity, 2)
+    timestamps = df["timestamp"]
+    return best_of(
+        lambda: compute_metrics(equity, fills, 100000.0, INTERVAL, timestamps), repeats_for(n_bars)
+    )
+
+
+def bench_generate_signals(n_bars: int, strategy_name: str) -> float:
+    base = synthetic_frame(n_bars, seed=SEED, interval=INTERVAL)
+    if strategy_name == "pairs_trading":
+        base["close_2"] = synthetic_frame(n_bars, symbol="SYN2", seed=SEED, interval=INTERVAL)["close"]
+    strategy = strategy_registry.get(strategy_name)
+    # generate_signals adds columns in place, so each repeat gets a fresh copy
+    frames = [base.copy() for _ in range(repeats_for(n_bars))]
+    del base
+    return best_of(lambda: strategy.generate_signals(frames.pop(), {}), len(frames))
+
+
+def bench_serialize(n_bars: int, result_format: ResultFormat) -> float:
+    engine = BacktestEngine(SyntheticProvider(seed=SEED, max_bars=n_bars))
+    request = _request(n_bars, result_format)
+    result = asyncio.run(engine.run(request, strategy_registry.get(ENGINE_STRATEGY)))
+    return best_of(result.model_dump_json, repeats_for(n_bars))
+
+
+def cases() -> list[tuple[str, str, Callable[[int], float]]]:
+    """(case name, memory class, benchmark) for every case."""
+    out = [
+        ("engine_run", "engine_run", bench_engine_run),
+        ("compute_metrics", "compute_metrics", bench_compute_metrics),
+    ]
+    for strategy in strategy_registry.all:
+        out.append((
+            f"generate_signals[{strategy.name}]",
+            "generate_signals",
+            lambda n, name=strategy.name: bench_generate_signals(n, name),
+        ))
+    for fmt in ResultFormat:
+        out.append((
+            f"serialize[{fmt.value}]",
+            "serialize",
+            lambda n, fmt=fmt: bench_serialize(n, fmt),
+        ))
+    return out
+
+
+def run(sizes: list[int], only: str | None = None) -> dict:
+    results: dict[str, dict[str, dict]] = {}
+    for name, memory_class, bench in cases():
+        if only and only not in name:
+            continue
+        results[name] = {}
+        for n in sizes:
+            needed = BYTES_PER_BAR[memory_class] * n
+            free = available_memory()
+            if needed > free * 0.9:
+                entry = {"skipped": f"needs ~{needed / 2**30:.1f} GiB, {free / 2**30:.1f} GiB free"}
+            else:
+                seconds = bench(n)
+                entry = {"seconds": round(seconds, 6), "bars_per_sec": round(n / seconds) if seconds else None}
+            results[name][str(n)] = entry
+            print(f"{name:40s} {n:>10d}  {_describe(entry)}", flush=True)
+    return {"environment": environment(), "results": results}
+
+
+def git_commit() -> str | None:
+    """The checked-out commit, so a baseline records which tree it measured."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def environment() -> dict:
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _describe(entry: dict) -> str:
+    if "skipped" in entry:
+        return f"skipped ({entry['skipped']})"
+    return f"{entry['seconds']:.4f}s  {entry['bars_per_sec']:,} bars/s"
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Cases that got slower than threshold x their baseline time."""
+    regressions = []
+    for name, by_size in current["results"].items():
+        for size, entry in by_size.items():
+            base = baseline.get("results", {}).get(name, {}).get(size, {})
+            if "seconds" not in entry or "seconds" not in base or base["seconds"] <= 0:
+                continue
+            ratio = entry["seconds"] / base["seconds"]
+            flag = "  REGRESSION" if ratio > threshold else ""
+            print(f"{name:40s} {size:>10s}  {ratio:6.2f}x baseline{flag}")
+            if ratio > threshold:
+                regressions.append(f"{name}@{size}: {ratio:.2f}x")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", help="run only cases whose name contains this")
+    parser.add_argument("--write", type=Path, help="write results as JSON to this path")
+    parser.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+
+    current = run(args.sizes, args.only)
+    if args.write:
+        args.write.write_text(json.dumps(current, indent=2) + "\n")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        print(f"Baseline from commit {baseline['environment'].get('commit') or 'unknown'}")
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print("Regressions:", ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
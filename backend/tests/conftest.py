@@ -0,0 +1,8 @@
+import pytest
+
+from app.data.synthetic import SyntheticProvider
+
+
+@pytest.fixture
+def provider() -> SyntheticProvider:
+    return SyntheticProvider(seed=7, volatility=0.3)
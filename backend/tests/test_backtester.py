@@ -0,0 +1,135 @@
+import asyncio
+from datetime import date
+
+import numpy as np
+import pytest
+
+from app.data.bars import BarSeries
+from app.data.synthetic import SyntheticProvider, synthetic_frame
+from app.engine.backtester import BacktestEngine, rows_from_columns
+from app.engine.execution import execute_signal_matrix
+from app.models.domain import BacktestRequest, ExecutionMode, ResultFormat
+from app.strategies.registry import strategy_registry
+
+
+def _run(provider, strategy_name: str, mode: ExecutionMode, **overrides):
+    request = BacktestRequest(
+        symbols=["AAA", "BBB"],
+        strategy_name=strategy_name,
+        params={},
+        start_date=date(2020, 1, 1),
+        end_date=date(2023, 1, 1),
+        execution_mode=mode,
+        **overrides,
+    )
+    engine = BacktestEngine(provider)
+    return asyncio.run(engine.run(request, strategy_registry.get(strategy_name)))
+
+
+@pytest.mark.parametrize("strategy_name", [s.name for s in strategy_registry.all])
+@pytest.mark.parametrize("fee", [0.0, 1.0])
+def test_vectorized_matches_reference(provider, strategy_name, fee):
+    ref = _run(provider, strategy_name, ExecutionMode.REFERENCE, trading_fee_pct=fee)
+    vec = _run(provider, strategy_name, ExecutionMode.VECTORIZED, trading_fee_pct=fee)
+
+    assert vec.trades == ref.trades
+    assert vec.equity_curve == ref.equity_curve
+    assert vec.metrics == ref.metrics
+
+
+def test_vectorized_skips_unaffordable_buys(provider):
+    # 10% of $50 never buys a whole share of a ~$100 stock
+    ref = _run(provider, "rsi", ExecutionMode.REFERENCE, initial_cash=50.0)
+    vec = _run(provider, "rsi", ExecutionMode.VECTORIZED, initial_cash=50.0)
+
+    assert ref.trades == vec.trades == []
+    assert vec.equity_curve == ref.equity_curve
+
+
+@pytest.mark.parametrize("strategy_name", ["bollinger", "macd"])
+def test_columnar_result_decodes_to_rows(provider, strategy_name):
+    rows = _run(provider, strategy_name, ExecutionMode.VECTORIZED)
+    columnar = _run(provider, strategy_name, ExecutionMode.VECTORIZED, result_format=ResultFormat.COLUMNAR)
+
+    assert columnar.result_format == ResultFormat.COLUMNAR
+    assert rows_from_columns(columnar.equity_curve) == rows.equity_curve
+    assert rows_from_columns(columnar.trades) == rows.trades
+    table = columnar.indicator_data
+    assert set(table["series"]) == set(rows.indicator_data)
+    for name, values in table["series"].items():
+        assert rows.indicator_data[name] == rows_from_columns({"timestamp": table["timestamp"], "value": values})
+    assert columnar.metrics == rows.metrics
+
+
+class _FixedProvider(SyntheticProvider):
+    """Serves preset bars per symbol whatever the requested range."""
+
+    def __init__(self, bars: dict[str, BarSeries]):
+        super().__init__()
+        self._bars = bars
+
+    async def get_historical(self, symbol, start, end, interval="1d"):
+        return self._bars[symbol]
+
+
+def test_signal_matrix_shares_cash_and_sells_before_buys():
+    nan = np.nan
+    close = np.array([[10.0, 20.0], [12.0, nan], [15.0, 25.0], [nan, 30.0]])
+    signal = np.array([[0, 1], [0, -1], [1, -1], [0, 0]])
+
+    ex = execute_signal_matrix(close, signal, 1000.0, fee_pct=0.0, slippage_bps=0.0, position_size_pct=0.5)
+
+    # Bar 0 buys 25 B for 500. Bar 1's sell is ignored (B did not trade).
+    # Bar 2 sells B for 625 first, so the A buy is sized from 1125: 37 A
+    # for 555. Bar 3 values A at its last traded price.
+    assert ex.fill_index.tolist() == [0, 2, 2]
+    assert ex.fill_column.tolist() == [1, 1, 0]
+    assert ex.fill_quantity.tolist() == [25, 25, 37]
+    assert ex.fill_pnl[1] == 125.0
+    np.testing.assert_allclose(ex.cash, [500, 500, 570, 570])
+    np.testing.assert_allclose(ex.equity, [1000, 1000, 1125, 1125])
+    assert ex.quantity.tolist() == [[0, 25], [0, 25], [37, 0], [37, 0]]
+
+
+def test_portfolio_run_outer_joins_symbols():
+    df = synthetic_frame(400, symbol="AAA", seed=7, volatility=0.3)
+    bars = BarSeries.from_frame(df)
+    gappy = BarSeries.from_frame(synthetic_frame(400, symbol="BBB", seed=7, volatility=0.3))
+    gappy = gappy[np.arange(400) % 3 != 0][10:]
+    engine = BacktestEngine(_FixedProvider({"AAA": bars, "BBB": gappy}))
+
+    def run(symbols, multi_asset):
+        request = BacktestRequest(
+            symbols=symbols,
+            strategy_name="rsi",
+            params={},
+            start_date=date(2000, 1, 1),
+            end_date=date(2002, 1, 1),
+            multi_asset=multi_asset,
+        )
+        return asyncio.run(engine.run(request, strategy_registry.get("rsi")))
+
+    single = run(["AAA"], False)
+    alone = run(["AAA"], True)
+    both = run(["AAA", "BBB"], True)
+
+    # One symbol from shared cash is the plain single-symbol run
+    assert [p["equity"] for p in alone.equity_curve] == [p["equity"] for p in single.equity_curve]
+    assert alone.trades == single.trades
+    assert len(both.equity_curve) == 400
+    assert all(np.isfinite(p["equity"]) for p in both.equity_curve)
+    assert {t["symbol"] for t in both.trades} == {"AAA", "BBB"}
+
+
+def test_pairs_frame_aligns_second_leg_as_of_timestamp():
+    bars = BarSeries.from_frame(synthetic_frame(10, symbol="AAA"))
+    other = bars[[2, 3, 6]]
+    engine = BacktestEngine(_FixedProvider({"AAA": bars, "BBB": other}))
+
+    df = asyncio.run(engine.load_frame(
+        ["AAA", "BBB"], date(2000, 1, 1), date(2000, 1, 11), "1d", strategy_registry.get("pairs_trading")
+    ))
+
+    expected = other.close[[0, 0, 0, 1, 1, 1, 2, 2, 2, 2]]
+    expected[:2] = np.nan
+    np.testing.assert_array_equal(df["close_2"].to_numpy(), expected)
@@ -0,0 +1,30 @@
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app.data.bars import BarSeries
+from app.data.synthetic import synthetic_frame
+
+
+def test_bar_series_round_trips_and_slices_by_time():
+    df = synthetic_frame(10, seed=5)
+    bars = BarSeries.from_frame(df)
+
+    assert bars.timestamp.dtype == np.int64 and bars.volume.dtype == np.int64
+    assert BarSeries.from_bars(bars.to_bars()) == bars
+    assert bars.to_frame().equals(df.astype({"timestamp": "datetime64[ns, UTC]"}))
+    window = bars.between(datetime(2000, 1, 3), datetime(2000, 1, 5, tzinfo=timezone.utc))
+    assert window == bars[2:5]
+    assert BarSeries.concat([bars[:3], bars[3:]]) == bars
+
+
+def test_bar_series_merge_orders_and_drops_repeated_timestamps():
+    bars = BarSeries.from_frame(synthetic_frame(20, seed=7))
+    later = BarSeries.from_frame(synthetic_frame(10, start=datetime(2000, 1, 16), seed=8))
+
+    merged = BarSeries.merge([bars[5:15], later, bars[:8]])
+
+    assert len(merged) == 25
+    assert (np.diff(merged.timestamp) == 86_400 * 10**9).all()
+    assert merged[:15] == bars[:15]
+    assert merged[15:] == later
@@ -0,0 +1,66 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.data.synthetic import SyntheticProvider
+from app.engine.backtester import BacktestEngine
+from app.engine.batch import run_batch
+from app.engine.pool import shutdown_process_pool
+from app.models.domain import BacktestRequest, BatchRequest, BatchStrategySpec
+from app.strategies.registry import strategy_registry
+
+
+class _FlakyProvider(SyntheticProvider):
+    """Synthetic bars, except BAD raises and EMPTY has none."""
+
+    async def get_historical(self, symbol, start, end, interval="1d"):
+        if symbol == "BAD":
+            raise ConnectionError("upstream unavailable")
+        if symbol == "EMPTY":
+            return (await super().get_historical(symbol, start, end, interval))[:0]
+        return await super().get_historical(symbol, start, end, interval)
+
+
+@pytest.fixture(autouse=True)
+def _pool():
+    yield
+    shutdown_process_pool()
+
+
+def test_batch_cells_match_single_runs_and_isolate_bad_symbols():
+    provider = _FlakyProvider(seed=7, volatility=0.3)
+    specs = [
+        BatchStrategySpec(strategy_name="rsi", params={"period": 10}),
+        BatchStrategySpec(strategy_name="macd"),
+    ]
+    request = BatchRequest(
+        symbols=["AAA", "BAD", "EMPTY", "BBB"],
+        strategies=specs,
+        start_date=date(2020, 1, 1),
+        end_date=date(2022, 1, 1),
+    )
+
+    result = asyncio.run(run_batch(request, provider))
+
+    assert [(c.symbol, c.strategy_index) for c in result.results] == [
+        (s, i) for s in request.symbols for i in range(2)
+    ]
+    engine = BacktestEngine(provider)
+    for cell in result.results:
+        if cell.symbol in ("BAD", "EMPTY"):
+            assert cell.metrics is None
+            assert cell.error.startswith("Failed to load" if cell.symbol == "BAD" else "No data")
+            continue
+        single = asyncio.run(engine.run(
+            BacktestRequest(
+                symbols=[cell.symbol],
+                strategy_name=cell.strategy_name,
+                params=specs[cell.strategy_index].params,
+                start_date=request.start_date,
+                end_date=request.end_date,
+            ),
+            strategy_registry.get(cell.strategy_name),
+        ))
+        assert cell.error is None
+        assert cell.metrics == single.metrics
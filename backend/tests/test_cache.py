@@ -0,0 +1,294 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.data.bars import FIELDS, PRICE_FIELDS, BarSeries
+from app.data.cache import CachedDataProvider, store_statements
+from app.data.coverage import merge_ranges, missing_ranges, ranges_from_json, ranges_to_json
+from app.data.memory import BarMemoryCache
+from app.data.synthetic import SyntheticProvider, synthetic_frame
+from app.models.db_models import StockDataCoverage
+
+START = datetime(2020, 1, 1, tzinfo=timezone.utc)
+
+
+def _day(n: int) -> datetime:
+    return START + timedelta(days=n)
+
+
+def _fetch(start: datetime, end: datetime) -> BarSeries:
+    return asyncio.run(SyntheticProvider(seed=7).get_historical("AAA", start, end))
+
+
+class _Result:
+    def __init__(self, rows=(), rowcount: int = 0):
+        self.rows = list(rows)
+        self.rowcount = rowcount
+
+    def scalar_one_or_none(self):
+        return self.rows[0] if self.rows else None
+
+    def one(self):
+        return self.rows[0]
+
+    def scalar_one(self):
+        return self.rows[0]
+
+    def all(self):
+        return self.rows
+
+
+class _Session:
+    """Answers the statements CachedDataProvider issues from a _Database."""
+
+    def __init__(self, db: "_Database"):
+        self.db = db
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def commit(self):
+        self.db.commits += 1
+
+    async def execute(self, stmt):
+        compiled = stmt.compile(dialect=postgresql.dialect())
+        params, sql = compiled.params, str(compiled)
+        if sql.startswith("INSERT INTO stock_data_cache"):
+            n = len(params) // len(("symbol", "interval", *FIELDS))
+            key = (params["symbol_m0"], params["interval_m0"])
+            new = BarSeries.from_columns(*([params[f"{f}_m{i}"] for i in range(n)] for f in FIELDS))
+            # ON CONFLICT DO NOTHING: bars already stored win
+            self.db.bars[key] = BarSeries.merge([self.db.bars.get(key, BarSeries.empty()), new])
+            return _Result(rowcount=n)
+        if sql.startswith("INSERT INTO stock_data_coverage"):
+            key = (params["symbol"], params["interval"])
+            if key in self.db.coverage and "DO NOTHING" in sql:
+                return _Result(rowcount=0)
+            row = self.db.coverage.setdefault(key, StockDataCoverage(symbol=key[0], interval=key[1]))
+            row.ranges, row.refreshed_at = params["ranges"], params["refreshed_at"]
+            return _Result(rowcount=1)
+
+        key = (params["symbol_1"], params["interval_1"])
+        if "FROM stock_data_coverage" in sql:
+            row = self.db.coverage.get(key)
+            if row is None:
+                return _Result()
+            return _Result([row] if "FOR UPDATE" in sql else [row.ranges])
+        bars = self.db.bars.get(key, BarSeries.empty()).between(params["timestamp_1"], params["timestamp_2"])
+        if "min(" in sql:
+            span = bars.datetimes()[[0, -1]].to_pydatetime() if len(bars) else (None, None)
+            return _Result([tuple(span)])
+        rows = list(zip(
+            bars.datetimes().to_pydatetime(),
+            *(getattr(bars, f).tolist() for f in PRICE_FIELDS),
+            bars.volume.tolist(),
+        ))
+        after = params.get("timestamp_3")
+        rows = [row for row in rows if after is None or row[0] > after]
+        return _Result(rows[: params.get("param_1")])
+
+
+class _Database:
+    """In-memory stock_data_cache and stock_data_coverage; calling it opens a
+    session, so it stands in for the session factory."""
+
+    def __init__(self):
+        self.bars: dict[tuple[str, str], BarSeries] = {}
+        self.coverage: dict[tuple[str, str], StockDataCoverage] = {}
+        self.commits = 0
+
+    def __call__(self) -> _Session:
+        return _Session(self)
+
+    def covered(self, symbol: str = "AAA", interval: str = "1d") -> list:
+        return ranges_from_json(self.coverage[(symbol, interval)].ranges)
+
+
+class _RecordingProvider(SyntheticProvider):
+    """Records each fetch; the first one starting at fail_once raises."""
+
+    def __init__(self, fail_once: datetime | None = None):
+        super().__init__(seed=7)
+        self.calls: list[tuple[datetime, datetime]] = []
+        self.fail_once = fail_once
+
+    async def get_historical(self, symbol, start, end, interval="1d"):
+        self.calls.append((start, end))
+        if start == self.fail_once:
+            self.fail_once = None
+            raise ConnectionError("upstream unavailable")
+        return await super().get_historical(symbol, start, end, interval)
+
+
+class _WeekdayProvider(_RecordingProvider):
+    """Trades Monday to Friday only, so a weekend comes back with no bars."""
+
+    async def get_historical(self, symbol, start, end, interval="1d"):
+        bars = await super().get_historical(symbol, start, end, interval)
+        return bars[bars.datetimes().dayofweek < 5]
+
+
+def test_missing_ranges_are_the_uncovered_parts():
+    day = [datetime(2024, 1, d, tzinfo=timezone.utc) for d in range(1, 32)]
+    covered = [(day[9], day[14]), (day[2], day[5]), (day[5], day[7]), (day[20], day[25])]
+
+    assert merge_ranges(covered) == [(day[2], day[7]), (day[9], day[14]), (day[20], day[25])]
+    assert missing_ranges(covered, day[0], day[30]) == [
+        (day[0], day[2]), (day[7], day[9]), (day[14], day[20]), (day[25], day[30]),
+    ]
+    assert missing_ranges(covered, day[3], day[12]) == [(day[7], day[9])]
+    assert missing_ranges(covered, day[10], day[12]) == []
+    assert missing_ranges([], day[4], day[4]) == [(day[4], day[4])]
+    assert ranges_from_json(ranges_to_json(merge_ranges(covered))) == merge_ranges(covered)
+
+
+def test_bar_memory_cache_serves_covered_slices_within_budget():
+    bars = BarSeries.from_frame(synthetic_frame(100, seed=9))
+    day = bars.datetimes().to_pydatetime()
+    # 48 bytes per bar, room for 100
+    cache = BarMemoryCache(max_bytes=48 * 100)
+
+    cache.put("AAA", "1d", bars[:40], (day[0], day[39]))
+    cache.put("AAA", "1d", bars[30:60], (day[30], day[59]))
+
+    assert cache.get("AAA", "1d", day[10], day[50]) == bars[10:51]
+    assert cache.get("AAA", "1d", day[50], day[70]) is None
+    assert cache.get("AAA", "1d", day[10], day[50]).close.flags.writeable is False
+    cache.put("BBB", "1d", bars[:60], (day[0], day[59]))
+    assert cache.get("AAA", "1d", day[0], day[5]) is None
+    assert cache.get("BBB", "1d", day[0], day[5]) == bars[:6]
+    assert cache.stats() == {
+        "entries": 1, "bytes": 48 * 60, "max_bytes": 48 * 100, "hits": 3, "misses": 2, "evictions": 1,
+    }
+    # Merged past the budget: dropped, taking the entry it grew from with it
+    cache.put("BBB", "1d", bars[50:], (day[50], day[99]))
+    cache.put("BBB", "1d", BarSeries.from_frame(synthetic_frame(60, start=day[-1], seed=9))[1:], (day[99], day[99]))
+    assert cache.stats()["entries"] == cache.stats()["bytes"] == 0
+    assert cache.evictions == 2
+
+
+def test_store_statements_batch_bars_into_multi_row_inserts():
+    bars = BarSeries.from_frame(synthetic_frame(250, interval="1m", seed=6))
+
+    statements = list(store_statements("AAA", "1m", bars, batch_rows=100))
+    compiled = [stmt.compile(dialect=postgresql.dialect()) for stmt in statements]
+
+    assert [len(c.params) // 8 for c in compiled] == [100, 100, 50]
+    assert all("ON CONFLICT ON CONSTRAINT uq_stock_data_cache DO NOTHING" in str(c) for c in compiled)
+    assert compiled[2].params["close_m49"] == bars.close[-1]
+    assert list(store_statements("AAA", "1m", BarSeries.empty())) == []
+
+
+def test_cached_provider_fetches_only_the_gaps_and_merges_them():
+    db, upstream = _Database(), _RecordingProvider()
+    cached = CachedDataProvider(upstream, db)
+
+    first = asyncio.run(cached.get_historical("AAA", _day(0), _day(60)))
+    assert first == _fetch(_day(0), _day(60))
+    assert db.covered() == [(_day(0), _day(60))]
+
+    # Half cached: the stored bars plus the one uncovered part, fetched alone
+    second = asyncio.run(cached.get_historical("AAA", _day(30), _day(90)))
+    assert upstream.calls == [(_day(0), _day(60)), (_day(60), _day(90))]
+    assert second == BarSeries.merge([first.between(_day(30), _day(90)), _fetch(_day(60), _day(90))])
+    assert db.covered() == [(_day(0), _day(90))]
+
+    # Fully covered: served from Postgres without an upstream call
+    third = asyncio.run(cached.get_historical("AAA", _day(10), _day(80)))
+    assert third == db.bars[("AAA", "1d")].between(_day(10), _day(80))
+    assert len(upstream.calls) == 2 and db.commits == 2
+
+    async def pages():
+        return [chunk async for chunk in cached.iter_historical("AAA", _day(0), _day(90), chunk_size=25)]
+
+    chunks = asyncio.run(pages())
+    assert [len(c) for c in chunks] == [25, 25, 25, 15]
+    assert BarSeries.concat(chunks) == db.bars[("AAA", "1d")]
+
+
+def test_cached_provider_takes_legacy_bars_without_coverage_as_covered():
+    db, upstream = _Database(), _RecordingProvider()
+    legacy = _fetch(_day(20), _day(40))
+    db.bars[("AAA", "1d")] = legacy
+    cached = CachedDataProvider(upstream, db)
+
+    bars = asyncio.run(cached.get_historical("AAA", _day(0), _day(60)))
+
+    # legacy spans day 20 to day 39; only the parts either side are fetched
+    assert upstream.calls == [(_day(0), _day(20)), (_day(39), _day(60))]
+    assert bars == BarSeries.merge([legacy, _fetch(_day(0), _day(20)), _fetch(_day(39), _day(60))])
+    assert bars.between(_day(20), _day(39)) == legacy
+    assert db.covered() == [(_day(0), _day(60))]
+
+
+def test_cached_provider_memory_tier_answers_repeats():
+    db, upstream = _Database(), _RecordingProvider()
+    memory = BarMemoryCache(max_bytes=2**20)
+    cached = CachedDataProvider(upstream, db, memory)
+
+    first = asyncio.run(cached.get_historical("AAA", _day(0), _day(60)))
+    # The half day past the bars has none, but upstream was asked: both
+    # tiers cover it, and the repeat is answered from memory
+    half = _day(60) + timedelta(hours=12)
+    for _ in range(2):
+        assert asyncio.run(cached.get_historical("AAA", _day(0), half)) == first
+    assert upstream.calls == [(_day(0), _day(60)), (_day(60), half)]
+
+    db.bars.clear()
+    again = asyncio.run(cached.get_historical("AAA", _day(5), _day(50)))
+
+    assert again == first.between(_day(5), _day(50))
+    assert len(upstream.calls) == 2 and memory.stats()["hits"] == 2
+
+
+def test_cached_provider_leaves_failed_fetches_uncovered():
+    db, upstream = _Database(), _RecordingProvider(fail_once=_day(60))
+    cached = CachedDataProvider(upstream, db)
+    asyncio.run(cached.get_historical("AAA", _day(30), _day(60)))
+
+    # Of the two gaps either side, the later fetch fails: the earlier one is
+    # still stored and covered, and the failure reaches the caller
+    with pytest.raises(ConnectionError):
+        asyncio.run(cached.get_historical("AAA", _day(0), _day(90)))
+    assert db.covered() == [(_day(0), _day(60))]
+
+    bars = asyncio.run(cached.get_historical("AAA", _day(0), _day(90)))
+    assert upstream.calls[-1] == (_day(60), _day(90))
+    assert bars == BarSeries.merge([_fetch(_day(0), _day(30)), _fetch(_day(30), _day(60)), _fetch(_day(60), _day(90))])
+    assert db.covered() == [(_day(0), _day(90))]
+
+
+
+def test_record_coverage_merges_into_a_row_another_fill_created():
+    db = _Database()
+
+    class _RacingSession(_Session):
+        async def execute(self, stmt):
+            result = await super().execute(stmt)
+            if ("AAA", "1d") not in db.coverage:
+                # Another fill creates the row right after the first lock attempt
+                db.coverage[("AAA", "1d")] = StockDataCoverage(ranges=ranges_to_json([(_day(60), _day(90))]))
+            return result
+
+    cached = CachedDataProvider(SyntheticProvider(), db)
+    asyncio.run(cached._record_coverage(_RacingSession(db), "AAA", "1d", [(_day(0), _day(30))], _day(100)))
+
+    assert db.covered() == [(_day(0), _day(30)), (_day(60), _day(90))]
+    assert db.coverage[("AAA", "1d")].refreshed_at == _day(100)
+
+
+def test_cached_provider_covers_gaps_without_bars():
+    db, upstream = _Database(), _WeekdayProvider()
+    cached = CachedDataProvider(upstream, db)
+    # 2020-01-01 is a Wednesday: day 3 and day 4 are the weekend
+    friday = asyncio.run(cached.get_historical("AAA", _day(0), _day(3)))
+
+    for _ in range(2):
+        assert asyncio.run(cached.get_historical("AAA", _day(0), _day(5))) == friday
+    assert upstream.calls == [(_day(0), _day(3)), (_day(3), _day(5))]
+    assert db.covered() == [(_day(0), _day(5))]
@@ -0,0 +1,53 @@
+import numpy as np
+
+from app.engine.downsample import (
+    downsample_equity_curve,
+    downsample_indicator_data,
+    envelope_indices,
+    lttb_indices,
+)
+
+
+def test_lttb_keeps_endpoints_and_spikes_within_budget():
+    y = np.sin(np.linspace(0, 20, 5000))
+    y[:10] = np.nan
+    y[3001] = 50.0
+
+    index = lttb_indices(y, 100)
+
+    assert len(index) == 100
+    assert index[0] == 10 and index[-1] == 4999
+    assert 3001 in index
+    assert (np.diff(index) > 0).all()
+    np.testing.assert_array_equal(lttb_indices(y[:60], 100), np.arange(10, 60))
+
+
+def test_envelope_keeps_extremes():
+    rng = np.random.default_rng(1)
+    equity = 1e5 + np.cumsum(rng.normal(0, 100, 20000))
+
+    index = envelope_indices(equity, 500)
+
+    assert len(index) <= 500
+    assert index[0] == 0 and index[-1] == len(equity) - 1
+    assert equity[index].min() == equity.min() and equity[index].max() == equity.max()
+
+
+def test_payload_helpers_keep_result_formats():
+    n = 1000
+    ts = [f"t{i}" for i in range(n)]
+    equity = (1e5 + np.cumsum(np.random.default_rng(2).normal(0, 50, n))).tolist()
+    rows = [{"timestamp": t, "equity": e, "price": 1.0} for t, e in zip(ts, equity)]
+    columns = {"timestamp": ts, "equity": equity, "price": [1.0] * n}
+    values = [None] * 20 + np.linspace(0, 1, n - 20).tolist()
+
+    assert downsample_equity_curve(rows, 50) == [
+        dict(zip(columns, point)) for point in zip(*downsample_equity_curve(columns, 50).values())
+    ]
+    by_rows = downsample_indicator_data(
+        {"sma": [{"timestamp": t, "value": v} for t, v in zip(ts, values)]}, 50
+    )
+    table = downsample_indicator_data({"timestamp": ts, "series": {"sma": values, "ema": values}}, 50)
+
+    assert len(by_rows["sma"]) == 50 and by_rows["sma"][0] == {"timestamp": "t20", "value": 0.0}
+    assert len(table["timestamp"]) <= 50 and table["series"]["sma"] == table["series"]["ema"]
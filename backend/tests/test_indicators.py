@@ -0,0 +1,164 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data.synthetic import synthetic_frame
+from app.indicators.bollinger import compute_bollinger_bands
+from app.indicators.cache import IndicatorCache
+from app.indicators.hedge import compute_kalman_hedge, compute_rolling_ols
+from app.indicators.incremental import EMA, MACD, RSI, SMA, BollingerBands, KalmanRegression, RollingOLS
+from app.indicators.macd import compute_macd
+from app.indicators.moving_average import compute_ema, compute_rolling_std, compute_sma
+from app.indicators.multi_window import compute_ema_matrix, compute_rolling_moments_matrix
+from app.indicators.rsi import compute_rsi
+
+
+@pytest.fixture
+def close() -> pd.Series:
+    return synthetic_frame(2000, seed=3, volatility=0.4)["close"]
+
+
+def _stream(indicator, values) -> np.ndarray:
+    return np.array([indicator.update(v) for v in values], dtype=np.float64)
+
+
+@pytest.mark.parametrize("period", [1, 5, 20, 200])
+def test_sma_and_ema_match_batch(close, period):
+    values = close.tolist()
+    np.testing.assert_array_equal(_stream(SMA(period), values), compute_sma(close, period).to_numpy())
+    np.testing.assert_array_equal(_stream(EMA(period), values), compute_ema(close, period).to_numpy())
+
+
+@pytest.mark.parametrize("period", [2, 14, 30])
+def test_rsi_matches_batch(close, period):
+    np.testing.assert_array_equal(_stream(RSI(period), close.tolist()), compute_rsi(close, period).to_numpy())
+
+
+def test_macd_and_bollinger_match_batch(close):
+    indicator = MACD(12, 26, 9)
+    macd = np.array([indicator.update(v) for v in close.tolist()])
+    expected = compute_macd(close, 12, 26, 9)
+    for i, line in enumerate(expected):
+        np.testing.assert_array_equal(macd[:, i], line.to_numpy())
+
+    indicator = BollingerBands(20, 2.0)
+    bands = np.array([indicator.update(v) for v in close.tolist()])
+    expected = compute_bollinger_bands(close, 20, 2.0)
+    for i, line in enumerate(expected):
+        np.testing.assert_array_equal(bands[:, i], line.to_numpy())
+
+
+def test_snapshot_restore_resumes_mid_stream(close):
+    values = close.tolist()
+    split = 777
+    for make in (lambda: SMA(20), lambda: RSI(14), lambda: MACD(), lambda: BollingerBands(20, 2.0)):
+        reference = make()
+        full = [reference.update(v) for v in values]
+
+        first = make()
+        for v in values[:split]:
+            first.update(v)
+        resumed = make()
+        resumed.restore(json.loads(json.dumps(first.snapshot())))
+        rest = [resumed.update(v) for v in values[split:]]
+
+        np.testing.assert_array_equal(np.array(rest, dtype=np.float64), np.array(full[split:], dtype=np.float64))
+
+
+def test_indicator_cache_reuses_results_across_series_objects(close):
+    cache = IndicatorCache(max_bytes=2**20)
+    first = cache.compute(compute_ema, close, 12)
+    # Same values under a different index and object still hit
+    shifted = pd.Series(close.to_numpy().copy(), index=close.index + 1)
+    second = cache.compute(compute_ema, shifted, 12)
+
+    assert (cache.hits, cache.misses) == (1, 1)
+    np.testing.assert_array_equal(second.to_numpy(), compute_ema(close, 12).to_numpy())
+    assert second.index.equals(shifted.index)
+
+    second.iloc[:5] = 0.0
+    np.testing.assert_array_equal(first.to_numpy(), cache.compute(compute_ema, close, 12).to_numpy())
+
+    cache.compute(compute_ema, close, 26)
+    cache.compute(compute_sma, close, 12)
+    assert cache.misses == 3
+
+
+def test_indicator_cache_evicts_least_recently_used(close):
+    entry_bytes = close.to_numpy().nbytes
+    cache = IndicatorCache(max_bytes=2 * entry_bytes)
+    cache.compute(compute_sma, close, 10)
+    cache.compute(compute_rolling_std, close, 10)
+    cache.compute(compute_sma, close, 10)
+    cache.compute(compute_ema, close, 10)
+
+    assert cache.stats()["entries"] == 2
+    assert cache.evictions == 1
+    cache.compute(compute_sma, close, 10)
+    cache.compute(compute_rolling_std, close, 10)
+    assert (cache.hits, cache.misses) == (2, 4)
+    assert cache.nbytes <= cache.max_bytes
+
+
+
+def test_rolling_moment_matrices_match_per_period_rolling():
+    # Long enough to span several prefix-sum blocks, with a gap and a flat run
+    close = synthetic_frame(20_000, seed=3, interval="1m")["close"]
+    close.iloc[5000] = np.nan
+    close.iloc[9000:9100] = 100.0
+    periods = [1, 2, 5, 20, 200, 20]
+    mean, std = compute_rolling_moments_matrix(close, periods)
+
+    assert mean.shape == std.shape == (len(close), len(periods))
+    for j, p in enumerate(periods):
+        np.testing.assert_allclose(mean[:, j], compute_sma(close, p).to_numpy(), rtol=1e-12)
+        np.testing.assert_allclose(std[:, j], compute_rolling_std(close, p).to_numpy(), rtol=1e-6, atol=1e-6)
+    assert (std[9099, 1:4] == 0.0).all()
+
+
+def test_ema_matrix_matches_per_span_ewm(close):
+    spans = [1, 2, 9, 26, 100]
+    out = compute_ema_matrix(close, spans)
+    for j, span in enumerate(spans):
+        np.testing.assert_allclose(out[:, j], compute_ema(close, span).to_numpy(), rtol=1e-12)
+
+    with_gap = close.copy()
+    with_gap.iloc[10] = np.nan
+    out = compute_ema_matrix(with_gap, spans)
+    np.testing.assert_array_equal(out[:, 2], compute_ema(with_gap, 9).to_numpy())
+
+
+def test_rolling_ols_matches_per_window_fit_and_incremental(close):
+    x = close.to_numpy().copy()
+    y = 1.7 * x + 5.0 + synthetic_frame(2000, seed=4, volatility=0.4)["close"].to_numpy() * 0.1
+    x[900] = np.nan
+
+    beta, alpha, resid_std = compute_rolling_ols(y, x, 50)
+
+    assert np.isnan(beta[:49]).all() and np.isnan(beta[900:950]).all()
+    for t in (49, 899, 950, 1999):
+        slope, intercept = np.polyfit(x[t - 49 : t + 1], y[t - 49 : t + 1], 1)
+        np.testing.assert_allclose([beta[t], alpha[t]], [slope, intercept], rtol=1e-9)
+    ols = RollingOLS(50)
+    streamed = np.array([ols.update(a, b) for a, b in zip(x.tolist(), y.tolist())])
+    np.testing.assert_allclose(streamed, np.column_stack([beta, alpha, resid_std]), rtol=1e-7)
+
+
+def test_kalman_hedge_tracks_a_drifting_ratio(close):
+    x = close.to_numpy()
+    ratio = np.linspace(1.0, 2.0, len(x))
+    y = ratio * x
+
+    beta, error, error_std = compute_kalman_hedge(y, x, delta=1e-3, warmup=100)
+
+    assert np.isnan(beta[:100]).all()
+    assert np.abs(beta[200:] - ratio[200:]).max() < 0.05
+    kalman = KalmanRegression(1e-3, warmup=100)
+    for a, b in zip(x[:777].tolist(), y[:777].tolist()):
+        kalman.update(a, b)
+    resumed = KalmanRegression(1e-3)
+    resumed.restore(json.loads(json.dumps(kalman.snapshot())))
+    rest = np.array([resumed.update(a, b) for a, b in zip(x[777:].tolist(), y[777:].tolist())])
+    np.testing.assert_array_equal(rest, np.column_stack([beta, error, error_std])[777:])
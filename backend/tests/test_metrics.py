@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.engine.metrics import MetricsAccumulator, compute_metrics
+from app.models.domain import Fill, OrderSide
+
+
+def _fill(day: int, side: OrderSide, pnl: float | None = None) -> Fill:
+    return Fill(
+        timestamp=datetime(2024, 1, 1) + timedelta(days=day),
+        symbol="AAA",
+        side=side,
+        quantity=1,
+        price=100.0,
+        pnl=pnl,
+    )
+
+
+def test_drawdown_depth_and_duration():
+    equity = np.array([100.0, 110.0, 99.0, 104.5, 110.0, 121.0, 115.0])
+    timestamps = pd.date_range("2024-01-01", periods=len(equity), freq="D", tz="UTC")
+
+    m = compute_metrics(equity, [], 100.0, "1d", timestamps)
+
+    assert m.max_drawdown_pct == -10.0
+    # Under water from the 110 peak on day 1 until it is matched on day 4
+    assert m.max_drawdown_duration_days == 3.0
+    # Still under water at the end: counted to the last bar
+    assert compute_metrics(equity[:4], [], 100.0, "1d", timestamps[:4]).max_drawdown_duration_days == 2.0
+    # A new high every bar is never under water
+    rising = compute_metrics(np.arange(100.0, 107.0), [], 100.0, "1d", timestamps)
+    assert rising.max_drawdown_duration_days == 0.0
+
+
+def test_holding_time_pairs_round_trips():
+    fills = [
+        _fill(0, OrderSide.BUY),
+        _fill(3, OrderSide.SELL, pnl=5.0),
+        _fill(10, OrderSide.BUY),
+        _fill(11, OrderSide.SELL, pnl=-2.0),
+        _fill(20, OrderSide.BUY),  # still open
+    ]
+
+    m = compute_metrics(np.full(30, 100.0), fills, 100.0)
+
+    assert m.total_trades == 2
+    assert m.win_rate == 0.5
+    assert m.avg_trade_duration_days == 2.0
+
+
+def test_chunked_accumulation_matches_single_pass():
+    rng = np.random.default_rng(3)
+    equity = np.round(100_000 * np.cumprod(1 + rng.normal(0, 0.01, 5000)), 2)
+    timestamps = pd.date_range("2024-01-01", periods=len(equity), freq="h", tz="UTC")
+
+    whole = compute_metrics(equity, [], 100_000.0, "1h", timestamps)
+    accumulator = MetricsAccumulator(100_000.0, "1h")
+    for start in range(0, len(equity), 700):
+        accumulator.update(equity[start : start + 700], [], timestamps[start : start + 700])
+
+    assert accumulator.result() == whole
+    assert whole.sortino_ratio != 0 and whole.calmar_ratio != 0
+
+    # Bar-count durations carry the peak's position across chunks too
+    accumulator = MetricsAccumulator(100_000.0, "1h")
+    for start in range(0, len(equity), 7):
+        accumulator.update(equity[start : start + 7], [])
+    assert accumulator.result() == compute_metrics(equity, [], 100_000.0, "1h")
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from app.engine.monte_carlo import block_bootstrap, run_monte_carlo, trade_resample
+from app.models.domain import MonteCarloRequest
+
+BUDGET = 2**20
+
+
+def _equity(n: int = 500, seed: int = 3) -> np.ndarray:
+    returns = np.random.default_rng(seed).normal(0.0005, 0.01, n)
+    return 1e5 * np.cumprod(1 + returns)
+
+
+def test_run_monte_carlo_is_deterministic_per_seed():
+    equity = _equity()
+    pnl = np.random.default_rng(4).normal(50, 400, 60)
+
+    def run(seed):
+        return run_monte_carlo(equity, pnl, 1e5, "1d", MonteCarloRequest(n_paths=300, block_size=10, seed=seed))
+
+    assert run(11) == run(11)
+    assert run(11) != run(12)
+    resample, bootstrap = run(11)
+    assert resample.n_paths == bootstrap.n_paths == 300
+    with pytest.raises(ValueError):
+        run_monte_carlo(equity, pnl, 1e5, "1d", MonteCarloRequest(n_paths=0))
+
+
+def test_block_bootstrap_distribution():
+    equity = _equity()
+    returns = np.diff(equity) / equity[:-1]
+
+    # One block as long as the series can only reproduce the series itself
+    totals, drawdowns, sharpes = block_bootstrap(returns, 50, len(returns), 252, np.random.default_rng(0), BUDGET)
+    peak = np.maximum.accumulate(np.concatenate(([1e5], equity)))
+    np.testing.assert_allclose(totals, equity[-1] / equity[0] - 1)
+    np.testing.assert_allclose(drawdowns, (equity / peak[1:] - 1).min())
+    np.testing.assert_allclose(sharpes, returns.mean() / returns.std(ddof=1) * np.sqrt(252))
+
+    # Short blocks scatter paths around the original, losses within [-1, 0]
+    totals, drawdowns, _ = block_bootstrap(returns, 4000, 5, 252, np.random.default_rng(0), BUDGET)
+    assert totals.std() > 0
+    assert np.median(totals) == pytest.approx(equity[-1] / equity[0] - 1, abs=0.15)
+    assert ((drawdowns <= 0) & (drawdowns > -1)).all()
+
+
+def test_trade_resample_distribution():
+    pnl = np.array([300.0, -100.0, 200.0, -50.0])
+
+    totals, drawdowns, _ = trade_resample(pnl, 1e4, 20000, 50, np.random.default_rng(1), BUDGET)
+
+    # Each path sums four draws, so the mean return is 4 * mean(pnl) / cash
+    assert totals.mean() == pytest.approx(4 * pnl.mean() / 1e4, rel=0.05)
+    assert totals.min() == pytest.approx(-400 / 1e4) and totals.max() == pytest.approx(1200 / 1e4)
+    assert (drawdowns <= 0).all() and drawdowns.min() >= -400 / 1e4
+
+    winners, drawdowns, sharpes = trade_resample(np.full(5, 100.0), 1e4, 10, 50, np.random.default_rng(1), BUDGET)
+    np.testing.assert_allclose(winners, 0.05)
+    assert (drawdowns == 0).all()
@@ -0,0 +1,101 @@
+import asyncio
+import uuid
+from datetime import date, datetime, timezone
+
+from sqlalchemy.dialects import postgresql
+
+from app.engine import result_cache as rc
+from app.engine.backtester import empty_metrics
+from app.models.domain import BacktestRequest, BacktestResult
+from app.strategies.registry import strategy_registry
+
+
+def _request(**overrides) -> BacktestRequest:
+    fields = dict(
+        symbols=["AAA"],
+        strategy_name="rsi",
+        params={},
+        start_date=date(2020, 1, 1),
+        end_date=date(2021, 1, 1),
+    )
+    return BacktestRequest(**(fields | overrides))
+
+
+def _result() -> BacktestResult:
+    return BacktestResult(
+        id=str(uuid.uuid4()), metrics=empty_metrics(), equity_curve=[], trades=[], indicator_data={}, duration_ms=0
+    )
+
+
+def test_cache_key_tracks_params_engine_and_strategy_versions(monkeypatch):
+    rsi = strategy_registry.get("rsi")
+    key = rc.cache_key(_request(), rsi)
+
+    # Params are keyed after validation, so defaults spelled out match
+    assert rc.cache_key(_request(params={"period": 14}), rsi) == key
+    assert rc.cache_key(_request(params={"period": 15}), rsi) != key
+    assert rc.cache_key(_request(end_date=date(2021, 1, 2)), rsi) != key
+
+    monkeypatch.setattr(rc, "ENGINE_VERSION", rc.ENGINE_VERSION + 1)
+    bumped = rc.cache_key(_request(), rsi)
+    monkeypatch.setattr(rc, "strategy_fingerprint", lambda strategy: "edited")
+    edited = rc.cache_key(_request(), rsi)
+    monkeypatch.setattr(rc, "engine_fingerprint", lambda: "edited")
+    engine_edited = rc.cache_key(_request(), rsi)
+
+    assert len({key, bumped, edited, engine_edited}) == 4
+    # Shared helpers and indicators reached indirectly are part of the hash
+    assert {"app.strategies.base", "app.indicators.rsi", "app.indicators.moving_average"} <= set(
+        rc.fingerprint_modules(rsi)
+    )
+
+
+def test_invalidate_drops_entries_overlapping_the_new_bars():
+    cache = rc.BacktestResultCache()
+    cache.put("a20", _result(), ["AAA"], "1d", date(2020, 1, 1), date(2020, 12, 31))
+    cache.put("a22", _result(), ["AAA", "BBB"], "1d", date(2022, 1, 1), date(2022, 12, 31))
+    cache.put("a20m", _result(), ["AAA"], "1m", date(2020, 1, 1), date(2020, 12, 31))
+    cache.put("b20", _result(), ["BBB"], "1d", date(2020, 1, 1), date(2020, 12, 31))
+
+    stored = (datetime(2020, 6, 1, tzinfo=timezone.utc), datetime(2021, 3, 1, tzinfo=timezone.utc))
+    assert cache.invalidate("AAA", "1d", *stored) == 1
+    assert cache.get("a20") is None
+    assert all(cache.get(key) is not None for key in ("a22", "a20m", "b20"))
+    assert cache.invalidate("BBB") == 2
+    assert cache.stats()["entries"] == 1
+
+    sql = str(rc.invalidation_statement("AAA", "1d", *stored).compile(dialect=postgresql.dialect()))
+    assert "backtest_runs.end_date >= " in sql and "backtest_runs.start_date <= " in sql
+
+
+class _Session:
+    """Answers lookup()'s run check with whether the run still has the key."""
+
+    def __init__(self, attached: bool):
+        self.attached = attached
+
+    async def execute(self, stmt):
+        attached = self.attached
+
+        class _Result:
+            def scalar_one_or_none(self):
+                return uuid.uuid4() if attached else None
+
+        return _Result()
+
+
+def test_lookup_rechecks_memory_hits_against_the_stored_key(monkeypatch):
+    cache = rc.BacktestResultCache()
+    result = _result()
+    cache.put("k", result, ["AAA"], "1d", date(2020, 1, 1), date(2021, 1, 1))
+
+    async def no_persisted(session, key):
+        return None
+
+    monkeypatch.setattr(cache, "load_persisted", no_persisted)
+
+    hit = asyncio.run(cache.lookup(_Session(attached=True), "k"))
+    assert hit.id == result.id and hit.cached
+    # Detached by another worker: the memory entry is dropped, not served
+    assert asyncio.run(cache.lookup(_Session(attached=False), "k")) is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,120 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.config import settings
+from app.data.synthetic import synthetic_frame
+from app.engine.screener import (
+    SETTLE_MULTIPLE,
+    load_universe,
+    screen_universe,
+    screener_lookback,
+    universe_from_rows,
+)
+from app.models.domain import ScreenRequest
+from app.strategies.registry import strategy_registry
+
+START = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def _rows(closes: dict[str, list[float]]) -> list[tuple]:
+    return [
+        (symbol, START + timedelta(days=i), close)
+        for symbol, series in sorted(closes.items())
+        for i, close in enumerate(series)
+    ]
+
+
+def test_universe_from_rows_sets_aside_short_histories():
+    universe = universe_from_rows(
+        _rows({"AAA": [1.0, 2.0, 3.0], "BBB": [4.0, 5.0], "CCC": [6.0, 7.0, 8.0]}), lookback=3
+    )
+
+    assert universe.symbols == ["AAA", "CCC"]
+    assert universe.insufficient == ["BBB"]
+    np.testing.assert_array_equal(universe.close.to_numpy(), [[1.0, 6.0], [2.0, 7.0], [3.0, 8.0]])
+    assert universe.timestamps[-1, 1] == START + timedelta(days=2)
+
+
+def test_screen_universe_matches_per_symbol_signals():
+    strategy = strategy_registry.get("rsi")
+    params = strategy.validate_params({"period": 5, "overbought": 60, "oversold": 40})
+    closes = {f"SYN{i}": synthetic_frame(120, seed=i, volatility=0.5)["close"].tolist() for i in range(30)}
+    universe = universe_from_rows(_rows(closes), lookback=120)
+
+    everything = screen_universe(universe, strategy, params, within_bars=3, include_all=True)
+    buys = screen_universe(universe, strategy, params, within_bars=3, signal=1)
+
+    assert [e.symbol for e in everything] == sorted(closes)
+    for entry in everything:
+        expected = strategy.generate_signals(pd.DataFrame({"close": closes[entry.symbol]}), params)
+        recent = expected["signal"].to_numpy()[-3:]
+        fired = np.flatnonzero(recent)
+        assert entry.signal == (recent[fired[-1]] if len(fired) else 0)
+        assert entry.indicators["rsi"] == expected["rsi"].iloc[-1]
+        assert entry.timestamp == START + timedelta(days=119)
+    assert buys and [e.symbol for e in buys] == [e.symbol for e in everything if e.signal == 1]
+
+
+@pytest.mark.parametrize(
+    "name", [s.name for s in strategy_registry.all if s.name != "pairs_trading"]
+)
+def test_screen_universe_screens_short_histories_on_the_bars_they_have(name):
+    strategy = strategy_registry.get(name)
+    params = strategy.validate_params({})
+    lookback = 3 * strategy.indicator_window(params) + 3
+    lengths = {"FULL1": lookback, "FULL2": lookback, "NEW1": lookback // 2, "NEW2": lookback - 7, "TINY": 3}
+    closes = {
+        symbol: synthetic_frame(n, symbol=symbol, seed=2, volatility=0.5)["close"].tolist()
+        for symbol, n in lengths.items()
+    }
+    universe = universe_from_rows(_rows(closes), lookback, min_bars=strategy.indicator_window(params) + 1)
+
+    assert universe.symbols == ["FULL1", "FULL2", "NEW1", "NEW2"] and universe.insufficient == ["TINY"]
+    assert universe.timestamps[0, 2] is None and np.isnan(universe.close["NEW1"].iloc[0])
+    for entry in screen_universe(universe, strategy, params, within_bars=3, include_all=True):
+        expected = strategy.generate_signals(pd.DataFrame({"close": closes[entry.symbol]}), params)
+        recent = expected["signal"].to_numpy()[-3:]
+        fired = np.flatnonzero(recent)
+        assert entry.signal == (recent[fired[-1]] if len(fired) else 0)
+        assert entry.timestamp == START + timedelta(days=lengths[entry.symbol] - 1)
+        for indicator, value in entry.indicators.items():
+            assert value == pytest.approx(expected[indicator].iloc[-1], rel=1e-9, nan_ok=True)
+
+
+def test_default_lookback_is_a_few_indicator_windows():
+    ma = strategy_registry.get("ma_crossover")
+    rsi = strategy_registry.get("rsi")
+
+    def lookback(strategy, **fields):
+        request = ScreenRequest(strategy_name=strategy.name, **fields)
+        return screener_lookback(request, strategy, strategy.validate_params(request.params))
+
+    assert lookback(ma) == SETTLE_MULTIPLE * 30 + 1
+    assert lookback(rsi, within_bars=5) == SETTLE_MULTIPLE * 14 + 5
+    # The longest windows any strategy accepts fit the limit
+    assert lookback(ma, params={"slow_period": 200}) <= settings.max_screener_lookback
+    assert lookback(ma, lookback=50) == 50
+
+
+def test_load_universe_lists_symbols_from_coverage():
+    statements = []
+
+    class _Session:
+        async def execute(self, stmt):
+            statements.append(str(stmt.compile(dialect=postgresql.dialect())))
+
+            class _Rows:
+                def all(self):
+                    return _rows({"AAA": [1.0, 2.0, 3.0], "BBB": [4.0, 5.0]})
+
+            return _Rows()
+
+    universe = asyncio.run(load_universe(_Session(), "1d", 3, min_bars=2))
+
+    assert universe.symbols == ["AAA", "BBB"] and np.isnan(universe.close["BBB"].iloc[0])
+    assert "FROM stock_data_coverage" in statements[0] and "DISTINCT" not in statements[0]
@@ -0,0 +1,31 @@
+import asyncio
+
+from app.data.singleflight import SingleFlight
+
+
+def test_single_flight_shares_one_call_between_concurrent_callers():
+    flights = SingleFlight()
+    started = []
+
+    async def fetch(key):
+        started.append(key)
+        await asyncio.sleep(0.01)
+        if key == "bad":
+            raise ValueError(key)
+        return object()
+
+    async def main():
+        results = await asyncio.gather(*(flights.do(k, lambda k=k: fetch(k)) for k in ["a"] * 5 + ["b"]))
+        failures = await asyncio.gather(
+            *(flights.do("bad", lambda: fetch("bad")) for _ in range(3)), return_exceptions=True
+        )
+        again = await flights.do("a", lambda: fetch("a"))
+        return results, failures, again
+
+    results, failures, again = asyncio.run(main())
+
+    assert started == ["a", "b", "bad", "a"]
+    assert len({id(r) for r in results[:5]}) == 1 and results[5] is not results[0]
+    assert all(isinstance(f, ValueError) for f in failures)
+    assert again is not results[0]
+    assert (flights.calls, flights.shared) == (4, 6)
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.data.synthetic import synthetic_frame
+from app.models.domain import SimulationMode
+from app.simulation.broker import SimulatedBroker
+from app.simulation.clock import SimulationClock
+from app.simulation.runner import SimulationRunner
+from app.strategies.base import Strategy
+from app.strategies.momentum import MomentumStrategy
+from app.strategies.registry import strategy_registry
+
+PARAM_CASES = {
+    "ma_crossover": [{}, {"fast_period": 5, "slow_period": 20, "ma_type": "EMA"}],
+    "macd": [{}, {"fast_period": 5, "slow_period": 13, "signal_period": 4}],
+    "rsi": [{}, {"period": 5, "overbought": 60, "oversold": 40}],
+    "bollinger": [{}, {"period": 10, "num_std": 1.0}],
+    "mean_reversion": [{}, {"lookback": 10, "entry_z": -1.0, "exit_z": 0.5}],
+    "momentum": [{}, {"lookback": 5, "threshold": 1.0}],
+    "pairs_trading": [
+        {},
+        {"lookback": 10, "entry_z": 1.0, "exit_z": 0.2},
+        {"hedge": "kalman", "delta": 1e-3, "entry_z": 1.5},
+        {"hedge": "none", "lookback": 20},
+    ],
+}
+
+
+def _bars(n: int = 1500) -> pd.DataFrame:
+    df = synthetic_frame(n, seed=11, volatility=0.5)
+    df["close_2"] = synthetic_frame(n, symbol="SYN2", seed=11, volatility=0.5)["close"]
+    return df
+
+
+@pytest.mark.parametrize(
+    "strategy_name,params",
+    [(name, params) for name, cases in PARAM_CASES.items() for params in cases],
+)
+def test_on_bar_matches_generate_signals(strategy_name, params):
+    strategy = strategy_registry.get(strategy_name)
+    params = strategy.validate_params(params)
+    df = _bars()
+    expected = strategy.generate_signals(df.copy(), params)["signal"].to_numpy()
+
+    state = strategy.init_state(params)
+    streamed = np.array([strategy.on_bar(state, bar, params) for bar in df.to_dict("records")])
+
+    assert (expected != 0).any()
+    np.testing.assert_array_equal(streamed, expected)
+
+
+@pytest.mark.parametrize("strategy_name", list(PARAM_CASES))
+def test_generate_signals_batch_matches_generate_signals(strategy_name):
+    strategy = strategy_registry.get(strategy_name)
+    param_grid = PARAM_CASES[strategy_name] * 2
+    df = _bars()
+    before = df.copy()
+
+    signals = strategy.generate_signals_batch(df, param_grid)
+
+    pd.testing.assert_frame_equal(df, before)
+    assert signals.dtype == np.int8 and signals.shape == (len(df), len(param_grid))
+    for j, params in enumerate(param_grid):
+        expected = strategy.generate_signals(df.copy(), params)["signal"].to_numpy()
+        assert (expected != 0).any()
+        np.testing.assert_array_equal(signals[:, j], expected)
+
+
+def test_generate_signals_batch_default_runs_each_param_set():
+    class LoopingMomentum(MomentumStrategy):
+        generate_signals_batch = Strategy.generate_signals_batch
+
+    df = _bars(400)
+    param_grid = PARAM_CASES["momentum"]
+    signals = LoopingMomentum().generate_signals_batch(df, param_grid)
+
+    assert "signal" not in df.columns
+    np.testing.assert_array_equal(signals, MomentumStrategy().generate_signals_batch(df, param_grid))
+
+
+@pytest.mark.parametrize(
+    "strategy_name,params",
+    [(name, params) for name, cases in PARAM_CASES.items() if name != "pairs_trading" for params in cases],
+)
+def test_generate_signals_panel_matches_generate_signals(strategy_name, params):
+    strategy = strategy_registry.get(strategy_name)
+    close = pd.DataFrame(
+        {f"SYN{i}": synthetic_frame(300, seed=i, volatility=0.5)["close"] for i in range(12)}
+    )
+
+    outputs = strategy.generate_signals_panel({"close": close}, params)
+
+    assert outputs["signal"].shape == close.shape
+    for symbol in close.columns:
+        expected = strategy.generate_signals(pd.DataFrame({"close": close[symbol]}), params)
+        for name, frame in outputs.items():
+            np.testing.assert_array_equal(frame[symbol].to_numpy(), expected[name].to_numpy())
+
+
+def test_runner_falls_back_to_trailing_window():
+    class WindowOnlyMomentum(MomentumStrategy):
+        def init_state(self, params):
+            return None
+
+    strategy = WindowOnlyMomentum()
+    params = {"lookback": 5, "threshold": 1.0}
+    runner = SimulationRunner(
+        "sim", strategy, params, ["SYN"], None, SimulatedBroker(), SimulationClock(SimulationMode.REPLAY)
+    )
+    df = _bars(400)
+    signals = [runner._next_signal(bar) for bar in df.to_dict("records")]
+
+    assert len(runner._window) == strategy.warmup_bars(params)
+    expected = strategy.generate_signals(df, strategy.validate_params(params))["signal"].to_numpy()
+    np.testing.assert_array_equal(signals, expected)
@@ -0,0 +1,41 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.engine.backtester import BacktestEngine
+from app.engine.streaming import run_streaming
+from app.models.domain import BacktestRequest
+from app.strategies.registry import strategy_registry
+
+STREAMABLE = [s.name for s in strategy_registry.all if s.name != "pairs_trading"]
+
+
+@pytest.mark.parametrize("strategy_name", STREAMABLE)
+@pytest.mark.parametrize("chunk_size", [37, 250])
+def test_streaming_matches_single_pass(provider, strategy_name, chunk_size):
+    request = BacktestRequest(
+        symbols=["AAA"],
+        strategy_name=strategy_name,
+        params={},
+        start_date=date(2020, 1, 1),
+        end_date=date(2023, 1, 1),
+    )
+    strategy = strategy_registry.get(strategy_name)
+    chunks = []
+
+    async def sink(seq, columns):
+        chunks.append((seq, columns))
+
+    streamed = asyncio.run(run_streaming(request, strategy, provider, sink, "run", chunk_size))
+    single = asyncio.run(BacktestEngine(provider).run(request, strategy))
+
+    assert [seq for seq, _ in chunks] == list(range(len(chunks))) and len(chunks) > 1
+    assert all(len(columns["equity"]) <= chunk_size for _, columns in chunks)
+    assert [
+        {"timestamp": ts, "equity": eq, "price": px}
+        for _, columns in chunks
+        for ts, eq, px in zip(columns["timestamp"], columns["equity"], columns["price"])
+    ] == single.equity_curve
+    assert single.trades and streamed.trades == single.trades
+    assert streamed.metrics == single.metrics
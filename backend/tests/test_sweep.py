@@ -0,0 +1,89 @@
+import asyncio
+from datetime import date
+
+import pytest
+
+from app.engine.backtester import BacktestEngine
+from app.engine.pool import shutdown_process_pool
+from app.engine.sweep import expand_param_grid, rank_score, run_sweep
+from app.models.domain import BacktestRequest, ParamRange, SweepRequest
+from app.strategies.registry import strategy_registry
+
+
+@pytest.fixture(autouse=True)
+def _pool():
+    yield
+    shutdown_process_pool()
+
+
+def _sweep(provider, rank_by: str):
+    request = SweepRequest(
+        symbols=["AAA"],
+        strategy_name="ma_crossover",
+        param_grid={"fast_period": [5, 10, 20], "slow_period": ParamRange(start=30, stop=50, step=20)},
+        start_date=date(2020, 1, 1),
+        end_date=date(2023, 1, 1),
+        rank_by=rank_by,
+    )
+    return asyncio.run(run_sweep(request, strategy_registry.get("ma_crossover"), provider))
+
+
+def test_expand_param_grid_is_the_validated_cartesian_product():
+    strategy = strategy_registry.get("ma_crossover")
+
+    combos = expand_param_grid(
+        strategy, {"fast_period": [5, 10], "slow_period": ParamRange(start=20, stop=40, step=10)}
+    )
+
+    assert len(combos) == 6
+    assert {(c["fast_period"], c["slow_period"]) for c in combos} == {
+        (f, s) for f in (5, 10) for s in (20, 30, 40)
+    }
+    assert all(c["ma_type"] == "SMA" for c in combos)
+    # 0 and 1 both clamp to the minimum of 2, and are evaluated once
+    assert [c["fast_period"] for c in expand_param_grid(strategy, {"fast_period": [0, 1, 2]})] == [2]
+
+
+def test_expand_param_grid_rejects_bad_grids():
+    strategy = strategy_registry.get("ma_crossover")
+
+    with pytest.raises(ValueError, match="Unknown parameters"):
+        expand_param_grid(strategy, {"period": [5]})
+    with pytest.raises(ValueError, match="6 combinations; the limit is 5"):
+        expand_param_grid(strategy, {"fast_period": [5, 10], "slow_period": [20, 30, 40]}, 5)
+    with pytest.raises(ValueError, match="must be positive"):
+        expand_param_grid(strategy, {"fast_period": ParamRange(start=5, stop=10, step=0)})
+
+
+def test_sweep_rows_match_single_runs(provider):
+    result = _sweep(provider, "sharpe_ratio")
+    engine = BacktestEngine(provider)
+    strategy = strategy_registry.get("ma_crossover")
+
+    assert result.total_combinations == len(result.results) == 6
+    for entry in result.results:
+        single = asyncio.run(engine.run(
+            BacktestRequest(
+                symbols=["AAA"],
+                strategy_name="ma_crossover",
+                params=entry.params,
+                start_date=date(2020, 1, 1),
+                end_date=date(2023, 1, 1),
+            ),
+            strategy,
+        ))
+        assert entry.metrics == single.metrics
+
+
+@pytest.mark.parametrize("rank_by", ["sharpe_ratio", "avg_trade_duration_days"])
+def test_sweep_ranks_best_first_in_the_metric_direction(provider, rank_by):
+    result = _sweep(provider, rank_by)
+
+    scores = [rank_score(entry.metrics, rank_by) for entry in result.results]
+    values = [getattr(entry.metrics, rank_by) for entry in result.results]
+
+    assert scores == sorted(scores, reverse=True)
+    if rank_by == "avg_trade_duration_days":
+        assert values == sorted(values) and values[0] < values[-1]
+    else:
+        assert values == sorted(values, reverse=True)
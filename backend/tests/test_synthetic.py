@@ -0,0 +1,41 @@
+import asyncio
+from datetime import datetime
+
+from app.data.synthetic import SyntheticProvider, synthetic_frame
+from tests.benchmarks import run as benchmarks
+
+
+def test_synthetic_frame_is_deterministic():
+    a = synthetic_frame(500, symbol="AAA", seed=3)
+    b = synthetic_frame(500, symbol="AAA", seed=3)
+    other = synthetic_frame(500, symbol="BBB", seed=3)
+
+    assert a.equals(b)
+    assert not a["close"].equals(other["close"])
+
+
+def test_synthetic_bars_are_consistent():
+    df = synthetic_frame(1000, interval="1m")
+
+    assert len(df) == 1000
+    assert (df["high"] >= df[["open", "close"]].max(axis=1)).all()
+    assert (df["low"] <= df[["open", "close"]].min(axis=1)).all()
+    assert (df["open"].iloc[1:].to_numpy() == df["close"].iloc[:-1].to_numpy()).all()
+    assert df["timestamp"].diff().iloc[1:].eq(df["timestamp"].iloc[1] - df["timestamp"].iloc[0]).all()
+
+
+def test_provider_honours_range_and_max_bars():
+    start, end = datetime(2020, 1, 1), datetime(2020, 1, 11)
+
+    bars = asyncio.run(SyntheticProvider().get_historical("AAA", start, end, "1d"))
+    capped = asyncio.run(SyntheticProvider(max_bars=4).get_historical("AAA", start, end, "1d"))
+
+    assert len(bars) == 10
+    assert capped == bars[:4]
+
+
+def test_benchmark_harness_runs():
+    out = benchmarks.run([200])
+
+    assert set(out["results"]) == {name for name, _, _ in benchmarks.cases()}
+    assert all("seconds" in by_size["200"] for by_size in out["results"].values())
@@ -0,0 +1,99 @@
+import asyncio
+from datetime import date
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.backtest import router
+from app.data.registry import registry
+from app.engine.backtester import BacktestEngine, evaluate_signal_matrix
+from app.engine.execution import execute_signals
+from app.engine.pool import shutdown_process_pool
+from app.engine.sweep import expand_param_grid, rank_score
+from app.engine.walk_forward import plan_windows, run_walk_forward
+from app.models.domain import WalkForwardRequest
+from app.strategies.registry import strategy_registry
+
+GRID = {"fast_period": [5, 10], "slow_period": [20, 40]}
+
+
+@pytest.fixture(autouse=True)
+def _pool():
+    yield
+    shutdown_process_pool()
+
+
+def _request(**overrides) -> WalkForwardRequest:
+    fields = dict(
+        symbols=["AAA"],
+        strategy_name="ma_crossover",
+        param_grid=GRID,
+        start_date=date(2020, 1, 1),
+        end_date=date(2022, 1, 1),
+        train_bars=200,
+        test_bars=150,
+    )
+    return WalkForwardRequest(**(fields | overrides))
+
+
+def test_plan_windows_rolling_and_anchored():
+    assert plan_windows(1000, 300, 250) == [(0, 300, 550), (250, 550, 800), (500, 800, 1000)]
+    assert plan_windows(1000, 300, 250, anchored=True) == [(0, 300, 550), (0, 550, 800), (0, 800, 1000)]
+    assert plan_windows(801, 300, 250)[-1] == (500, 800, 801)
+    assert plan_windows(300, 300, 250) == []
+    with pytest.raises(ValueError):
+        plan_windows(1000, 1, 250)
+
+
+@pytest.mark.parametrize("anchored", [False, True])
+def test_walk_forward_picks_train_best_and_stitches_test_windows(provider, anchored):
+    request = _request(anchored=anchored)
+    strategy = strategy_registry.get("ma_crossover")
+    result = asyncio.run(run_walk_forward(request, strategy, provider))
+
+    df = asyncio.run(BacktestEngine(provider).load_frame(
+        ["AAA"], request.start_date, request.end_date, "1d", strategy
+    ))
+    windows = plan_windows(len(df), 200, 150, anchored)
+    combos = expand_param_grid(strategy, GRID)
+    assert len(result.windows) == len(windows) and len(windows) > 2
+
+    test_signals = []
+    for window, (train_start, test_start, test_end) in zip(result.windows, windows):
+        frame = df.iloc[train_start:test_end].reset_index(drop=True)
+        signals = np.column_stack([strategy.generate_signals(frame.copy(), p)["signal"] for p in combos])
+        train_len = test_start - train_start
+        scored = evaluate_signal_matrix(frame.iloc[:train_len], signals[:train_len], 100000.0, 1.0)
+        best = max(rank_score(m, "sharpe_ratio") for m in scored)
+        assert rank_score(window.train_metrics, "sharpe_ratio") == best
+        assert window.params in combos
+        test_signals.append(signals[train_len:, combos.index(window.params)])
+
+    # One pass over every test window: positions and cash carry across
+    # window boundaries instead of restarting from initial_cash
+    oos = df.iloc[windows[0][1]:]
+    ex = execute_signals(
+        oos["close"].to_numpy(), np.concatenate(test_signals).astype(np.float64),
+        initial_cash=100000.0, fee_pct=1.0, slippage_bps=1.0, position_size_pct=0.1,
+    )
+    equity = [point["equity"] for point in result.equity_curve]
+    assert len(equity) == len(df) - 200
+    np.testing.assert_allclose(equity, np.round(ex.equity, 2))
+    assert result.windows[0].test_start == result.equity_curve[0]["timestamp"]
+    assert result.windows[-1].test_end == result.equity_curve[-1]["timestamp"]
+
+
+def test_walk_forward_endpoint(provider):
+    registry.register(provider, default=True)
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+    body = _request().model_dump(mode="json")
+
+    ok = client.post("/api/backtest/walk-forward", json=body)
+    too_short = client.post("/api/backtest/walk-forward", json=body | {"train_bars": 5000})
+
+    assert ok.status_code == 200 and ok.json()["total_combinations"] == 4
+    assert too_short.status_code == 400
@@ -8,7 +8,8 @@ import BacktestResults from '@/components/BacktestResults';
 const BacktestChart = dynamic(() => import('@/components/BacktestChart'), { ssr: false });
 import TradeLog from '@/components/TradeLog';
 import { apiFetch } from '@/lib/api';
-import type { BacktestMetrics, EquityCurvePoint, Trade } from '@/lib/types';
+import { decodeBacktestPayload } from '@/lib/columnar';
+import type { BacktestMetrics, Columns, EquityCurvePoint, ResultFormat, Trade } from '@/lib/types';
 
 interface BacktestDetail {
   id: string;
@@ -23,10 +24,16 @@ interface BacktestDetail {
   equity_curve: EquityCurvePoint[];
   trades: Trade[];
   indicator_data: Record<string, unknown>;
+  result_format?: ResultFormat;
   created_at: string | null;
   duration_ms: number;
 }
 
+type StoredBacktest = Omit<BacktestDetail, 'equity_curve' | 'trades'> & {
+  equity_curve: EquityCurvePoint[] | Columns<EquityCurvePoint>;
+  trades: Trade[] | Columns<Trade>;
+};
+
 export default function BacktestDetailPage() {
   const { id } = useParams();
   const router = useRouter();
@@ -35,8 +42,8 @@ export default function BacktestDetailPage() {
 
   useEffect(() => {
     if (!id) return;
-    apiFetch<BacktestDetail>(`/api/backtests/${id}`)
-      .then(setDetail)
+    apiFetch<StoredBacktest>(`/api/backtests/${id}`)
+      .then((d) => setDetail(decodeBacktestPayload(d)))
       .catch((e) => setError(e.message));
   }, [id]);
 
@@ -8,6 +8,7 @@ const BacktestChart = dynamic(() => import('@/components/BacktestChart'), { ssr:
 import TradeLog from '@/components/TradeLog';
 import { useBacktestStore } from '@/stores/backtestStore';
 import { apiFetch } from '@/lib/api';
+import { decodeBacktestPayload } from '@/lib/columnar';
 import type { StrategyInfo, StrategyParam, BacktestResult } from '@/lib/types';
 
 export default function BacktestPage() {
@@ -67,9 +68,10 @@ export default function BacktestPage() {
           interval,
           initial_cash: initialCash,
           trading_fee_pct: tradingFeePct,
+          result_format: 'columnar',
         }),
       });
-      setResult(res);
+      setResult(decodeBacktestPayload(res));
     } catch (e: any) {
       setError(e.message);
     } finally {
@@ -14,7 +14,11 @@ export default function BacktestResults({ metrics, durationMs, live }: BacktestR
     { label: 'Total P&L', value: `$${metrics.total_pnl.toLocaleString()}`, color: metrics.total_pnl >= 0 ? 'text-green-500' : 'text-red-500' },
     { label: 'Return', value: `${metrics.return_pct.toFixed(2)}%`, color: metrics.return_pct >= 0 ? 'text-green-500' : 'text-red-500' },
     { label: 'Sharpe Ratio', value: metrics.sharpe_ratio.toFixed(2), color: '' },
+    ...(metrics.sortino_ratio !== undefined ? [{ label: 'Sortino Ratio', value: metrics.sortino_ratio.toFixed(2), color: '' }] : []),
+    ...(metrics.calmar_ratio !== undefined ? [{ label: 'Calmar Ratio', value: metrics.calmar_ratio.toFixed(2), color: '' }] : []),
     { label: 'Max Drawdown', value: `${metrics.max_drawdown_pct.toFixed(2)}%`, color: 'text-red-500' },
+    ...(metrics.max_drawdown_duration_days !== undefined ? [{ label: 'Longest Drawdown', value: `${metrics.max_drawdown_duration_days.toFixed(0)}d`, color: '' }] : []),
+    ...(live ? [] : [{ label: 'Avg Holding', value: `${metrics.avg_trade_duration_days.toFixed(1)}d`, color: '' }]),
     { label: 'Win Rate', value: `${metrics.win_rate.toFixed(1)}%`, color: '' },
     { label: 'Profit Factor', value: metrics.profit_factor.toFixed(2), color: '' },
     { label: 'Total Trades', value: String(metrics.total_trades), color: '' },
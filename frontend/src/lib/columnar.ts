@@ -0,0 +1,31 @@
+import type { Columns, EquityCurvePoint, ResultFormat, Trade } from './types';
+
+export function fromColumns<T>(columns: Columns<T> | T[]): T[] {
+  if (Array.isArray(columns)) return columns;
+  const keys = Object.keys(columns) as (keyof T)[];
+  const length = keys.length ? columns[keys[0]].length : 0;
+  const rows = new Array<T>(length);
+  for (let i = 0; i < length; i++) {
+    const row = {} as T;
+    for (const k of keys) row[k] = columns[k][i];
+    rows[i] = row;
+  }
+  return rows;
+}
+
+interface BacktestPayload {
+  result_format?: ResultFormat;
+  equity_curve: EquityCurvePoint[] | Columns<EquityCurvePoint>;
+  trades: Trade[] | Columns<Trade>;
+}
+
+/** Normalize a backtest response or stored run to row form for the charts. */
+export function decodeBacktestPayload<T extends BacktestPayload>(
+  payload: T,
+): Omit<T, 'equity_curve' | 'trades'> & { equity_curve: EquityCurvePoint[]; trades: Trade[] } {
+  return {
+    ...payload,
+    equity_curve: fromColumns(payload.equity_curve),
+    trades: fromColumns(payload.trades),
+  };
+}
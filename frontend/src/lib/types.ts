@@ -35,20 +35,30 @@ export interface BacktestMetrics {
   total_pnl: number;
   return_pct: number;
   sharpe_ratio: number;
+  sortino_ratio?: number;
+  calmar_ratio?: number;
   max_drawdown_pct: number;
+  max_drawdown_duration_days?: number;
   win_rate: number;
   profit_factor: number;
   total_trades: number;
   avg_trade_duration_days: number;
 }
 
+export type ResultFormat = 'rows' | 'columnar';
+
+/** One array per field, all the same length. */
+export type Columns<T> = { [K in keyof T]-?: T[K][] };
+
 export interface BacktestResult {
   id: string;
   metrics: BacktestMetrics;
   equity_curve: EquityCurvePoint[];
   trades: Trade[];
   indicator_data: Record<string, unknown>;
+  result_format?: ResultFormat;
   duration_ms: number;
+  cached?: boolean;
 }
 
 export interface Portfolio {